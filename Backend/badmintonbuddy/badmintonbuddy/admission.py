@@ -0,0 +1,195 @@
+"""
+Admission control for expensive endpoints.
+
+Limits live in settings.ADMISSION_LIMITS, one entry per scope:
+
+    ADMISSION_LIMITS = {
+        "partners":    {"rate": 1.0, "burst": 5, "concurrency": 8},
+        "leaderboard": {"concurrency": 4},
+    }
+
+- rate / burst:  per-client token bucket (session user_id, else client IP)
+- concurrency:   global cap on in-flight executions of that scope (per process)
+
+Over the limit, the view answers immediately with 429 + Retry-After instead of
+queueing behind slow queries.
+
+    @admission_control("partners")              # bucket + slot around the whole view
+    def find_partners(request): ...
+
+    @admission_control("leaderboard", slot=False)
+    def leaderboard(request):
+        ...
+        with concurrency_slot("leaderboard"):   # only the expensive recompute takes a slot
+            ...
+
+    @admission_control("history", slot=False)
+    def export_history(request):
+        ...
+        return StreamingHttpResponse(streaming("history", rows()))   # slot held until the body is sent
+"""
+import math
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from django.conf import settings
+from django.http import JsonResponse
+
+
+class Overloaded(Exception):
+    def __init__(self, retry_after, reason):
+        super().__init__(reason)
+        self.retry_after = retry_after
+        self.reason = reason
+
+
+class TokenBucket:
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate, burst):
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def take(self):
+        """Returns seconds to wait (0 if a token was taken)."""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate if self.rate > 0 else 60.0
+
+
+MAX_TRACKED_CLIENTS = 10000
+
+_lock = threading.Lock()
+_buckets = {}     # (scope, client) -> TokenBucket
+_slots = {}       # scope -> BoundedSemaphore
+
+
+def _limits(scope):
+    return getattr(settings, "ADMISSION_LIMITS", {}).get(scope, {})
+
+
+def _client_key(request):
+    session = getattr(request, "session", None)
+    user_id = session.get("user_id") if session is not None else None
+    return f"u:{user_id}" if user_id else f"ip:{request.META.get('REMOTE_ADDR', '')}"
+
+
+def _take_token(scope, client, rate, burst):
+    key = (scope, client)
+    with _lock:
+        bucket = _buckets.get(key)
+        if bucket is None:
+            if len(_buckets) >= MAX_TRACKED_CLIENTS:
+                _buckets.clear()  # crude but bounded; every client just gets a fresh burst
+            bucket = _buckets[key] = TokenBucket(rate, burst)
+        return bucket.take()
+
+
+def _semaphore(scope, size):
+    with _lock:
+        sem = _slots.get(scope)
+        if sem is None:
+            sem = _slots[scope] = threading.BoundedSemaphore(size)
+        return sem
+
+
+@contextmanager
+def concurrency_slot(scope):
+    size = _limits(scope).get("concurrency")
+    if not size:
+        yield
+        return
+
+    sem = _semaphore(scope, size)
+    if not sem.acquire(blocking=False):
+        raise Overloaded(1, f"Too many concurrent {scope} requests")
+    try:
+        yield
+    finally:
+        sem.release()
+
+
+class _SlotStream:
+    """Iterable that gives its concurrency slot back on close() (StreamingHttpResponse calls it)."""
+
+    def __init__(self, iterable, sem):
+        self._iterable = iterable
+        self._sem = sem
+
+    def __iter__(self):
+        return iter(self._iterable)
+
+    def close(self):
+        try:
+            close = getattr(self._iterable, "close", None)
+            if close:
+                close()
+        finally:
+            sem, self._sem = self._sem, None
+            if sem is not None:
+                sem.release()
+
+
+def streaming(scope, iterable):
+    """
+    Wrap a StreamingHttpResponse body so it holds a `scope` slot until the
+    response is closed, not just while the view runs. Raises Overloaded.
+    """
+    size = _limits(scope).get("concurrency")
+    if not size:
+        return iterable
+    sem = _semaphore(scope, size)
+    if not sem.acquire(blocking=False):
+        raise Overloaded(1, f"Too many concurrent {scope} requests")
+    return _SlotStream(iterable, sem)
+
+
+def _too_many(exc):
+    res = JsonResponse({"error": exc.reason, "retry_after": exc.retry_after}, status=429)
+    res["Retry-After"] = str(exc.retry_after)
+    return res
+
+
+def admission_control(scope, slot=True):
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            limits = _limits(scope)
+            try:
+                if limits.get("rate"):
+                    wait = _take_token(scope, _client_key(request), limits["rate"], limits.get("burst", limits["rate"]))
+                    if wait > 0:
+                        raise Overloaded(max(1, math.ceil(wait)), "Rate limit exceeded")
+
+                if slot:
+                    with concurrency_slot(scope):
+                        return view(request, *args, **kwargs)
+                return view(request, *args, **kwargs)
+            except Overloaded as exc:
+                return _too_many(exc)
+
+        return wrapper
+    return decorator
+
+
+def bounded_int(params, name, default, lo, hi):
+    """
+    Read an int query param and clamp it into [lo, hi].
+    Returns (value, error_response); error_response is a 400 for non-integers.
+    """
+    raw = params.get(name)
+    if raw in (None, ""):
+        return default, None
+    try:
+        value = int(raw)
+    except (TypeError, ValueError):
+        return None, JsonResponse({"error": f"{name} must be an integer"}, status=400)
+    return max(lo, min(hi, value)), None
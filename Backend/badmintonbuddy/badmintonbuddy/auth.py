@@ -0,0 +1,40 @@
+"""
+Session checks shared by the views of every app.
+
+    user_id, err = require_login(request)    # 401 without a session
+    admin_id, err = require_admin(request)   # 401 / 403 unless the DB role is admin
+    if err:
+        return err
+
+db_role() reads the role from the users table rather than trusting the
+session, so a demoted admin loses access on their next request.
+"""
+from django.db import connection
+from django.http import JsonResponse
+
+
+def require_login(request):
+    user_id = request.session.get("user_id")
+    if not user_id:
+        return None, JsonResponse({"error": "Not logged in"}, status=401)
+    return int(user_id), None
+
+
+def db_role(user_id):
+    """Safer than session role. Reads role from DB."""
+    with connection.cursor() as cur:
+        cur.execute("SELECT role FROM users WHERE user_id=%s", [user_id])
+        row = cur.fetchone()
+    return row[0] if row else None
+
+
+def require_admin(request):
+    user_id, err = require_login(request)
+    if err:
+        return None, err
+
+    role = db_role(user_id)
+    if role != "admin":
+        return None, JsonResponse({"error": "Admin only"}, status=403)
+
+    return user_id, None
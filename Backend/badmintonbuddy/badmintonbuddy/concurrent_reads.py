@@ -0,0 +1,78 @@
+"""
+Run a view's independent reads concurrently.
+
+GET /api/dashboard/ needs the user's history, the global leaderboard and the
+user's stats. These are separate queries that don't depend on each other.
+gather() runs one of them in the request thread and the rest on a small
+shared thread pool (DASHBOARD_WORKERS). The request then waits only about as
+long as the slowest query, instead of their sum.
+
+- Each task runs in a copy of the request's contextvars. reader() therefore
+  picks the same replica / primary as the request (db_routing.read_only).
+- Pool threads get their own DB connections (Django connections are per
+  thread). Those are opened and closed around every task the way request
+  threads do it (close_old_connections + CONN_MAX_AGE), so nothing idles
+  between dashboards.
+- The request's execute wrappers (DBInstrumentationMiddleware) are applied
+  on the pool thread too. Those queries therefore count in the request's
+  Server-Timing and VIEW_METRICS.
+- An exception in a task (e.g. admission.Overloaded) is re-raised in the
+  request thread.
+
+DASHBOARD_WORKERS = 0 runs everything in the request thread, in order.
+Test transactions need that, because they aren't visible to other
+connections.
+"""
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import close_old_connections, connections
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _workers():
+    return getattr(settings, "DASHBOARD_WORKERS", 4)
+
+
+def _executor():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(max_workers=_workers(), thread_name_prefix="dashboard")
+    return _pool
+
+
+def _run(ctx, wrappers, fn):
+    close_old_connections()
+    try:
+        with ExitStack() as stack:
+            for alias, funcs in wrappers.items():
+                for func in funcs:
+                    stack.enter_context(connections[alias].execute_wrapper(func))
+            return ctx.run(fn)
+    finally:
+        close_old_connections()
+
+
+def gather(tasks):
+    """tasks: {name: callable}. Returns {name: result}."""
+    names = list(tasks)
+    if _workers() <= 0 or len(names) < 2:
+        return {name: tasks[name]() for name in names}
+
+    wrappers = {conn.alias: list(conn.execute_wrappers) for conn in connections.all()}
+    # a Context can be entered by one thread at a time: one copy per task
+    futures = {
+        name: _executor().submit(_run, contextvars.copy_context(), wrappers, tasks[name])
+        for name in names[1:]
+    }
+    results = {names[0]: tasks[names[0]]()}
+    for name, future in futures.items():
+        results[name] = future.result()
+    return results
@@ -0,0 +1,134 @@
+"""
+Read-replica routing.
+
+Views are annotated with @read_only when every query they run is a read.
+Inside such a view, reader() returns the replica connection (settings.REPLICA_DB_ALIAS)
+unless:
+- no replica is configured, or
+- the session wrote something in the last REPLICA_STICKY_SECONDS
+  (read-your-writes: a fresh booking must show up in that user's calendar).
+
+Everything else (and every write) stays on `default`.
+
+Raw SQL views use `reader().cursor()` instead of `connection.cursor()`; ORM
+queries are routed by ReplicaRouter (settings.DATABASE_ROUTERS).
+
+ReadYourWritesMiddleware stamps the session after any successful unsafe request
+(POST/PUT/PATCH/DELETE), which starts the sticky window.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+STICKY_SESSION_KEY = "_primary_until"
+
+_read_alias = ContextVar("read_alias", default=None)
+
+
+def replica_alias():
+    alias = getattr(settings, "REPLICA_DB_ALIAS", None)
+    return alias if alias and alias in settings.DATABASES else None
+
+
+def _sticky(request):
+    session = getattr(request, "session", None)
+    return bool(session) and session.get(STICKY_SESSION_KEY, 0) > time.time()
+
+
+def read_only(view):
+    """Mark a view as read-only so its queries may go to the replica."""
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        alias = replica_alias()
+        if alias is None or _sticky(request):
+            alias = DEFAULT_DB_ALIAS
+
+        token = _read_alias.set(alias)
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            _read_alias.reset(token)
+
+    wrapper.read_only = True
+    return wrapper
+
+
+@contextmanager
+def use_primary():
+    """Force reads in this block onto the primary (e.g. recomputes that get cached)."""
+    token = _read_alias.set(DEFAULT_DB_ALIAS)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+def current_read_alias():
+    return _read_alias.get() or DEFAULT_DB_ALIAS
+
+
+def reader():
+    """Connection for reads in the current view (replica inside @read_only, else default)."""
+    return connections[current_read_alias()]
+
+
+@contextmanager
+def streaming_cursor(alias):
+    """
+    Cursor that reads rows from the server as they are fetched (MySQLdb
+    SSCursor), so a large result is never buffered whole in the process.
+    Nothing else may run on the connection until it is closed.
+    Other backends get a plain cursor.
+    """
+    conn = connections[alias]
+    if conn.vendor != "mysql":
+        with conn.cursor() as cur:
+            yield cur
+        return
+
+    from MySQLdb.cursors import SSCursor
+
+    conn.ensure_connection()
+    cur = conn.connection.cursor(SSCursor)
+    try:
+        yield cur
+    finally:
+        cur.close()
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # the replica gets its schema through replication
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReadYourWritesMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        if (
+            request.method not in ("GET", "HEAD", "OPTIONS")
+            and response.status_code < 400
+            and replica_alias() is not None
+            and request.session.get("user_id")
+        ):
+            request.session[STICKY_SESSION_KEY] = time.time() + getattr(settings, "REPLICA_STICKY_SECONDS", 10)
+
+        return response
@@ -0,0 +1,165 @@
+"""
+Idempotency-Key support for retried POSTs (book_match, join_slot,
+join_tournament, report_match_result).
+
+Clients send a unique `Idempotency-Key: <uuid>` header per logical action and
+reuse it on retries. The first request runs the view. Its response (status +
+body) is stored under (scope, session user, key) for
+IDEMPOTENCY_TTL_SECONDS. A retry then gets that response back byte-for-byte
+with `Idempotent-Replayed: true`. It runs no conflict query and writes
+nothing, so a retry can't double-book or double-count a result.
+
+- Concurrent duplicates: the first request claims the key with cache.add(). A
+  duplicate that arrives meanwhile polls for the stored response for up to
+  IDEMPOTENCY_WAIT_SECONDS, then gets 409 + Retry-After.
+- The same key with a different method / path / body is a client bug: 422.
+- 5xx and 429 responses are not stored, so the retry runs the view again.
+- No header: the view runs as before.
+
+The store is the Django cache alias settings.IDEMPOTENCY_CACHE_ALIAS. Entries
+expire with the cache timeout. Per process with locmem; use a shared backend
+when several workers serve the API.
+"""
+import hashlib
+import threading
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse, JsonResponse
+
+HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+NOT_STORED = (429,)  # plus every 5xx
+
+
+class _Stats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {}
+
+    def incr(self, scope, field):
+        with self._lock:
+            c = self._counts.setdefault(scope, {"stored": 0, "replayed": 0, "waited": 0, "in_progress": 0, "mismatch": 0})
+            c[field] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {k: dict(v) for k, v in self._counts.items()}
+
+    def reset(self):
+        with self._lock:
+            self._counts.clear()
+
+
+STATS = _Stats()
+
+
+def _cache():
+    return caches[getattr(settings, "IDEMPOTENCY_CACHE_ALIAS", "default")]
+
+
+def _fingerprint(request):
+    h = hashlib.sha1()
+    h.update(request.method.encode())
+    h.update(request.get_full_path().encode())
+    h.update(request.body)
+    return h.hexdigest()
+
+
+def _replay(record):
+    response = HttpResponse(record["body"], status=record["status"], content_type=record["content_type"])
+    response["Idempotent-Replayed"] = "true"
+    return response
+
+
+def _mismatch():
+    return JsonResponse({"error": f"{HEADER} was already used for a different request"}, status=422)
+
+
+def _in_progress():
+    response = JsonResponse({"error": f"A request with this {HEADER} is still in progress"}, status=409)
+    response["Retry-After"] = "1"
+    return response
+
+
+def _wait(cache, cache_key, lock_key):
+    """Poll for the first request's stored response. None on timeout or if it finished without one."""
+    deadline = time.monotonic() + getattr(settings, "IDEMPOTENCY_WAIT_SECONDS", 10)
+    while time.monotonic() < deadline:
+        time.sleep(0.05)
+        record = cache.get(cache_key)
+        if record is not None:
+            return record
+        if cache.get(lock_key) is None:
+            return cache.get(cache_key)
+    return None
+
+
+def idempotent(scope):
+    """View decorator. scope names the action, so one key can't replay another view's response."""
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            key = request.headers.get(HEADER)
+            if not key:
+                return view(request, *args, **kwargs)
+            if len(key) > MAX_KEY_LENGTH:
+                return JsonResponse({"error": f"{HEADER} too long (max {MAX_KEY_LENGTH})"}, status=400)
+
+            cache = _cache()
+            user = request.session.get("user_id") or "anon"
+            cache_key = f"idem:{scope}:{user}:{hashlib.sha1(key.encode()).hexdigest()}"
+            fingerprint = _fingerprint(request)
+
+            record = cache.get(cache_key)
+            if record is not None:
+                if record["fingerprint"] != fingerprint:
+                    STATS.incr(scope, "mismatch")
+                    return _mismatch()
+                STATS.incr(scope, "replayed")
+                return _replay(record)
+
+            lock_key = f"{cache_key}:lock"
+            lock_seconds = getattr(settings, "IDEMPOTENCY_LOCK_SECONDS", 30)
+            if not cache.add(lock_key, fingerprint, lock_seconds):
+                # a duplicate is running: wait for its response instead of running the view again
+                record = _wait(cache, cache_key, lock_key)
+                if record is not None:
+                    if record["fingerprint"] != fingerprint:
+                        STATS.incr(scope, "mismatch")
+                        return _mismatch()
+                    STATS.incr(scope, "waited")
+                    return _replay(record)
+                # the first request ended without storing (5xx) -> run it here, unless it's still going
+                if not cache.add(lock_key, fingerprint, lock_seconds):
+                    STATS.incr(scope, "in_progress")
+                    return _in_progress()
+
+            try:
+                response = view(request, *args, **kwargs)
+                if (
+                    response.status_code < 500
+                    and response.status_code not in NOT_STORED
+                    and not response.streaming
+                ):
+                    cache.set(cache_key, {
+                        "fingerprint": fingerprint,
+                        "status": response.status_code,
+                        "content_type": response["Content-Type"],
+                        "body": response.content,
+                    }, getattr(settings, "IDEMPOTENCY_TTL_SECONDS", 24 * 3600))
+                    STATS.incr(scope, "stored")
+                return response
+            finally:
+                cache.delete(lock_key)
+
+        return wrapper
+
+    return decorator
+
+
+def stats():
+    return STATS.snapshot()
@@ -0,0 +1,173 @@
+"""
+Per-request DB instrumentation.
+
+DBInstrumentationMiddleware wraps every DB connection with
+`connection.execute_wrapper` for the duration of a request and records:
+- query count
+- total DB time
+- slowest statement
+
+Each response gets a Server-Timing header, e.g.
+    Server-Timing: db;dur=12.4;desc="5 queries", db-slowest;dur=8.1, app;dur=30.2
+
+Per-view rolling samples are kept in VIEW_METRICS and exposed (admin only)
+on GET /api/metrics/. Statements slower than settings.DB_SLOW_QUERY_MS are
+logged to the "badmintonbuddy.db" logger with the *shape* of their params
+(types / lengths, never values).
+"""
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from .percentiles import percentile
+
+logger = logging.getLogger("badmintonbuddy.db")
+
+HISTOGRAM_BOUNDS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+
+def _param_shape(value):
+    if value is None:
+        return "null"
+    if isinstance(value, (str, bytes)):
+        return f"{type(value).__name__}({len(value)})"
+    if isinstance(value, (list, tuple)):
+        return f"{type(value).__name__}[{len(value)}]"
+    return type(value).__name__
+
+
+def params_shape(params, many=False):
+    if params is None:
+        return []
+    if many:
+        params = list(params)
+        first = params[0] if params else []
+        return [f"x{len(params)}"] + [_param_shape(p) for p in first]
+    if isinstance(params, dict):
+        return {k: _param_shape(v) for k, v in params.items()}
+    return [_param_shape(p) for p in params]
+
+
+class RequestQueries:
+    """execute_wrapper callable collecting stats for one request."""
+
+    def __init__(self, alias="default"):
+        self.alias = alias
+        self.count = 0
+        self.total_ms = 0.0
+        self.slowest_ms = 0.0
+        self.slowest_sql = None
+        # concurrent_reads.gather() runs some of a request's queries on pool threads
+        self._lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            ms = (time.perf_counter() - started) * 1000
+            with self._lock:
+                self.count += 1
+                self.total_ms += ms
+                if ms > self.slowest_ms:
+                    self.slowest_ms = ms
+                    self.slowest_sql = sql
+
+            threshold = getattr(settings, "DB_SLOW_QUERY_MS", 100)
+            if threshold is not None and ms >= threshold:
+                logger.warning(
+                    "slow query %.1fms [%s] %s params=%s",
+                    ms, self.alias, " ".join(str(sql).split()), params_shape(params, many)
+                )
+
+
+class ViewMetrics:
+    """Rolling per-view samples: (total_ms, db_ms, queries)."""
+
+    def __init__(self, window=1000):
+        self.window = window
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def record(self, view, total_ms, db_ms, queries):
+        with self._lock:
+            bucket = self._samples.get(view)
+            if bucket is None:
+                bucket = self._samples[view] = deque(maxlen=self.window)
+            bucket.append((total_ms, db_ms, queries))
+
+    @staticmethod
+    def _pct(sorted_vals, p):
+        return round(percentile(sorted_vals, p), 2)
+
+    def snapshot(self):
+        with self._lock:
+            data = {v: list(s) for v, s in self._samples.items()}
+
+        out = {}
+        for view, samples in sorted(data.items()):
+            totals = sorted(s[0] for s in samples)
+            dbs = sorted(s[1] for s in samples)
+            histogram = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+            for t in totals:
+                i = 0
+                while i < len(HISTOGRAM_BOUNDS_MS) and t > HISTOGRAM_BOUNDS_MS[i]:
+                    i += 1
+                histogram[i] += 1
+
+            out[view] = {
+                "samples": len(samples),
+                "avg_queries": round(sum(s[2] for s in samples) / len(samples), 2),
+                "total_ms": {"p50": self._pct(totals, 50), "p95": self._pct(totals, 95), "p99": self._pct(totals, 99)},
+                "db_ms": {"p50": self._pct(dbs, 50), "p95": self._pct(dbs, 95), "p99": self._pct(dbs, 99)},
+                "histogram_ms": {
+                    **{f"le_{b}": histogram[i] for i, b in enumerate(HISTOGRAM_BOUNDS_MS)},
+                    "inf": histogram[-1],
+                },
+            }
+        return out
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+
+
+VIEW_METRICS = ViewMetrics(window=getattr(settings, "VIEW_METRICS_WINDOW", 1000))
+
+
+class DBInstrumentationMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        collectors = []
+
+        with ExitStack() as stack:
+            for conn in connections.all():
+                rq = RequestQueries(conn.alias)
+                collectors.append(rq)
+                stack.enter_context(conn.execute_wrapper(rq))
+            response = self.get_response(request)
+
+        total_ms = (time.perf_counter() - started) * 1000
+        count = sum(c.count for c in collectors)
+        db_ms = sum(c.total_ms for c in collectors)
+        slowest = max(collectors, key=lambda c: c.slowest_ms) if collectors else None
+
+        timing = [f'db;dur={db_ms:.1f};desc="{count} queries"']
+        if slowest and slowest.count:
+            timing.append(f"db-slowest;dur={slowest.slowest_ms:.1f}")
+        timing.append(f"app;dur={total_ms:.1f}")
+        response["Server-Timing"] = ", ".join(timing)
+
+        match = getattr(request, "resolver_match", None)
+        view = match.view_name if match else "unresolved"
+        VIEW_METRICS.record(view, total_ms, db_ms, count)
+
+        return response
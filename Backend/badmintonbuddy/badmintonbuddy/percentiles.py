@@ -0,0 +1,11 @@
+"""
+Nearest-rank percentile shared by the in-process metrics (request timings,
+job queue) and the load / benchmark commands.
+"""
+
+
+def percentile(sorted_vals, p):
+    """p-th percentile (0..100) of an ascending list, nearest rank; 0.0 for an empty list."""
+    if not sorted_vals:
+        return 0.0
+    return sorted_vals[min(len(sorted_vals) - 1, int(round(p / 100 * (len(sorted_vals) - 1))))]
@@ -0,0 +1,258 @@
+"""
+On-demand request profiling for admins.
+
+An admin adds `X-Profile: 1` (or `?__profile=1`) to any request. The request
+is then run under a profiler:
+
+- sample (default): a sampler thread snapshots the request thread's stack
+  every PROFILING_SAMPLE_INTERVAL_MS. The output is collapsed stacks
+  ("frame;frame;frame count"), which flamegraph.pl and speedscope read
+  directly. It is cheap enough to use on production traffic.
+- cprofile (`X-Profile: cprofile`): a deterministic cProfile run. The output
+  is the top functions by cumulative time. It is exact but slows Python-heavy
+  code down. Only one cProfile run at a time per process; a concurrent one
+  falls back to sampling.
+
+Both modes also record an SQL timeline for every connection: offset from
+request start, duration, statement and parameter *shapes*, never values.
+That includes queries run on concurrent_reads pool threads.
+
+Records go into a ring buffer of PROFILING_BUFFER_SIZE entries. The response
+carries `X-Profile-Id`, and the record is read back through
+GET /api/metrics/profiles/<id>/ (admin only). A flag from a non-admin is
+ignored: the request runs normally, with no record and no header.
+
+A request without the flag costs one header lookup and one substring check.
+The middleware then calls the view directly, with no profiler, wrapper or
+DB query.
+"""
+import cProfile
+import itertools
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import ExitStack
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.db import connections
+
+from .auth import db_role
+from .middleware import params_shape
+
+HEADER = "HTTP_X_PROFILE"
+QUERY_FLAG = "__profile="
+MODES = ("sample", "cprofile")
+TOP_FUNCTIONS = 40
+
+
+def _enabled():
+    return getattr(settings, "PROFILING_ENABLED", True)
+
+
+class ProfileBuffer:
+    """Last N profiles, newest last."""
+
+    def __init__(self, size):
+        self._lock = threading.Lock()
+        self._records = deque(maxlen=size)
+        self._ids = itertools.count(1)
+
+    def add(self, record):
+        with self._lock:
+            record["id"] = next(self._ids)
+            self._records.append(record)
+        return record["id"]
+
+    def get(self, profile_id):
+        with self._lock:
+            for record in self._records:
+                if record["id"] == profile_id:
+                    return record
+        return None
+
+    def summaries(self):
+        keys = ("id", "captured_at", "method", "path", "view", "status", "mode", "total_ms", "db_ms", "queries")
+        with self._lock:
+            return [{k: r[k] for k in keys} for r in reversed(self._records)]
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+
+
+PROFILES = ProfileBuffer(getattr(settings, "PROFILING_BUFFER_SIZE", 50))
+
+_cprofile_lock = threading.Lock()
+
+
+def _frame_label(code):
+    path = code.co_filename
+    return f"{code.co_name} ({os.path.basename(os.path.dirname(path))}/{os.path.basename(path)}:{code.co_firstlineno})"
+
+
+class _Sampler(threading.Thread):
+    """Samples one thread's stack below `root` (the profiling middleware's frame)."""
+
+    def __init__(self, thread_id, root, interval):
+        super().__init__(name="request-profiler", daemon=True)
+        self.thread_id = thread_id
+        self.root = root
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._done = threading.Event()
+
+    def run(self):
+        while not self._done.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None and frame is not self.root:
+                stack.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+                self.samples += 1
+
+    def finish(self):
+        self._done.set()
+        self.join()
+
+
+class _SQLTimeline:
+    """execute_wrapper recording each statement's offset, duration and parameter shapes."""
+
+    def __init__(self, started, limit):
+        self.started = started
+        self.limit = limit
+        self.entries = []
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+    def wrapper(self, alias):
+        def record(execute, sql, params, many, context):
+            t0 = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                t1 = time.perf_counter()
+                entry = {
+                    "alias": alias,
+                    "thread": threading.current_thread().name,
+                    "offset_ms": round((t0 - self.started) * 1000, 2),
+                    "ms": round((t1 - t0) * 1000, 2),
+                    "sql": " ".join(str(sql).split()),
+                    "params": params_shape(params, many),
+                }
+                with self._lock:
+                    if len(self.entries) < self.limit:
+                        self.entries.append(entry)
+                    else:
+                        self.dropped += 1
+        return record
+
+
+def _top_functions(profiler):
+    stats = pstats.Stats(profiler)
+    rows = []
+    for (filename, line, name), (cc, nc, tt, ct, _) in stats.stats.items():
+        rows.append({
+            "function": f"{name} ({os.path.basename(os.path.dirname(filename))}/{os.path.basename(filename)}:{line})",
+            "calls": nc,
+            "self_ms": round(tt * 1000, 2),
+            "cumulative_ms": round(ct * 1000, 2),
+        })
+    rows.sort(key=lambda r: r["cumulative_ms"], reverse=True)
+    return rows[:TOP_FUNCTIONS]
+
+
+def requested_mode(request):
+    """'sample' / 'cprofile' if the request asks to be profiled, else None. No parsing when it doesn't."""
+    flag = request.META.get(HEADER)
+    if flag is None:
+        if QUERY_FLAG not in request.META.get("QUERY_STRING", ""):
+            return None
+        flag = request.GET.get("__profile", "")
+    flag = flag.strip().lower()
+    if flag in ("", "0", "false", "off"):
+        return None
+    return flag if flag in MODES else "sample"
+
+
+class ProfilingMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not _enabled() or (HEADER not in request.META and QUERY_FLAG not in request.META.get("QUERY_STRING", "")):
+            return self.get_response(request)
+
+        mode = requested_mode(request)
+        if mode is None or not self._is_admin(request):
+            return self.get_response(request)
+        return self._profile(request, mode)
+
+    @staticmethod
+    def _is_admin(request):
+        # same DB role check as require_admin, without its 401/403 responses
+        user_id = request.session.get("user_id")
+        return bool(user_id) and db_role(user_id) == "admin"
+
+    def _profile(self, request, mode):
+        started = time.perf_counter()
+        timeline = _SQLTimeline(started, getattr(settings, "PROFILING_MAX_QUERIES", 500))
+        sampler = profiler = None
+
+        if mode == "cprofile" and _cprofile_lock.acquire(blocking=False):
+            profiler = cProfile.Profile()
+        else:
+            mode = "sample"
+            interval = getattr(settings, "PROFILING_SAMPLE_INTERVAL_MS", 1) / 1000
+            sampler = _Sampler(threading.get_ident(), sys._getframe(), interval)
+
+        try:
+            with ExitStack() as stack:
+                for conn in connections.all():
+                    stack.enter_context(conn.execute_wrapper(timeline.wrapper(conn.alias)))
+                if sampler:
+                    sampler.start()
+                    try:
+                        response = self.get_response(request)
+                    finally:
+                        sampler.finish()
+                else:
+                    profiler.enable()
+                    try:
+                        response = self.get_response(request)
+                    finally:
+                        profiler.disable()
+        finally:
+            if profiler:
+                _cprofile_lock.release()
+
+        total_ms = (time.perf_counter() - started) * 1000
+        match = getattr(request, "resolver_match", None)
+        record = {
+            "captured_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "method": request.method,
+            "path": request.path,
+            "view": match.view_name if match else "unresolved",
+            "status": response.status_code,
+            "mode": mode,
+            "total_ms": round(total_ms, 2),
+            "db_ms": round(sum(e["ms"] for e in timeline.entries), 2),
+            "queries": len(timeline.entries) + timeline.dropped,
+            "sql": timeline.entries,
+            "sql_dropped": timeline.dropped,
+        }
+        if sampler:
+            record["samples"] = sampler.samples
+            record["collapsed"] = "\n".join(f"{stack} {n}" for stack, n in sampler.stacks.most_common())
+        else:
+            record["functions"] = _top_functions(profiler)
+
+        response["X-Profile-Id"] = str(PROFILES.add(record))
+        return response
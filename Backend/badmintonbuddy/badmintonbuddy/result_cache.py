@@ -0,0 +1,165 @@
+"""
+Server-side result cache for the spectator-heavy read endpoints
+(leaderboard, tournament_leaderboard, tournament_matches, tournament_bracket,
+list_tournaments).
+
+Built on Django's cache framework using the alias settings.RESULT_CACHE_ALIAS:
+local memory by default, any shared backend (Redis, Memcached) via settings.
+
+- cached(key, compute): get-or-compute with a stampede guard. Only one caller
+  per key recomputes. Others wait briefly for the fresh value instead of
+  running the same aggregate query.
+- invalidate(*keys): called by the write views for exactly the keys they affect.
+  It also replaces each key's version token. A recompute that read the token
+  before the invalidation doesn't store its (possibly stale) result.
+- stats(): hit / miss / recompute / wait counters for /api/metrics/.
+
+Recomputes always read from the primary, so a lagging replica can't be
+written back into the cache right after an invalidation.
+"""
+import re
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .db_routing import use_primary
+
+_MISSING = object()
+
+# key builders (keep every cache key for these views here)
+TOURNAMENTS_LIST = "tournaments:list"
+GLOBAL_LEADERBOARD = "leaderboard:global"
+
+
+def tournament_matches_key(tournament_id):
+    return f"tournament:{int(tournament_id)}:matches"
+
+
+def tournament_leaderboard_key(tournament_id):
+    return f"tournament:{int(tournament_id)}:leaderboard"
+
+
+def tournament_bracket_key(tournament_id):
+    return f"tournament:{int(tournament_id)}:bracket"
+
+
+def tournament_keys(tournament_id):
+    return [
+        tournament_matches_key(tournament_id),
+        tournament_leaderboard_key(tournament_id),
+        tournament_bracket_key(tournament_id),
+    ]
+
+
+def _cache():
+    return caches[getattr(settings, "RESULT_CACHE_ALIAS", "default")]
+
+
+class _Stats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {}
+
+    def incr(self, key, field):
+        group = re.sub(r":\d+", ":*", key)  # tournament:7:matches -> tournament:*:matches
+        with self._lock:
+            c = self._counts.setdefault(group, {"hits": 0, "misses": 0, "recomputes": 0, "waits": 0, "invalidations": 0})
+            c[field] += 1
+
+    def snapshot(self):
+        with self._lock:
+            out = {k: dict(v) for k, v in self._counts.items()}
+        for c in out.values():
+            lookups = c["hits"] + c["misses"]
+            c["hit_rate"] = round(c["hits"] / lookups, 4) if lookups else 0.0
+        return out
+
+    def reset(self):
+        with self._lock:
+            self._counts.clear()
+
+
+STATS = _Stats()
+
+# per-process guard; the cache.add() lock below covers other processes on shared backends.
+# Striped so the number of locks stays fixed however many keys are seen; RLock so a
+# compute() that reads another key on the same stripe doesn't deadlock.
+LOCK_STRIPES = 64
+_local_locks = [threading.RLock() for _ in range(LOCK_STRIPES)]
+
+
+def _local_lock(key):
+    return _local_locks[hash(key) % LOCK_STRIPES]
+
+
+def _version_key(key):
+    return f"{key}:version"
+
+
+def cached(key, compute, timeout=None):
+    cache = _cache()
+    value = cache.get(key, _MISSING)
+    if value is not _MISSING:
+        STATS.incr(key, "hits")
+        return value
+
+    STATS.incr(key, "misses")
+    timeout = timeout if timeout is not None else getattr(settings, "RESULT_CACHE_TIMEOUT", 60)
+    lock_timeout = getattr(settings, "RESULT_CACHE_LOCK_SECONDS", 5)
+
+    with _local_lock(key):
+        # someone in this process may have filled it while we waited on the lock
+        value = cache.get(key, _MISSING)
+        if value is not _MISSING:
+            STATS.incr(key, "waits")
+            return value
+
+        lock_key = f"{key}:lock"
+        token = uuid.uuid4().hex
+        acquired = cache.add(lock_key, token, lock_timeout)
+        if not acquired:
+            # another process is recomputing: wait for its result, then fall back to computing
+            STATS.incr(key, "waits")
+            deadline = time.monotonic() + lock_timeout
+            while time.monotonic() < deadline:
+                time.sleep(0.02)
+                value = cache.get(key, _MISSING)
+                if value is not _MISSING:
+                    return value
+
+        try:
+            STATS.incr(key, "recomputes")
+            version = cache.get(_version_key(key))
+            with use_primary():
+                value = compute()
+            # invalidated while computing: the result may predate the write, so don't store it
+            if cache.get(_version_key(key)) == version:
+                cache.set(key, value, timeout)
+                if cache.get(_version_key(key)) != version:
+                    cache.delete(key)
+        finally:
+            # only our own lock: after a timed-out wait, or if ours expired and someone
+            # else took it during a slow compute, the lock belongs to another worker
+            if acquired and cache.get(lock_key) == token:
+                cache.delete(lock_key)
+
+    return value
+
+
+def invalidate(*keys):
+    keys = [k for k in keys if k]
+    if not keys:
+        return
+    cache = _cache()
+    # new version tokens first, so a recompute already past its check deletes what it stored
+    cache.set_many({_version_key(k): uuid.uuid4().hex for k in keys}, None)
+    cache.delete_many(keys)
+    for k in keys:
+        STATS.incr(k, "invalidations")
+
+
+def stats():
+    return STATS.snapshot()
@@ -0,0 +1,122 @@
+"""
+Shared row -> JSON serialization for the list endpoints.
+
+Views run raw SQL and get positional tuples back. Instead of hand-building
+dicts with r[0], r[1], ... and str() on every datetime, each query defines a
+RowMapper once (module level, next to the view) naming its columns in SELECT
+order:
+
+    HISTORY_ROW = RowMapper(
+        "match_id", "court_id", "start_time", "end_time", "tournament_id",
+        extra={"type": lambda d: "tournament" if d["tournament_id"] is not None else "friendly"},
+    )
+
+    return json_response({"history": HISTORY_ROW.map(cur.fetchall())})
+
+Datetimes are left as objects and encoded straight to ISO 8601 by the JSON
+backend (orjson does this natively in C; the stdlib backend uses isoformat()).
+
+Backend selection: settings.JSON_ENCODER_BACKEND = "auto" | "orjson" | "stdlib"
+or a dotted path to a callable(obj) -> bytes. "auto" uses orjson if installed.
+"""
+import datetime
+import decimal
+import json
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.module_loading import import_string
+
+
+class RowMapper:
+    """Column-name-driven mapping of DB rows to dicts, defined once per query."""
+
+    def __init__(self, *columns, convert=None, extra=None):
+        """
+        columns: output keys, in SELECT order
+        convert: {column: fn} applied to non-NULL values (e.g. int for SUM()/COUNT())
+        extra:   {key: fn(row_dict)} computed keys appended after the columns
+        """
+        self.columns = columns
+        self.convert = [(columns.index(c), fn) for c, fn in (convert or {}).items()]
+        self.extra = list((extra or {}).items())
+
+    def one(self, row):
+        if row is None:
+            return None
+        if self.convert:
+            row = self._converted(row)
+        d = dict(zip(self.columns, row))
+        for key, fn in self.extra:
+            d[key] = fn(d)
+        return d
+
+    def map(self, rows):
+        cols = self.columns
+        if not self.convert and not self.extra:
+            return [dict(zip(cols, r)) for r in rows]
+        if self.convert:
+            rows = [self._converted(r) for r in rows]
+        out = [dict(zip(cols, r)) for r in rows]
+        for key, fn in self.extra:
+            for d in out:
+                d[key] = fn(d)
+        return out
+
+    def _converted(self, row):
+        row = list(row)
+        for i, fn in self.convert:
+            if row[i] is not None:
+                row[i] = fn(row[i])
+        return row
+
+
+def _default(obj):
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, decimal.Decimal):
+        return int(obj) if obj == obj.to_integral_value() else float(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def stdlib_dumps(obj):
+    return json.dumps(obj, default=_default, separators=(",", ":")).encode("utf-8")
+
+
+def orjson_dumps(obj):
+    import orjson
+    return orjson.dumps(obj, default=_default)
+
+
+_dumps = None
+
+
+def get_dumps():
+    """Resolve settings.JSON_ENCODER_BACKEND once per process."""
+    global _dumps
+    if _dumps is None:
+        backend = getattr(settings, "JSON_ENCODER_BACKEND", "auto")
+        if backend == "auto":
+            try:
+                import orjson  # noqa: F401
+                backend = "orjson"
+            except ImportError:
+                backend = "stdlib"
+
+        if backend == "orjson":
+            _dumps = orjson_dumps
+        elif backend == "stdlib":
+            _dumps = stdlib_dumps
+        else:
+            _dumps = import_string(backend)
+    return _dumps
+
+
+def dumps(obj):
+    return get_dumps()(obj)
+
+
+def json_response(payload, status=200, **kwargs):
+    """Drop-in for JsonResponse using the configured encoder backend."""
+    kwargs.setdefault("content_type", "application/json")
+    return HttpResponse(dumps(payload), status=status, **kwargs)
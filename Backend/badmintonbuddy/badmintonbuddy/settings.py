@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -24,6 +25,7 @@ SECRET_KEY = 'django-insecure-6*5z*q_o@!f0ib9t)s85w@xys@#-yaxsy=y+89gbnsfutzxz^)
 
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = True
+# Workers in production run the lean API-only profile: badmintonbuddy/settings_api.py
 
 ALLOWED_HOSTS = []
 
@@ -40,16 +42,20 @@ INSTALLED_APPS = [
     'users',
     'matches',
     'tournaments',
+    'jobs',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
+    'badmintonbuddy.db_routing.ReadYourWritesMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'badmintonbuddy.middleware.DBInstrumentationMiddleware',
+    'badmintonbuddy.profiling.ProfilingMiddleware',
 ]
 
 ROOT_URLCONF = 'badmintonbuddy.urls'
@@ -86,6 +92,23 @@ DATABASES = {
     }
 }
 
+# Optional read replica for @read_only views (badmintonbuddy/db_routing.py).
+# Enable by pointing BADMINTONBUDDY_REPLICA_HOST/PORT at a second MySQL instance,
+# e.g. a local replica on 127.0.0.1:3307.
+REPLICA_DB_ALIAS = 'replica'
+if os.environ.get('BADMINTONBUDDY_REPLICA_HOST'):
+    DATABASES[REPLICA_DB_ALIAS] = {
+        **DATABASES['default'],
+        'HOST': os.environ['BADMINTONBUDDY_REPLICA_HOST'],
+        'PORT': os.environ.get('BADMINTONBUDDY_REPLICA_PORT', '3306'),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['badmintonbuddy.db_routing.ReplicaRouter']
+
+# After a write, that session reads from the primary for this many seconds
+REPLICA_STICKY_SECONDS = 10
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -129,3 +152,115 @@ STATIC_URL = 'static/'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 SESSION_ENGINE = "django.contrib.sessions.backends.signed_cookies"
 
+
+# DB instrumentation (badmintonbuddy/middleware.py)
+# Statements slower than this are logged with their param shapes. None disables.
+DB_SLOW_QUERY_MS = 100
+# Samples kept per view for /api/metrics/ histograms
+VIEW_METRICS_WINDOW = 1000
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'badmintonbuddy.db': {'handlers': ['console'], 'level': 'WARNING'},
+        'users': {'handlers': ['console'], 'level': 'INFO'},
+        'matches': {'handlers': ['console'], 'level': 'INFO'},
+    },
+}
+
+# JSON encoder for list endpoints (badmintonbuddy/serializers.py):
+# "auto" (orjson if installed), "orjson", "stdlib", or a dotted path to callable(obj) -> bytes
+JSON_ENCODER_BACKEND = 'auto'
+
+# Caches. `results` backs badmintonbuddy/result_cache.py (leaderboards, tournament views).
+# Local memory by default (per process); point it at a shared backend for multi-worker
+# deployments, e.g.
+#   BADMINTONBUDDY_RESULT_CACHE_BACKEND=django.core.cache.backends.redis.RedisCache
+#   BADMINTONBUDDY_RESULT_CACHE_LOCATION=redis://127.0.0.1:6379/1
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'results': {
+        'BACKEND': os.environ.get('BADMINTONBUDDY_RESULT_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('BADMINTONBUDDY_RESULT_CACHE_LOCATION', 'results'),
+    },
+    # stored responses for Idempotency-Key retries; must be shared when several workers serve POSTs
+    'idempotency': {
+        'BACKEND': os.environ.get('BADMINTONBUDDY_IDEMPOTENCY_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('BADMINTONBUDDY_IDEMPOTENCY_CACHE_LOCATION', 'idempotency'),
+        'OPTIONS': {'MAX_ENTRIES': 50000},
+    },
+}
+RESULT_CACHE_ALIAS = 'results'
+RESULT_CACHE_TIMEOUT = 60        # seconds; writes invalidate explicitly, this is only a backstop
+RESULT_CACHE_LOCK_SECONDS = 5    # stampede guard: max wait for another worker's recompute
+
+# Idempotency-Key on booking / join / result POSTs (badmintonbuddy/idempotency.py)
+IDEMPOTENCY_CACHE_ALIAS = 'idempotency'
+IDEMPOTENCY_TTL_SECONDS = 24 * 3600  # how long a retry replays the stored response
+IDEMPOTENCY_LOCK_SECONDS = 30        # claim on a key while the first request runs
+IDEMPOTENCY_WAIT_SECONDS = 10        # max wait of a concurrent duplicate for that response
+
+# Admission control (badmintonbuddy/admission.py). Per process.
+# rate/burst: per-client token bucket (requests/sec); concurrency: in-flight cap for the scope.
+ADMISSION_LIMITS = {
+    'partners': {'rate': 1.0, 'burst': 5, 'concurrency': 8},
+    'history': {'rate': 2.0, 'burst': 10, 'concurrency': 8},
+    'leaderboard': {'concurrency': 4},  # only cache-miss recomputes take a slot
+    'analytics': {'concurrency': 2},
+    'dashboard': {'rate': 2.0, 'burst': 10, 'concurrency': 8},
+}
+
+# Background jobs (jobs/queue.py). In-process worker threads start on the first enqueue;
+# set to 0 and run `python manage.py run_jobs` for dedicated worker processes.
+JOBS_INPROCESS_WORKERS = 2
+JOBS_POLL_SECONDS = 1.0
+JOBS_MAX_ATTEMPTS = 5
+# finished jobs are deleted after this many days; workers purge once per interval (`run_jobs --purge`)
+JOBS_DONE_RETENTION_DAYS = 7
+JOBS_FAILED_RETENTION_DAYS = 30
+JOBS_PURGE_INTERVAL_SECONDS = 3600
+
+# Player search index (users/search.py): incremental sync of new users / full rebuild, in seconds
+PLAYER_SEARCH_SYNC_SECONDS = 5
+PLAYER_SEARCH_REBUILD_SECONDS = 900
+
+# Match archive (matches/archive.py, `manage.py archive_matches`): friendlies that ended more than
+# MATCH_ARCHIVE_HORIZON_DAYS ago move to the monthly-partitioned matches_archive table
+MATCH_ARCHIVE_HORIZON_DAYS = 180
+MATCH_ARCHIVE_BATCH_SIZE = 1000
+
+# Matchmaking (matches/matchmaking.py, `manage.py run_matchmaker`)
+MATCHMAKING_INTERVAL_SECONDS = 30  # batch period of run_matchmaker
+MATCHMAKING_NEIGHBORS = 50         # candidates per player in skill order
+MATCHMAKING_SLOT_MINUTES = 15      # booked start times align to this grid
+
+
+# GET /api/dashboard/ (badmintonbuddy/concurrent_reads.py): threads that run its independent
+# queries concurrently, shared by all requests. Each holds a DB connection while it runs a task.
+# 0 runs the sections one after another in the request thread.
+DASHBOARD_WORKERS = 4
+
+# Named SQL queries (badmintonbuddy/sql_registry.py), loaded and validated once at startup
+SQL_QUERY_DIR = BASE_DIR.parent / 'db' / 'sql'
+
+# On-demand profiling of single requests by admins (badmintonbuddy/profiling.py):
+# `X-Profile: 1` (sampling) or `X-Profile: cprofile`; read back on /api/metrics/profiles/<id>/
+PROFILING_ENABLED = True
+PROFILING_BUFFER_SIZE = 50          # profiles kept per process (ring buffer)
+PROFILING_SAMPLE_INTERVAL_MS = 1    # sampler period; effective resolution is bounded by sys.getswitchinterval()
+PROFILING_MAX_QUERIES = 500         # SQL timeline entries kept per profile
+
+# Per-user .ics feed (users/calendar_feed.py, GET /api/users/calendar/<token>.ics)
+ICS_FEED_PAST_DAYS = 90                  # matches that started earlier are left out (stay below the archive horizon)
+ICS_CACHE_ALIAS = RESULT_CACHE_ALIAS     # rendered VEVENTs, one entry per user per match
+ICS_EVENT_CACHE_SECONDS = 7 * 24 * 3600  # entries are stamped with their source row, so this only bounds memory
+
+# Daily user / court rollups (matches/rollups.py): `manage.py backfill_rollups` rebuilds
+# this many days per transaction
+ROLLUP_BACKFILL_CHUNK_DAYS = 7
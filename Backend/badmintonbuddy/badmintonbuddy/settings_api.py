@@ -0,0 +1,66 @@
+"""
+API-only runtime profile for autoscaled workers.
+
+    DJANGO_SETTINGS_MODULE=badmintonbuddy.settings_api gunicorn badmintonbuddy.wsgi
+
+Everything from settings.py, minus what a pure JSON API never uses:
+- no admin, messages, staticfiles, sessions / auth apps, no templates.
+  Sessions are signed cookies and passwords only need auth.hashers, so
+  neither app is required at runtime.
+- no CSRF / clickjacking / auth / messages middleware. Every write view is
+  @csrf_exempt and nothing reads request.user.
+- SECRET_KEY and ALLOWED_HOSTS must come from the environment
+  (BADMINTONBUDDY_SECRET_KEY, BADMINTONBUDDY_ALLOWED_HOSTS, comma-separated).
+  Startup fails with ImproperlyConfigured rather than falling back to the
+  development key or to '*'.
+- DEBUG off unless BADMINTONBUDDY_DEBUG=1. With DEBUG on Django keeps every
+  executed statement in connection.queries for the life of the request. In
+  this profile the only query logging is the slow-query log of
+  DBInstrumentationMiddleware (DB_SLOW_QUERY_MS, parameter shapes only).
+
+Migrations and management commands keep using badmintonbuddy.settings.
+`python bench_startup.py` compares cold start of both profiles.
+"""
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+from .settings import *  # noqa: F401,F403
+from .settings import LOGGING
+
+DEBUG = os.environ.get('BADMINTONBUDDY_DEBUG') == '1'
+
+SECRET_KEY = os.environ.get('BADMINTONBUDDY_SECRET_KEY', '')
+if not SECRET_KEY:
+    raise ImproperlyConfigured('BADMINTONBUDDY_SECRET_KEY must be set for the API profile')
+
+ALLOWED_HOSTS = [h.strip() for h in os.environ.get('BADMINTONBUDDY_ALLOWED_HOSTS', '').split(',') if h.strip()]
+if not ALLOWED_HOSTS:
+    raise ImproperlyConfigured('BADMINTONBUDDY_ALLOWED_HOSTS must list the served host names for the API profile')
+
+INSTALLED_APPS = [
+    'users',
+    'matches',
+    'tournaments',
+    'jobs',
+]
+
+MIDDLEWARE = [
+    'django.middleware.security.SecurityMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'badmintonbuddy.db_routing.ReadYourWritesMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'badmintonbuddy.middleware.DBInstrumentationMiddleware',
+    'badmintonbuddy.profiling.ProfilingMiddleware',
+]
+
+TEMPLATES = []
+
+# also silences django.db.backends if DEBUG is switched on for a single worker
+LOGGING = {
+    **LOGGING,
+    'loggers': {
+        **LOGGING['loggers'],
+        'django.db.backends': {'handlers': ['console'], 'level': 'WARNING', 'propagate': False},
+    },
+}
@@ -0,0 +1,259 @@
+"""
+Named SQL queries loaded from db/sql/*.sql (settings.SQL_QUERY_DIR).
+
+Hot queries live in .sql files rather than as string literals in the views,
+so they can be read, EXPLAINed and tuned in one place:
+
+    -- comments before the first marker describe the file
+    -- name: partner_matching
+    SELECT ... WHERE u.user_id <> :current_user_id ... LIMIT :limit;
+
+- A file holds one or more queries, each starting at a `-- name: <name>` line.
+  A file without markers is one query named after the file. *_schema.sql
+  files (DDL) are skipped.
+- Parameters are `:name` placeholders. A name may appear several times and
+  is bound to the same value each time. Literal `%` is escaped for the
+  DB-API. Placeholders inside quoted strings and comments are left alone.
+- Loading happens once, when this module is imported (URLconf import at
+  startup). These are errors (ImproperlyConfigured): an empty query, a
+  duplicate name, `{...}` string-format placeholders and positional `%s`.
+  Nothing is ever interpolated into the SQL text.
+
+    from badmintonbuddy.sql_registry import QUERIES
+    with reader().cursor() as cur:
+        QUERIES.execute(cur, "partner_matching", current_user_id=7, ...)
+        rows = cur.fetchall()
+
+Per query, execute() records count / total / max latency / errors, shown on
+GET /api/metrics/. GET /api/metrics/sql/?explain=<name> runs EXPLAIN with
+the parameters of that query's most recent execution and keeps the plan.
+The parameters stay in memory and are never returned or logged.
+"""
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections
+
+from .db_routing import current_read_alias
+
+NAME_MARKER = re.compile(r"^\s*--\s*name:\s*([A-Za-z_][\w.]*)\s*$")
+FORMAT_PLACEHOLDER = re.compile(r"\{[A-Za-z_]\w*\}")
+SKIP_FILES = ("*_schema.sql",)
+
+
+class QueryError(ValueError):
+    pass
+
+
+class Query:
+    __slots__ = ("name", "source", "text", "sql", "params")
+
+    def __init__(self, name, source, text):
+        self.name = name
+        self.source = source        # "file.sql:line"
+        self.text = text            # as written, :named
+        self.sql, self.params = _compile(text, source)
+
+    def bind(self, values):
+        """values: {param: value}. Returns [value] in %s order."""
+        missing = [p for p in dict.fromkeys(self.params) if p not in values]
+        if missing:
+            raise QueryError(f"{self.name}: missing parameter(s) {', '.join(missing)}")
+        extra = set(values) - set(self.params)
+        if extra:
+            raise QueryError(f"{self.name}: unknown parameter(s) {', '.join(sorted(extra))}")
+        return [values[p] for p in self.params]
+
+
+def _compile(text, source):
+    """:named -> %s. Returns (sql, [param name per %s])."""
+    if FORMAT_PLACEHOLDER.search(text):
+        raise ImproperlyConfigured(f"{source}: use :name parameters, not {{...}} placeholders")
+
+    out, params = [], []
+    i, n = 0, len(text)
+    while i < n:
+        ch = text[i]
+        if ch in ("'", '"', "`"):
+            # quoted literal / identifier: copied as is ('' and \' stay inside)
+            j = i + 1
+            while j < n:
+                if text[j] == "\\":
+                    j += 2
+                    continue
+                if text[j] == ch:
+                    if j + 1 < n and text[j + 1] == ch:
+                        j += 2
+                        continue
+                    break
+                j += 1
+            out.append(text[i:j + 1].replace("%", "%%"))
+            i = j + 1
+        elif text.startswith("--", i):
+            j = text.find("\n", i)
+            j = n if j < 0 else j
+            out.append(text[i:j].replace("%", "%%"))
+            i = j
+        elif ch == "%":
+            if text.startswith("%s", i):
+                raise ImproperlyConfigured(f"{source}: positional %s parameter; use :name")
+            out.append("%%")
+            i += 1
+        elif ch == ":" and i + 1 < n and (text[i + 1].isalpha() or text[i + 1] == "_") and text[i - 1:i] != ":":
+            j = i + 1
+            while j < n and (text[j].isalnum() or text[j] == "_"):
+                j += 1
+            params.append(text[i + 1:j])
+            out.append("%s")
+            i = j
+        else:
+            out.append(ch)
+            i += 1
+    return "".join(out), params
+
+
+def _split(path):
+    """Yields (name, line, text) per query in one file."""
+    lines = path.read_text(encoding="utf-8").splitlines()
+    marked = [(i, NAME_MARKER.match(line).group(1)) for i, line in enumerate(lines) if NAME_MARKER.match(line)]
+    if not marked:
+        marked = [(-1, path.stem)]
+
+    for k, (start, name) in enumerate(marked):
+        end = marked[k + 1][0] if k + 1 < len(marked) else len(lines)
+        body = [line for line in lines[start + 1:end] if not line.strip().startswith("--")]
+        text = "\n".join(body).strip().rstrip(";").strip()
+        yield name, start + 2, text
+
+
+class _Stats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {}
+
+    def record(self, name, ms, ok):
+        with self._lock:
+            c = self._counts.setdefault(name, {"count": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0})
+            c["count"] += 1
+            c["total_ms"] += ms
+            if ms > c["max_ms"]:
+                c["max_ms"] = ms
+            if not ok:
+                c["errors"] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                name: {
+                    "count": c["count"],
+                    "errors": c["errors"],
+                    "avg_ms": round(c["total_ms"] / c["count"], 2) if c["count"] else 0.0,
+                    "max_ms": round(c["max_ms"], 2),
+                    "total_ms": round(c["total_ms"], 1),
+                }
+                for name, c in self._counts.items()
+            }
+
+    def reset(self):
+        with self._lock:
+            self._counts.clear()
+
+
+STATS = _Stats()
+
+
+class Registry:
+    def __init__(self):
+        self.queries = {}
+        self._last_params = {}   # name -> values of the latest execution (for explain)
+        self._plans = {}         # name -> {"captured_at", "plan"}
+
+    def load(self, directory):
+        directory = Path(directory)
+        if not directory.is_dir():
+            raise ImproperlyConfigured(f"SQL_QUERY_DIR {directory} is not a directory")
+
+        queries = {}
+        for path in sorted(directory.glob("*.sql")):
+            if any(path.match(pattern) for pattern in SKIP_FILES):
+                continue
+            for name, line, text in _split(path):
+                source = f"{path.name}:{max(line, 1)}"
+                if not text:
+                    raise ImproperlyConfigured(f"{source}: query {name!r} is empty")
+                if name in queries:
+                    raise ImproperlyConfigured(f"{source}: query {name!r} already defined in {queries[name].source}")
+                queries[name] = Query(name, source, text)
+        self.queries = queries
+        return self
+
+    def get(self, name):
+        try:
+            return self.queries[name]
+        except KeyError:
+            raise QueryError(f"unknown query {name!r}") from None
+
+    def bind(self, name, **values):
+        """(sql, params) for cur.execute() or composition (e.g. tests EXPLAINing it)."""
+        query = self.get(name)
+        return query.sql, query.bind(values)
+
+    def execute(self, cur, name, **values):
+        query = self.get(name)
+        params = query.bind(values)
+        self._last_params[name] = values
+        started = time.perf_counter()
+        ok = False
+        try:
+            cur.execute(query.sql, params)
+            ok = True
+            return cur
+        finally:
+            STATS.record(name, (time.perf_counter() - started) * 1000, ok)
+
+    def explain(self, name, values=None, using=None):
+        """
+        EXPLAIN the query with `values`, or with those of its latest execution.
+        Keeps the plan for plans(). None if it never ran and no values were given.
+        """
+        query = self.get(name)
+        values = values if values is not None else self._last_params.get(name)
+        if values is None:
+            return None
+        with connections[using or current_read_alias()].cursor() as cur:
+            cur.execute("EXPLAIN " + query.sql, query.bind(values))
+            columns = [c[0].lower() for c in cur.description]
+            plan = [dict(zip(columns, row)) for row in cur.fetchall()]
+        self._plans[name] = {
+            "captured_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "plan": plan,
+        }
+        return plan
+
+    def describe(self):
+        """Every query with its source, parameters and last captured plan."""
+        return {
+            name: {
+                "source": q.source,
+                "params": list(dict.fromkeys(q.params)),
+                "sql": q.text,
+                "explain": self._plans.get(name),
+            }
+            for name, q in sorted(self.queries.items())
+        }
+
+
+def _default_dir():
+    return getattr(settings, "SQL_QUERY_DIR", Path(settings.BASE_DIR).parent / "db" / "sql")
+
+
+QUERIES = Registry().load(_default_dir())
+
+
+def stats():
+    return STATS.snapshot()
@@ -0,0 +1,319 @@
+import json
+import tempfile
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.http import JsonResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from badmintonbuddy import idempotency, result_cache
+from badmintonbuddy.admission import Overloaded, TokenBucket, bounded_int, concurrency_slot, streaming
+from badmintonbuddy.serializers import RowMapper, stdlib_dumps
+from badmintonbuddy.sql_registry import Query, QueryError, Registry, _compile, _split
+
+
+@override_settings(
+    CACHES={"idem": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "idempotency-tests"}},
+    IDEMPOTENCY_CACHE_ALIAS="idem",
+    IDEMPOTENCY_WAIT_SECONDS=0.1,
+)
+class IdempotencyTests(SimpleTestCase):
+    def setUp(self):
+        caches["idem"].clear()
+        self.factory = RequestFactory()
+        self.calls = 0
+
+    def _post(self, view, body, key="key-1", user_id=7):
+        request = self.factory.post(
+            "/api/matches/book/", data=json.dumps(body), content_type="application/json",
+            headers={idempotency.HEADER: key},
+        )
+        request.session = {"user_id": user_id}
+        return view(request)
+
+    def _view(self, status=201):
+        @idempotency.idempotent("test")
+        def view(request):
+            self.calls += 1
+            return JsonResponse({"call": self.calls}, status=status)
+        return view
+
+    def test_replay_returns_the_stored_response(self):
+        view = self._view()
+        first = self._post(view, {"court_id": 1})
+        second = self._post(view, {"court_id": 1})
+        self.assertEqual(self.calls, 1)
+        self.assertEqual((second.status_code, second.content), (first.status_code, first.content))
+        self.assertEqual(second["Idempotent-Replayed"], "true")
+        self.assertFalse(first.has_header("Idempotent-Replayed"))
+
+    def test_keys_are_per_user(self):
+        view = self._view()
+        self._post(view, {"court_id": 1}, user_id=7)
+        self._post(view, {"court_id": 1}, user_id=8)
+        self.assertEqual(self.calls, 2)
+
+    def test_same_key_with_a_different_body_is_rejected(self):
+        view = self._view()
+        self._post(view, {"court_id": 1})
+        response = self._post(view, {"court_id": 2})
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(self.calls, 1)
+
+    def test_in_flight_duplicate_gets_409(self):
+        nested = []
+
+        @idempotency.idempotent("test")
+        def view(request):
+            self.calls += 1
+            if not nested:
+                # the retry arrives while the first request still holds the key
+                nested.append(self._post(view, {"court_id": 1}))
+            return JsonResponse({"ok": True}, status=201)
+
+        first = self._post(view, {"court_id": 1})
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(nested[0].status_code, 409)
+        self.assertEqual(nested[0]["Retry-After"], "1")
+        self.assertEqual(self.calls, 1)
+
+    def test_server_errors_are_not_stored(self):
+        view = self._view(status=503)
+        self._post(view, {"court_id": 1})
+        response = self._post(view, {"court_id": 1})
+        self.assertEqual(self.calls, 2)
+        self.assertFalse(response.has_header("Idempotent-Replayed"))
+
+    def test_without_a_key_the_view_always_runs(self):
+        view = self._view()
+        for _ in range(2):
+            request = self.factory.post("/api/matches/book/", data="{}", content_type="application/json")
+            request.session = {"user_id": 7}
+            view(request)
+        self.assertEqual(self.calls, 2)
+
+
+@override_settings(
+    CACHES={"results": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "result-cache-tests"}},
+    RESULT_CACHE_ALIAS="results",
+)
+class ResultCacheTests(SimpleTestCase):
+    KEY = "tournament:1:matches"
+
+    def setUp(self):
+        caches["results"].clear()
+
+    def test_computes_once_then_hits(self):
+        calls = []
+        for _ in range(3):
+            value = result_cache.cached(self.KEY, lambda: calls.append(1) or len(calls))
+        self.assertEqual(value, 1)
+        self.assertEqual(len(calls), 1)
+
+    def test_invalidate_forces_a_recompute(self):
+        result_cache.cached(self.KEY, lambda: "old")
+        result_cache.invalidate(self.KEY)
+        self.assertEqual(result_cache.cached(self.KEY, lambda: "new"), "new")
+
+    def test_recompute_racing_an_invalidation_is_not_stored(self):
+        def compute():
+            # a write lands while the aggregate is being read
+            result_cache.invalidate(self.KEY)
+            return "stale"
+
+        self.assertEqual(result_cache.cached(self.KEY, compute), "stale")
+        self.assertEqual(result_cache.cached(self.KEY, lambda: "fresh"), "fresh")
+        self.assertEqual(result_cache.cached(self.KEY, lambda: "again"), "fresh")
+
+    def test_local_locks_do_not_grow_with_keys(self):
+        for i in range(500):
+            result_cache.cached(result_cache.tournament_matches_key(i), lambda: i)
+        self.assertEqual(len(result_cache._local_locks), result_cache.LOCK_STRIPES)
+
+    def test_nested_compute_on_the_same_stripe_does_not_deadlock(self):
+        inner = next(
+            k for k in (f"tournament:{i}:bracket" for i in range(10_000))
+            if result_cache._local_lock(k) is result_cache._local_lock(self.KEY)
+        )
+        value = result_cache.cached(self.KEY, lambda: result_cache.cached(inner, lambda: 5) + 1)
+        self.assertEqual(value, 6)
+
+
+class SqlCompileTests(SimpleTestCase):
+    def test_named_parameters_become_positional(self):
+        sql, params = _compile("SELECT * FROM users WHERE user_id = :user_id AND skill_rating > :min_skill", "t.sql:1")
+        self.assertEqual(sql, "SELECT * FROM users WHERE user_id = %s AND skill_rating > %s")
+        self.assertEqual(params, ["user_id", "min_skill"])
+
+    def test_placeholders_in_strings_and_comments_are_left_alone(self):
+        text = (
+            "SELECT ':not_a_param', \"also :not\", `odd:col` -- :comment_param\n"
+            "FROM t WHERE a = 'it''s :x' AND b = :b"
+        )
+        sql, params = _compile(text, "t.sql:1")
+        self.assertEqual(params, ["b"])
+        self.assertIn("':not_a_param'", sql)
+        self.assertIn("-- :comment_param", sql)
+        self.assertIn("'it''s :x'", sql)
+
+    def test_double_colon_cast_is_not_a_parameter(self):
+        sql, params = _compile("SELECT created_at::date FROM t WHERE id = :id", "t.sql:1")
+        self.assertEqual(sql, "SELECT created_at::date FROM t WHERE id = %s")
+        self.assertEqual(params, ["id"])
+
+    def test_repeated_parameter_binds_the_same_value(self):
+        query = Query("q", "t.sql:1", "SELECT 1 WHERE a = :uid OR b = :uid AND c < :limit")
+        self.assertEqual(query.sql.count("%s"), 3)
+        self.assertEqual(query.bind({"uid": 7, "limit": 5}), [7, 7, 5])
+
+    def test_literal_percent_is_escaped(self):
+        sql, params = _compile("SELECT name FROM users WHERE name LIKE 'a%' AND pct > 50 % :mod", "t.sql:1")
+        self.assertEqual(sql, "SELECT name FROM users WHERE name LIKE 'a%%' AND pct > 50 %% %s")
+        self.assertEqual(params, ["mod"])
+
+    def test_positional_and_format_placeholders_are_rejected(self):
+        with self.assertRaises(ImproperlyConfigured):
+            _compile("SELECT * FROM t WHERE id = %s", "t.sql:1")
+        with self.assertRaises(ImproperlyConfigured):
+            _compile("SELECT * FROM {table}", "t.sql:1")
+
+    def test_missing_and_unknown_parameters_raise(self):
+        query = Query("q", "t.sql:1", "SELECT 1 WHERE a = :a AND b = :b")
+        with self.assertRaisesMessage(QueryError, "missing parameter(s) b"):
+            query.bind({"a": 1})
+        with self.assertRaisesMessage(QueryError, "unknown parameter(s) c"):
+            query.bind({"a": 1, "b": 2, "c": 3})
+
+
+class SqlSplitTests(SimpleTestCase):
+    def _write(self, name, text):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = Path(directory.name) / name
+        path.write_text(text, encoding="utf-8")
+        return path
+
+    def test_marked_queries_are_split_without_comments_or_semicolons(self):
+        path = self._write("many.sql", (
+            "-- describes the file\n"
+            "-- name: first\n"
+            "-- what first does\n"
+            "SELECT 1;\n"
+            "\n"
+            "-- name: second.part\n"
+            "SELECT 2\n"
+            "FROM t;\n"
+        ))
+        self.assertEqual(list(_split(path)), [("first", 3, "SELECT 1"), ("second.part", 7, "SELECT 2\nFROM t")])
+
+    def test_file_without_markers_is_one_query_named_after_it(self):
+        path = self._write("lonely.sql", "-- comment\nSELECT :x;\n")
+        self.assertEqual(list(_split(path)), [("lonely", 1, "SELECT :x")])
+
+    def test_registry_rejects_duplicate_and_empty_queries(self):
+        path = self._write("a.sql", "-- name: q\nSELECT 1;\n-- name: q\nSELECT 2;\n")
+        with self.assertRaisesMessage(ImproperlyConfigured, "already defined"):
+            Registry().load(path.parent)
+        path.write_text("-- name: empty\n-- nothing here\n", encoding="utf-8")
+        with self.assertRaisesMessage(ImproperlyConfigured, "is empty"):
+            Registry().load(path.parent)
+
+    def test_unknown_query_name_raises(self):
+        with self.assertRaises(QueryError):
+            Registry().get("nope")
+
+
+class RowMapperTests(SimpleTestCase):
+    ROW = RowMapper(
+        "match_id", "wins", "start_time", "tournament_id",
+        convert={"wins": int},
+        extra={"type": lambda d: "tournament" if d["tournament_id"] is not None else "friendly"},
+    )
+
+    def test_map_names_columns_in_select_order(self):
+        mapper = RowMapper("user_id", "name")
+        self.assertEqual(mapper.map([(1, "Ann"), (2, "Bo")]), [{"user_id": 1, "name": "Ann"}, {"user_id": 2, "name": "Bo"}])
+
+    def test_convert_skips_nulls_and_extra_sees_the_row(self):
+        start = datetime(2026, 1, 10, 10, 0)
+        rows = [(1, Decimal("3"), start, 9), (2, None, start, None)]
+        self.assertEqual(self.ROW.map(rows), [
+            {"match_id": 1, "wins": 3, "start_time": start, "tournament_id": 9, "type": "tournament"},
+            {"match_id": 2, "wins": None, "start_time": start, "tournament_id": None, "type": "friendly"},
+        ])
+
+    def test_one_matches_map(self):
+        row = (1, Decimal("2"), datetime(2026, 1, 10), None)
+        self.assertEqual(self.ROW.one(row), self.ROW.map([row])[0])
+        self.assertIsNone(self.ROW.one(None))
+
+    def test_stdlib_encoder_writes_iso_datetimes_and_decimals(self):
+        payload = {"at": datetime(2026, 1, 10, 10, 0), "n": Decimal("2"), "x": Decimal("2.5")}
+        self.assertEqual(json.loads(stdlib_dumps(payload)), {"at": "2026-01-10T10:00:00", "n": 2, "x": 2.5})
+
+
+class TokenBucketTests(SimpleTestCase):
+    def test_burst_then_wait(self):
+        bucket = TokenBucket(rate=2, burst=3)
+        self.assertEqual([bucket.take() for _ in range(3)], [0.0, 0.0, 0.0])
+        self.assertAlmostEqual(bucket.take(), 0.5, places=2)
+
+    def test_refills_at_rate_up_to_burst(self):
+        bucket = TokenBucket(rate=2, burst=3)
+        for _ in range(3):
+            bucket.take()
+        bucket.updated -= 1.0          # one second later: two tokens back
+        self.assertEqual([bucket.take() for _ in range(2)], [0.0, 0.0])
+        self.assertGreater(bucket.take(), 0)
+
+        bucket.updated -= 3600         # an idle hour never banks more than the burst
+        self.assertEqual([bucket.take() for _ in range(3)], [0.0, 0.0, 0.0])
+        self.assertGreater(bucket.take(), 0)
+
+    def test_zero_rate_never_refills(self):
+        bucket = TokenBucket(rate=0, burst=1)
+        self.assertEqual(bucket.take(), 0.0)
+        self.assertEqual(bucket.take(), 60.0)
+
+
+class BoundedIntTests(SimpleTestCase):
+    def test_default_when_missing_or_blank(self):
+        self.assertEqual(bounded_int({}, "limit", 20, 1, 100), (20, None))
+        self.assertEqual(bounded_int({"limit": ""}, "limit", 20, 1, 100), (20, None))
+
+    def test_clamped_into_range(self):
+        self.assertEqual(bounded_int({"limit": "500"}, "limit", 20, 1, 100), (100, None))
+        self.assertEqual(bounded_int({"limit": "-3"}, "limit", 20, 1, 100), (1, None))
+        self.assertEqual(bounded_int({"limit": "42"}, "limit", 20, 1, 100), (42, None))
+
+    def test_non_integer_is_a_400(self):
+        value, err = bounded_int({"limit": "ten"}, "limit", 20, 1, 100)
+        self.assertIsNone(value)
+        self.assertEqual(err.status_code, 400)
+        self.assertEqual(json.loads(err.content), {"error": "limit must be an integer"})
+
+
+@override_settings(ADMISSION_LIMITS={"test-slots": {"concurrency": 1}})
+class ConcurrencySlotTests(SimpleTestCase):
+    def test_second_caller_is_turned_away_until_release(self):
+        with concurrency_slot("test-slots"):
+            with self.assertRaises(Overloaded):
+                with concurrency_slot("test-slots"):
+                    pass
+        with concurrency_slot("test-slots"):
+            pass
+
+    def test_streaming_holds_the_slot_until_closed(self):
+        body = streaming("test-slots", iter([b"a", b"b"]))
+        self.assertEqual(list(body), [b"a", b"b"])
+        with self.assertRaises(Overloaded):
+            streaming("test-slots", iter([]))
+        body.close()
+        streaming("test-slots", iter([])).close()
+
+    def test_unlimited_scope_takes_no_slot(self):
+        rows = iter([])
+        self.assertIs(streaming("no-such-scope", rows), rows)
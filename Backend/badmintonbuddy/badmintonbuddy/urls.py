@@ -14,14 +14,25 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
-from django.contrib import admin
+from django.apps import apps
 from django.urls import path, include
 
-urlpatterns = [
-    path('admin/', admin.site.urls),
+from . import views
 
+urlpatterns = [
     path('api/users/', include('users.urls')),
     path('api/matches/', include('matches.urls')),
     path('api/tournaments/', include('tournaments.urls')),
+
+    path('api/dashboard/', views.dashboard, name='dashboard'),
+    path('api/metrics/', views.metrics, name='metrics'),
+    path('api/metrics/sql/', views.metrics_sql, name='metrics_sql'),
+    path('api/metrics/profiles/', views.profiles, name='profiles'),
+    path('api/metrics/profiles/<int:profile_id>/', views.profile_detail, name='profile_detail'),
 ]
 
+# the API-only profile (settings_api.py) doesn't install the admin
+if apps.is_installed('django.contrib.admin'):
+    from django.contrib import admin
+
+    urlpatterns.insert(0, path('admin/', admin.site.urls))
@@ -0,0 +1,176 @@
+from django.db import DatabaseError
+from django.http import HttpResponse, JsonResponse
+from django.views.decorators.http import require_GET
+
+from jobs import queue as job_queue
+from matches.views import HISTORY_LIMIT, _history
+from tournaments.views import _leaderboard
+from users import calendar_feed
+from users.views import _match_breakdown, _stats_payload, _stats_user
+
+from . import idempotency, result_cache, sql_registry
+from .auth import require_admin
+from .profiling import PROFILES
+from .admission import admission_control, bounded_int
+from .concurrent_reads import gather
+from .db_routing import read_only
+from .middleware import VIEW_METRICS
+from .serializers import json_response
+
+DASHBOARD_SECTIONS = ("history", "leaderboard", "stats")
+
+
+@require_GET
+def metrics(request):
+    """
+    GET /api/metrics/[?reset=1]
+    Admin only. Rolling per-view latency / DB histograms, result cache hit rates,
+    idempotency key replays, per named SQL query counts + latency, ICS feed builds vs 304s,
+    job queue depth + latency.
+    reset=1 clears the samples after returning them.
+    """
+    admin_id, err = require_admin(request)
+    if err:
+        return err
+
+    payload = {
+        "window": VIEW_METRICS.window,
+        "views": VIEW_METRICS.snapshot(),
+        "result_cache": result_cache.stats(),
+        "idempotency": idempotency.stats(),
+        "sql": sql_registry.stats(),
+        "calendar_feed": calendar_feed.stats(),
+    }
+    try:
+        payload["jobs"] = job_queue.metrics()
+    except DatabaseError:
+        payload["jobs"] = None  # jobs table not migrated yet
+
+    if request.GET.get("reset") in ("1", "true"):
+        VIEW_METRICS.reset()
+        result_cache.STATS.reset()
+        idempotency.STATS.reset()
+        sql_registry.STATS.reset()
+        calendar_feed.STATS.reset()
+
+    return JsonResponse(payload)
+
+
+@require_GET
+def metrics_sql(request):
+    """
+    GET /api/metrics/sql/[?explain=<name>]
+    Admin only. Every named query of the SQL registry (db/sql/*.sql) with its
+    source, parameters, latency stats and last captured EXPLAIN plan.
+    explain=<name> captures that query's plan now, with the parameters of its
+    latest execution (404 if it hasn't run in this process yet).
+    """
+    admin_id, err = require_admin(request)
+    if err:
+        return err
+
+    name = request.GET.get("explain")
+    if name:
+        if name not in sql_registry.QUERIES.queries:
+            return JsonResponse({"error": f"Unknown query: {name}"}, status=404)
+        if sql_registry.QUERIES.explain(name) is None:
+            return JsonResponse({"error": f"{name} has not run in this process yet"}, status=404)
+
+    queries = sql_registry.QUERIES.describe()
+    stats = sql_registry.stats()
+    for query_name, info in queries.items():
+        info["stats"] = stats.get(query_name)
+    return JsonResponse({"queries": queries})
+
+
+@require_GET
+def profiles(request):
+    """
+    GET /api/metrics/profiles/[?clear=1]
+    Admin only. Summaries of the profiled requests in the ring buffer, newest first
+    (badmintonbuddy/profiling.py). Profile a request with `X-Profile: 1` or `X-Profile: cprofile`.
+    """
+    admin_id, err = require_admin(request)
+    if err:
+        return err
+
+    payload = {"profiles": PROFILES.summaries()}
+    if request.GET.get("clear") in ("1", "true"):
+        PROFILES.clear()
+    return JsonResponse(payload)
+
+
+@require_GET
+def profile_detail(request, profile_id):
+    """
+    GET /api/metrics/profiles/<id>/[?format=collapsed]
+    Admin only. One profile: SQL timeline plus collapsed stacks (sample) or top
+    functions (cprofile). format=collapsed returns the stacks as text/plain for
+    flamegraph.pl / speedscope.
+    """
+    admin_id, err = require_admin(request)
+    if err:
+        return err
+
+    record = PROFILES.get(profile_id)
+    if record is None:
+        return JsonResponse({"error": "Profile not found (the buffer keeps the most recent ones)"}, status=404)
+
+    if request.GET.get("format") == "collapsed":
+        if "collapsed" not in record:
+            return JsonResponse({"error": "Only sampled profiles have collapsed stacks"}, status=400)
+        return HttpResponse(record["collapsed"] + "\n", content_type="text/plain; charset=utf-8")
+    return JsonResponse(record)
+
+
+@require_GET
+@admission_control("dashboard")
+@read_only
+def dashboard(request):
+    """
+    GET /api/dashboard/[?fields=history,leaderboard,stats][&history_limit=50]
+    Logged-in user's dashboard in one request. Each section has the same shape
+    as its endpoint:
+    - history:     /api/matches/history/ "history"
+    - leaderboard: /api/tournaments/leaderboard/ "leaderboard" (cached)
+    - stats:       /api/users/stats/ "user"
+    fields picks the sections (default: all). The queries behind them run
+    concurrently (badmintonbuddy/concurrent_reads.py).
+    """
+    user_id = request.session.get("user_id")
+    if not user_id:
+        return JsonResponse({"error": "Not logged in"}, status=401)
+
+    fields = request.GET.get("fields")
+    sections = [f.strip() for f in fields.split(",") if f.strip()] if fields else list(DASHBOARD_SECTIONS)
+    unknown = sorted(set(sections) - set(DASHBOARD_SECTIONS))
+    if unknown:
+        return JsonResponse(
+            {"error": f"Unknown fields: {', '.join(unknown)}; choose from {', '.join(DASHBOARD_SECTIONS)}"},
+            status=400
+        )
+
+    limit, err = bounded_int(request.GET, "history_limit", HISTORY_LIMIT, 1, HISTORY_LIMIT)
+    if err:
+        return err
+
+    tasks = {}
+    if "stats" in sections:
+        tasks["user"] = lambda: _stats_user(user_id)
+        tasks["breakdown"] = lambda: _match_breakdown(user_id)
+    if "history" in sections:
+        tasks["history"] = lambda: _history(user_id, limit)
+    if "leaderboard" in sections:
+        tasks["leaderboard"] = lambda: _leaderboard()["leaderboard"]
+    results = gather(tasks)
+
+    payload = {"user_id": int(user_id)}
+    if "stats" in sections:
+        if not results["user"]:
+            return JsonResponse({"error": "User not found"}, status=404)
+        payload["stats"] = _stats_payload(results["user"], results["breakdown"])
+    for section in ("history", "leaderboard"):
+        if section in results:
+            payload[section] = results[section]
+
+    return json_response(payload)
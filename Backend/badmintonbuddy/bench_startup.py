@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+"""
+Cold-start benchmark for the settings profiles.
+
+Each run is a fresh interpreter (what an autoscaled worker pays) that measures:
+- setup:   import Django + get_wsgi_application() (settings, app registry, middleware)
+- first:   first request through the WSGI app (URLconf + view modules import)
+- warm:    median of the following requests (per-request overhead)
+- rss:     peak resident memory afterwards
+
+The default path answers 401 before touching the database, so no DB is needed.
+
+    python bench_startup.py
+    python bench_startup.py --runs 10 --path /api/users/stats/
+    python bench_startup.py --settings badmintonbuddy.settings_api
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+PROFILES = ("badmintonbuddy.settings", "badmintonbuddy.settings_api")
+
+CHILD = r"""
+import io, json, resource, sys, time
+t0 = time.perf_counter()
+from django.core.wsgi import get_wsgi_application
+app = get_wsgi_application()
+t1 = time.perf_counter()
+
+def request(path):
+    environ = {
+        "REQUEST_METHOD": "GET", "PATH_INFO": path, "QUERY_STRING": "",
+        "SERVER_NAME": "localhost", "SERVER_PORT": "80", "HTTP_HOST": "localhost",
+        "wsgi.url_scheme": "http", "wsgi.input": io.BytesIO(), "wsgi.errors": sys.stderr,
+    }
+    status = []
+    body = b"".join(app(environ, lambda s, h, exc_info=None: status.append(s)))
+    return status[0], body
+
+status, _ = request(__PATH__)
+t2 = time.perf_counter()
+warm = []
+for _ in range(__WARM__):
+    s = time.perf_counter()
+    request(__PATH__)
+    warm.append(time.perf_counter() - s)
+warm.sort()
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({
+    "status": status, "setup": t1 - t0, "first": t2 - t1,
+    "warm": warm[len(warm) // 2], "rss_mb": rss_kb / 1024,
+    "modules": len(sys.modules),
+}))
+"""
+
+
+def run_once(settings_module, path, warm):
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE=settings_module)
+    # settings_api refuses to start without these; the bench only talks to localhost
+    env.setdefault("BADMINTONBUDDY_SECRET_KEY", "bench-startup-only")
+    env.setdefault("BADMINTONBUDDY_ALLOWED_HOSTS", "localhost")
+    code = CHILD.replace("__PATH__", repr(path)).replace("__WARM__", str(int(warm)))
+    out = subprocess.run(
+        [sys.executable, "-c", code], env=env, cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--settings", default=",".join(PROFILES), help="Comma-separated settings modules")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh processes per profile")
+    parser.add_argument("--warm", type=int, default=200, help="Warm requests per process")
+    parser.add_argument("--path", default="/api/users/stats/")
+    args = parser.parse_args()
+
+    print(f"{'profile':<32} {'status':<18} {'setup ms':>9} {'first ms':>9} {'total ms':>9} "
+          f"{'warm us':>8} {'rss MB':>7} {'modules':>8}")
+    for settings_module in [s.strip() for s in args.settings.split(",") if s.strip()]:
+        runs = [run_once(settings_module, args.path, args.warm) for _ in range(args.runs)]
+
+        def med(key):
+            return statistics.median(r[key] for r in runs)
+
+        print(
+            f"{settings_module:<32} {runs[0]['status']:<18} {med('setup') * 1000:>9.1f} "
+            f"{med('first') * 1000:>9.1f} {(med('setup') + med('first')) * 1000:>9.1f} "
+            f"{med('warm') * 1e6:>8.0f} {med('rss_mb'):>7.1f} {med('modules'):>8.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
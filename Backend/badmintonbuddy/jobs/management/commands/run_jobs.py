@@ -0,0 +1,51 @@
+import json
+import signal
+import threading
+
+from django.core.management.base import BaseCommand
+
+from jobs import queue
+
+
+class Command(BaseCommand):
+    help = "Run background job workers (jobs table, SELECT ... FOR UPDATE SKIP LOCKED)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=2, help="Worker threads in this process")
+        parser.add_argument("--poll", type=float, default=None, help="Idle poll interval in seconds")
+        parser.add_argument("--once", action="store_true", help="Drain due jobs and exit")
+        parser.add_argument("--stats", action="store_true", help="Print queue depth and exit")
+        parser.add_argument("--purge", action="store_true",
+                            help="Delete done / failed jobs past their retention and exit")
+
+    def handle(self, *args, **o):
+        if o["stats"]:
+            self.stdout.write(json.dumps(queue.metrics(), indent=2))
+            return
+
+        if o["purge"]:
+            self.stdout.write(json.dumps(queue.purge()))
+            return
+
+        if o["once"]:
+            n = 0
+            while queue.run_one():
+                n += 1
+            self.stdout.write(f"processed {n} job(s)")
+            return
+
+        stop = threading.Event()
+        signal.signal(signal.SIGINT, lambda *_: stop.set())
+        signal.signal(signal.SIGTERM, lambda *_: stop.set())
+
+        threads = [
+            threading.Thread(target=queue.work, args=(stop, o["poll"]), name=f"jobs-worker-{i}")
+            for i in range(max(1, o["threads"]))
+        ]
+        for t in threads:
+            t.start()
+        self.stdout.write(f"{len(threads)} worker(s) running; handlers: {', '.join(queue.registered_kinds())}")
+
+        while any(t.is_alive() for t in threads):
+            for t in threads:
+                t.join(timeout=0.5)
@@ -0,0 +1,54 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('job_id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('kind', models.CharField(max_length=64)),
+                ('payload', models.TextField()),
+                ('dedupe_key', models.CharField(blank=True, max_length=128, null=True, unique=True)),
+                ('status', models.CharField(max_length=10)),
+                ('attempts', models.IntegerField(default=0)),
+                ('run_after', models.DateTimeField()),
+                ('created_at', models.DateTimeField()),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('last_error', models.TextField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'jobs',
+                'managed': False,
+            },
+        ),
+        # Times are UTC (written with UTC_TIMESTAMP(6)).
+        # idx_jobs_pending serves the worker's claim query:
+        #   status='queued' AND run_after <= now ORDER BY job_id ... FOR UPDATE SKIP LOCKED
+        migrations.RunSQL(
+            sql="""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    job_id       BIGINT PRIMARY KEY AUTO_INCREMENT,
+                    kind         VARCHAR(64) NOT NULL,
+                    payload      TEXT NOT NULL,
+                    dedupe_key   VARCHAR(128) NULL UNIQUE,
+                    status       ENUM('queued','done','failed') NOT NULL DEFAULT 'queued',
+                    attempts     INT NOT NULL DEFAULT 0,
+                    run_after    DATETIME(6) NOT NULL,
+                    created_at   DATETIME(6) NOT NULL,
+                    started_at   DATETIME(6) NULL,
+                    finished_at  DATETIME(6) NULL,
+                    last_error   TEXT NULL,
+                    KEY idx_jobs_pending (status, run_after, job_id)
+                )
+            """,
+            reverse_sql="DROP TABLE IF EXISTS jobs",
+        ),
+    ]
@@ -0,0 +1,17 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0001_initial'),
+    ]
+
+    operations = [
+        # serves the retention purge (jobs/queue.py purge()):
+        #   status=? AND finished_at < cutoff LIMIT n
+        migrations.RunSQL(
+            sql="CREATE INDEX idx_jobs_finished ON jobs (status, finished_at)",
+            reverse_sql="DROP INDEX idx_jobs_finished ON jobs",
+        ),
+    ]
@@ -0,0 +1,22 @@
+from django.db import models
+
+
+class Job(models.Model):
+    job_id = models.BigAutoField(primary_key=True)
+    kind = models.CharField(max_length=64)
+    payload = models.TextField()
+    dedupe_key = models.CharField(max_length=128, null=True, blank=True, unique=True)
+    status = models.CharField(max_length=10)
+    attempts = models.IntegerField(default=0)
+    run_after = models.DateTimeField()
+    created_at = models.DateTimeField()
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(null=True, blank=True)
+
+    class Meta:
+        managed = False
+        db_table = 'jobs'
+
+    def __str__(self):
+        return f"Job {self.job_id} {self.kind} ({self.status})"
@@ -0,0 +1,317 @@
+"""
+Lightweight durable job queue for post-write side effects.
+
+Write views enqueue and return; workers apply the derived work.
+
+    # tournaments/jobs.py
+    @handler("match_result")
+    def apply_match_result(payload, cur):
+        ...
+
+    # in a view, inside the same transaction as the write it belongs to
+    enqueue("match_result", {"match_id": 7, ...}, dedupe_key="match_result:7")
+
+Guarantees:
+- durable: jobs live in the `jobs` table, committed with the write that created them
+- dedupe:  an optional dedupe_key is UNIQUE, so a second enqueue for the same key is ignored
+- exactly-once effects: a worker claims a job with
+      SELECT ... FOR UPDATE SKIP LOCKED
+  and runs the handler in that same transaction before marking the job done.
+  If the handler fails, or the worker dies, its writes roll back with the claim.
+  Handlers must therefore do all their work through the given cursor / default DB.
+
+Workers:
+- in-process threads (settings.JOBS_INPROCESS_WORKERS > 0), started lazily on
+  the first enqueue. They are woken on commit, so jobs run right after the request.
+- dedicated processes: python manage.py run_jobs
+
+Retention: finished jobs are deleted by purge(): done rows after
+JOBS_DONE_RETENTION_DAYS, failed rows after JOBS_FAILED_RETENTION_DAYS (kept
+longer for inspection). Workers run it every JOBS_PURGE_INTERVAL_SECONDS;
+`run_jobs --purge` runs it once. idx_jobs_finished (status, finished_at)
+makes each batch a range scan.
+
+Needs MySQL 8.0+ / MariaDB 10.6+ for SKIP LOCKED.
+"""
+import json
+import logging
+import threading
+import time
+import traceback
+from collections import deque
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+
+from badmintonbuddy.percentiles import percentile
+
+logger = logging.getLogger(__name__)
+
+_handlers = {}
+
+
+def handler(kind):
+    def decorator(fn):
+        _handlers[kind] = fn
+        return fn
+    return decorator
+
+
+def registered_kinds():
+    return sorted(_handlers)
+
+
+def enqueue(kind, payload, dedupe_key=None, delay_seconds=0):
+    """
+    Insert a job. Call inside the transaction of the write it belongs to.
+    Returns the job_id (or None if dedupe_key already existed).
+    """
+    if kind not in _handlers:
+        raise ValueError(f"No job handler registered for {kind!r}")
+
+    with connection.cursor() as cur:
+        cur.execute(
+            """
+            INSERT INTO jobs (kind, payload, dedupe_key, status, attempts, run_after, created_at)
+            VALUES (%s, %s, %s, 'queued', 0,
+                    UTC_TIMESTAMP(6) + INTERVAL %s SECOND, UTC_TIMESTAMP(6))
+            ON DUPLICATE KEY UPDATE job_id = job_id
+            """,
+            [kind, json.dumps(payload), dedupe_key, int(delay_seconds)]
+        )
+        job_id = cur.lastrowid or None
+
+    transaction.on_commit(_wake_workers)
+    return job_id
+
+
+# ------------------------------
+# metrics (per process)
+# ------------------------------
+
+class _JobStats:
+    def __init__(self, window=500):
+        self._lock = threading.Lock()
+        self._samples = {}   # kind -> deque[(queue_ms, run_ms)]
+        self._counts = {}    # kind -> {"done": n, "retried": n, "failed": n}
+        self.window = window
+
+    def record(self, kind, queue_ms, run_ms, outcome):
+        with self._lock:
+            c = self._counts.setdefault(kind, {"done": 0, "retried": 0, "failed": 0})
+            c[outcome] += 1
+            if outcome == "done":
+                self._samples.setdefault(kind, deque(maxlen=self.window)).append((queue_ms, run_ms))
+
+    def snapshot(self):
+        with self._lock:
+            samples = {k: list(v) for k, v in self._samples.items()}
+            counts = {k: dict(v) for k, v in self._counts.items()}
+
+        def pct(vals, p):
+            return round(percentile(sorted(vals), p), 2)
+
+        out = {}
+        for kind in sorted(set(samples) | set(counts)):
+            s = samples.get(kind, [])
+            q = [x[0] for x in s]
+            r = [x[1] for x in s]
+            out[kind] = {
+                **counts.get(kind, {}),
+                "queue_ms": {"p50": pct(q, 50), "p95": pct(q, 95), "max": round(max(q), 2) if q else 0.0},
+                "run_ms": {"p50": pct(r, 50), "p95": pct(r, 95), "max": round(max(r), 2) if r else 0.0},
+            }
+        return out
+
+
+STATS = _JobStats()
+
+
+def queue_depth():
+    """{"queued": n, "failed": n, "oldest_queued_seconds": s} straight from the jobs table."""
+    with connection.cursor() as cur:
+        cur.execute("SELECT status, COUNT(*) FROM jobs WHERE status IN ('queued', 'failed') GROUP BY status")
+        depth = {"queued": 0, "failed": 0}
+        depth.update({status: int(n) for status, n in cur.fetchall()})
+        cur.execute(
+            "SELECT TIMESTAMPDIFF(MICROSECOND, MIN(created_at), UTC_TIMESTAMP(6)) FROM jobs WHERE status='queued'"
+        )
+        age_us = cur.fetchone()[0]
+    depth["oldest_queued_seconds"] = round(age_us / 1e6, 3) if age_us is not None else 0.0
+    return depth
+
+
+def metrics():
+    return {"depth": queue_depth(), "kinds": STATS.snapshot()}
+
+
+# ------------------------------
+# retention
+# ------------------------------
+
+PURGE_BATCH = 1000
+
+
+def purge(done_days=None, failed_days=None, batch_size=PURGE_BATCH):
+    """Delete finished jobs past their retention, batch_size rows per transaction. Returns {"done": n, "failed": n}."""
+    retention = {
+        "done": done_days if done_days is not None else getattr(settings, "JOBS_DONE_RETENTION_DAYS", 7),
+        "failed": failed_days if failed_days is not None else getattr(settings, "JOBS_FAILED_RETENTION_DAYS", 30),
+    }
+    deleted = {}
+    for status, days in retention.items():
+        deleted[status] = 0
+        while True:
+            with transaction.atomic(), connection.cursor() as cur:
+                cur.execute(
+                    """
+                    DELETE FROM jobs
+                    WHERE status=%s AND finished_at < UTC_TIMESTAMP(6) - INTERVAL %s DAY
+                    LIMIT %s
+                    """,
+                    [status, int(days), batch_size]
+                )
+                n = cur.rowcount
+            deleted[status] += n
+            if n < batch_size:
+                break
+    if deleted["done"] or deleted["failed"]:
+        logger.info("jobs purge: %d done, %d failed deleted", deleted["done"], deleted["failed"])
+    return deleted
+
+
+_purged_at = 0.0
+_purge_lock = threading.Lock()
+
+
+def _maybe_purge():
+    """purge() at most every JOBS_PURGE_INTERVAL_SECONDS per process, from one worker thread."""
+    global _purged_at
+    interval = getattr(settings, "JOBS_PURGE_INTERVAL_SECONDS", 3600)
+    if interval <= 0 or time.monotonic() - _purged_at < interval:
+        return
+    if not _purge_lock.acquire(blocking=False):
+        return
+    try:
+        _purged_at = time.monotonic()
+        purge()
+    finally:
+        _purge_lock.release()
+
+
+# ------------------------------
+# worker
+# ------------------------------
+
+def run_one():
+    """
+    Claim and run one due job. Returns True if a job was processed (success or failure),
+    False if the queue had nothing due.
+    """
+    max_attempts = getattr(settings, "JOBS_MAX_ATTEMPTS", 5)
+
+    with transaction.atomic(), connection.cursor() as cur:
+        cur.execute(
+            """
+            SELECT job_id, kind, payload, attempts,
+                   TIMESTAMPDIFF(MICROSECOND, created_at, UTC_TIMESTAMP(6))
+            FROM jobs
+            WHERE status='queued' AND run_after <= UTC_TIMESTAMP(6)
+            ORDER BY job_id
+            LIMIT 1
+            FOR UPDATE SKIP LOCKED
+            """
+        )
+        row = cur.fetchone()
+        if not row:
+            return False
+
+        job_id, kind, payload, attempts, queued_us = row
+        fn = _handlers.get(kind)
+        started = time.perf_counter()
+
+        try:
+            if fn is None:
+                raise LookupError(f"No job handler registered for {kind!r}")
+            with transaction.atomic():  # savepoint: a failing handler rolls back only its own writes
+                fn(json.loads(payload), cur)
+        except Exception:
+            attempts += 1
+            final = attempts >= max_attempts
+            cur.execute(
+                """
+                UPDATE jobs
+                SET attempts=%s, last_error=%s, status=%s,
+                    run_after = UTC_TIMESTAMP(6) + INTERVAL %s SECOND,
+                    finished_at = IF(%s, UTC_TIMESTAMP(6), NULL)
+                WHERE job_id=%s
+                """,
+                [attempts, traceback.format_exc()[-4000:], "failed" if final else "queued",
+                 min(300, 2 ** attempts), final, job_id]
+            )
+            logger.exception("job %s (%s) failed, attempt %s/%s", job_id, kind, attempts, max_attempts)
+            STATS.record(kind, 0, 0, "failed" if final else "retried")
+            return True
+
+        run_ms = (time.perf_counter() - started) * 1000
+        cur.execute(
+            """
+            UPDATE jobs
+            SET status='done', attempts=attempts+1,
+                started_at = UTC_TIMESTAMP(6) - INTERVAL %s MICROSECOND,
+                finished_at = UTC_TIMESTAMP(6), last_error=NULL
+            WHERE job_id=%s
+            """,
+            [int(run_ms * 1000), job_id]
+        )
+
+    STATS.record(kind, (queued_us or 0) / 1000, run_ms, "done")
+    return True
+
+
+_wake = threading.Event()
+_stop = threading.Event()
+_threads = []
+_threads_lock = threading.Lock()
+
+
+def _wake_workers():
+    ensure_inprocess_workers()
+    _wake.set()
+
+
+def work(stop_event=None, poll_seconds=None):
+    """Worker loop: drain due jobs, then sleep until woken or the poll interval passes."""
+    stop_event = stop_event or _stop
+    poll_seconds = poll_seconds if poll_seconds is not None else getattr(settings, "JOBS_POLL_SECONDS", 1.0)
+
+    while not stop_event.is_set():
+        close_old_connections()
+        try:
+            busy = run_one()
+        except Exception:
+            logger.exception("job worker error")
+            busy = False
+
+        if not busy:
+            try:
+                _maybe_purge()
+            except Exception:
+                logger.exception("jobs purge error")
+            _wake.wait(poll_seconds)
+            _wake.clear()
+
+    connection.close()
+
+
+def ensure_inprocess_workers():
+    count = getattr(settings, "JOBS_INPROCESS_WORKERS", 0)
+    if count <= 0 or _threads:
+        return
+    with _threads_lock:
+        if _threads:
+            return
+        for i in range(count):
+            t = threading.Thread(target=work, name=f"jobs-worker-{i}", daemon=True)
+            t.start()
+            _threads.append(t)
@@ -0,0 +1,46 @@
+from django.test import SimpleTestCase
+
+from jobs import queue
+
+
+class EnqueueTests(SimpleTestCase):
+    def test_unknown_kind_is_rejected_before_touching_the_db(self):
+        with self.assertRaisesMessage(ValueError, "No job handler registered for 'no_such_kind'"):
+            queue.enqueue("no_such_kind", {})
+
+    def test_handler_registers_its_kind(self):
+        @queue.handler("test_kind")
+        def apply(payload, cur):
+            return payload
+
+        self.addCleanup(queue._handlers.pop, "test_kind")
+        self.assertIn("test_kind", queue.registered_kinds())
+
+
+class JobStatsTests(SimpleTestCase):
+    def test_counts_every_outcome_but_times_only_done_jobs(self):
+        stats = queue._JobStats()
+        stats.record("match_result", 10.0, 2.0, "done")
+        stats.record("match_result", 30.0, 4.0, "done")
+        stats.record("match_result", 20.0, 3.0, "done")
+        stats.record("match_result", 500.0, 900.0, "retried")
+        stats.record("match_result", 500.0, 900.0, "failed")
+
+        snap = stats.snapshot()["match_result"]
+        self.assertEqual((snap["done"], snap["retried"], snap["failed"]), (3, 1, 1))
+        self.assertEqual(snap["queue_ms"]["max"], 30.0)
+        self.assertEqual(snap["run_ms"]["max"], 4.0)
+        self.assertEqual(snap["queue_ms"]["p50"], 20.0)
+
+    def test_window_keeps_the_latest_samples(self):
+        stats = queue._JobStats(window=2)
+        for ms in (100.0, 1.0, 2.0):
+            stats.record("k", ms, ms, "done")
+        snap = stats.snapshot()["k"]
+        self.assertEqual(snap["done"], 3)
+        self.assertEqual(snap["queue_ms"]["max"], 2.0)
+
+    def test_kind_without_samples_reports_zeros(self):
+        stats = queue._JobStats()
+        stats.record("k", 1.0, 1.0, "failed")
+        self.assertEqual(stats.snapshot()["k"]["run_ms"], {"p50": 0.0, "p95": 0.0, "max": 0.0})
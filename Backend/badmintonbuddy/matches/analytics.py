@@ -0,0 +1,232 @@
+"""
+Court utilization analytics.
+
+GET /api/matches/utilization/ pulls (court_id, start_time, end_time) for a date
+range with ONE streamed query. It then builds a minute-resolution occupancy
+timeline per court with NumPy difference arrays:
+
+    diff[court, start_minute] += 1
+    diff[court, end_minute]   -= 1
+    busy = cumsum(diff) > 0
+
+The timeline is folded into a courts x weekday x hour matrix of occupied
+minutes. Cost is O(matches + courts * minutes), with no per-day Python loop,
+so a year of bookings takes a few tens of milliseconds.
+
+NumPy is optional for the rest of the project. Without it the endpoint answers
+503 (see available()).
+"""
+import time
+from datetime import datetime, timedelta
+
+try:
+    import numpy as np
+except ImportError:  # analytics only
+    np = None
+
+from badmintonbuddy.db_routing import current_read_alias, reader, streaming_cursor
+
+WEEKDAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+MINUTES_PER_DAY = 24 * 60
+MAX_RANGE_DAYS = 366
+FETCH_BATCH = 5000
+
+
+def available():
+    return np is not None
+
+
+def _naive(dt):
+    # USE_TZ stores UTC; the range bounds below are naive UTC too
+    return dt.replace(tzinfo=None) if dt.tzinfo is not None else dt
+
+
+def fetch_courts(court_id=None):
+    sql = "SELECT court_id, name FROM courts"
+    params = []
+    if court_id is not None:
+        sql += " WHERE court_id=%s"
+        params.append(court_id)
+    with reader().cursor() as cur:
+        cur.execute(sql + " ORDER BY court_id", params)
+        return cur.fetchall()
+
+
+def fetch_intervals(range_start, range_end, court_id=None):
+    """
+    Stream bookings overlapping [range_start, range_end) and return
+    (court_ids, start_minutes, end_minutes) as int arrays. Minutes are relative
+    to range_start and clipped to the range.
+    """
+    total = int((range_end - range_start).total_seconds() // 60)
+    sql = """
+        SELECT court_id, start_time, end_time
+        FROM matches
+        WHERE start_time < %s AND end_time > %s
+    """
+    params = [range_end, range_start]
+    if court_id is not None:
+        sql += " AND court_id=%s"
+        params.append(court_id)
+
+    with streaming_cursor(current_read_alias()) as cur:
+        cur.execute(sql, params)
+        return to_minutes(_batched(cur), range_start, total)
+
+
+def _batched(cur):
+    while True:
+        rows = cur.fetchmany(FETCH_BATCH)
+        if not rows:
+            return
+        yield from rows
+
+
+def to_minutes(rows, range_start, total):
+    """
+    Iterable of (court_id, start_time, end_time) -> (court_ids, start_minutes,
+    end_minutes), minutes relative to range_start and clipped to [0, total].
+    """
+    courts, starts, ends = [], [], []
+    for c, s, e in rows:
+        courts.append(c)
+        starts.append((_naive(s) - range_start) // timedelta(minutes=1))
+        ends.append((_naive(e) - range_start) // timedelta(minutes=1))
+
+    court_ids = np.asarray(courts, dtype=np.int64)
+    start_min = np.clip(np.asarray(starts, dtype=np.int64), 0, total)
+    end_min = np.clip(np.asarray(ends, dtype=np.int64), 0, total)
+    return court_ids, start_min, end_min
+
+
+def occupancy_matrix(court_idx, start_min, end_min, n_courts, days, first_weekday):
+    """
+    Occupied minutes per (court, weekday, hour).
+
+    court_idx:      row index (0..n_courts-1) of each booking
+    start/end_min:  minute offsets from midnight of day 0, end exclusive
+    first_weekday:  weekday() of day 0
+
+    Returns (matrix[n_courts, 7, 24], days_per_weekday[7]).
+    Overlapping bookings on one court count each minute once.
+    """
+    total = days * MINUTES_PER_DAY
+    width = total + 1
+
+    keep = end_min > start_min
+    court_idx, start_min, end_min = court_idx[keep], start_min[keep], end_min[keep]
+
+    # difference array, flattened so a single bincount does all the scatter-adds
+    diff = np.bincount(court_idx * width + start_min, minlength=n_courts * width)
+    diff -= np.bincount(court_idx * width + end_min, minlength=n_courts * width)
+    busy = np.cumsum(diff.reshape(n_courts, width)[:, :total], axis=1) > 0
+
+    per_hour = busy.reshape(n_courts, days, 24, 60).sum(axis=3, dtype=np.int32)
+
+    weekday = (first_weekday + np.arange(days)) % 7
+    matrix = np.zeros((n_courts, 7, 24), dtype=np.int64)
+    np.add.at(matrix, (slice(None), weekday), per_hour)
+    return matrix, np.bincount(weekday, minlength=7)
+
+
+def _hours(mask):
+    return [int(h) for h in np.flatnonzero(mask)]
+
+
+def idle_hours(all_courts, per_weekday, idle_threshold):
+    """
+    all_courts: occupancy[7, 24] across every court.
+    Returns ({weekday: [idle hours]}, {weekday: {"open", "close"} or None}) for the
+    weekdays present in the range; an hour is idle at or below idle_threshold.
+    """
+    idle = {}
+    suggested_hours = {}
+    for w, label in enumerate(WEEKDAYS):
+        if not per_weekday[w]:
+            continue
+        used = all_courts[w] > idle_threshold
+        idle[label] = _hours(~used)
+        active = _hours(used)
+        suggested_hours[label] = {"open": active[0], "close": active[-1] + 1} if active else None
+    return idle, suggested_hours
+
+
+def court_utilization(date_from, date_to, court_id=None, idle_threshold=0.05, top=10):
+    """
+    date_from / date_to: dates, both inclusive.
+    Occupancy values are fractions of the available minutes (0..1).
+    """
+    started = time.perf_counter()
+
+    range_start = datetime(date_from.year, date_from.month, date_from.day)
+    days = (date_to - date_from).days + 1
+    range_end = range_start + timedelta(days=days)
+
+    courts = fetch_courts(court_id)
+    known = np.asarray([c[0] for c in courts], dtype=np.int64)
+
+    court_ids, start_min, end_min = fetch_intervals(range_start, range_end, court_id)
+    fetched = time.perf_counter()
+
+    # bookings on courts missing from the courts table are ignored
+    if len(known):
+        court_idx = np.minimum(np.searchsorted(known, court_ids), len(known) - 1)
+        valid = known[court_idx] == court_ids
+    else:
+        court_idx = np.zeros(len(court_ids), dtype=np.int64)
+        valid = np.zeros(len(court_ids), dtype=bool)
+
+    matrix, per_weekday = occupancy_matrix(
+        court_idx[valid], start_min[valid], end_min[valid],
+        len(known), days, range_start.weekday()
+    )
+
+    available_minutes = per_weekday[None, :, None] * 60          # (1, 7, 1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        occupancy = np.where(available_minutes > 0, matrix / available_minutes, 0.0)
+        all_courts = np.where(
+            available_minutes[0] > 0, matrix.sum(axis=0) / (available_minutes[0] * max(len(known), 1)), 0.0
+        )
+
+    court_rows = []
+    for i, (cid, name) in enumerate(courts):
+        w, h = np.unravel_index(int(np.argmax(matrix[i])), (7, 24))
+        court_rows.append({
+            "court_id": cid,
+            "name": name,
+            "utilization": round(float(matrix[i].sum()) / (days * MINUTES_PER_DAY), 4),
+            "busiest": {"weekday": WEEKDAYS[w], "hour": int(h), "occupancy": round(float(occupancy[i, w, h]), 4)},
+            "matrix": np.round(occupancy[i], 4).tolist(),
+        })
+
+    flat = occupancy.reshape(-1)
+    peaks = []
+    for k in np.argsort(flat, kind="stable")[::-1][:top]:
+        if flat[k] <= 0:
+            break
+        i, w, h = np.unravel_index(int(k), occupancy.shape)
+        peaks.append({
+            "court_id": courts[i][0], "weekday": WEEKDAYS[w], "hour": int(h),
+            "occupancy": round(float(flat[k]), 4),
+        })
+
+    idle, suggested_hours = idle_hours(all_courts, per_weekday, idle_threshold)
+
+    return {
+        "from": date_from.isoformat(),
+        "to": date_to.isoformat(),
+        "days": days,
+        "weekdays": list(WEEKDAYS),
+        "days_per_weekday": dict(zip(WEEKDAYS, per_weekday.tolist())),
+        "bookings": int(valid.sum()),
+        "idle_threshold": idle_threshold,
+        "courts": court_rows,
+        "all_courts": np.round(all_courts, 4).tolist(),
+        "peaks": peaks,
+        "idle_hours": idle,
+        "suggested_hours": suggested_hours,
+        "timing_ms": {
+            "fetch": round((fetched - started) * 1000, 2),
+            "compute": round((time.perf_counter() - fetched) * 1000, 2),
+        },
+    }
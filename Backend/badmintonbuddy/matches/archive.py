@@ -0,0 +1,189 @@
+"""
+Match archive.
+
+Completed friendlies older than settings.MATCH_ARCHIVE_HORIZON_DAYS move from
+`matches` into `matches_archive`. The archive is RANGE COLUMNS-partitioned by
+month on start_time (pYYYYMM).
+
+- Hot paths read only `matches`, which stays small: booking and conflict
+  checks, open slots, by-day, join/cancel, tournaments.
+- Stats read player_matches_sql(), a UNION ALL of both tables. History and
+  export run the same union from db/sql/match_history.sql.
+- `python manage.py archive_matches` moves rows in batches, one short
+  transaction per batch (INSERT ... SELECT, then DELETE). It first adds any
+  monthly partitions the batch needs.
+
+Only friendlies (tournament_id IS NULL) are archived. Tournament matches stay
+live, because brackets, tournament leaderboards and complete_tournament read
+them by tournament_id.
+"""
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+
+from django.conf import settings
+from django.db import connection, transaction
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = "match_id, court_id, player1_id, player2_id, start_time, end_time, tournament_id, round, winner_id, score"
+
+# everything before this lands in p_before (see migration 0004)
+FIRST_PARTITION_MONTH = datetime(2020, 1, 1)
+
+ELIGIBLE = "tournament_id IS NULL AND start_time < %s AND end_time < %s"
+
+
+def player_matches_sql(user_id, alias="m"):
+    """
+    FROM-clause subquery with one player's matches from both tables.
+    Returns (sql, params). Live rows come through the player_matches index
+    (matches/player_matches.py). The archive is cold and keeps one index per
+    player column.
+    """
+    live_columns = ", ".join(f"lm.{c.strip()}" for c in COLUMNS.split(","))
+    sql = f"""(
+        SELECT {live_columns}
+        FROM player_matches pm
+        JOIN matches lm ON lm.match_id = pm.match_id
+        WHERE pm.user_id=%s
+        UNION ALL
+        SELECT {COLUMNS} FROM matches_archive WHERE player1_id=%s OR player2_id=%s
+    ) {alias}"""
+    return sql, [user_id] * 3
+
+
+def cutoff(horizon_days=None):
+    days = horizon_days if horizon_days is not None else getattr(settings, "MATCH_ARCHIVE_HORIZON_DAYS", 180)
+    # naive UTC, same as the stored DATETIME values
+    return datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=days)
+
+
+def _month(dt):
+    return datetime(dt.year, dt.month, 1)
+
+
+def _next_month(dt):
+    return datetime(dt.year + dt.month // 12, dt.month % 12 + 1, 1)
+
+
+def _partition_name(month):
+    return f"p{month:%Y%m}"
+
+
+def existing_partitions(cur):
+    cur.execute("""
+        SELECT PARTITION_NAME
+        FROM information_schema.PARTITIONS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'matches_archive'
+    """)
+    return {r[0] for r in cur.fetchall() if r[0]}
+
+
+def ensure_partitions(cur, first, last):
+    """
+    Split p_future so each month from `first` to `last` has its own partition.
+    New partitions are only carved after the newest monthly partition, which
+    keeps the RANGE boundaries ascending. A row from a month that got no
+    partition still lands in the next one up; pruning is just coarser.
+    Returns the names of the partitions added.
+    """
+    existing = existing_partitions(cur)
+    monthly = sorted(p for p in existing if p[1:].isdigit())
+
+    month = max(_month(first), FIRST_PARTITION_MONTH)
+    if monthly:
+        newest = datetime.strptime(monthly[-1][1:], "%Y%m")
+        month = max(month, _next_month(newest))
+
+    months = []
+    while month <= _month(last):
+        months.append(month)
+        month = _next_month(month)
+    if not months:
+        return []
+
+    parts = ", ".join(
+        f"PARTITION {_partition_name(m)} VALUES LESS THAN ('{_next_month(m):%Y-%m-%d}')" for m in months
+    )
+    cur.execute(
+        f"ALTER TABLE matches_archive REORGANIZE PARTITION p_future INTO "
+        f"({parts}, PARTITION p_future VALUES LESS THAN (MAXVALUE))"
+    )
+    return [_partition_name(m) for m in months]
+
+
+def archive_batch(cutoff_dt, batch_size):
+    """Move up to batch_size eligible matches (oldest first). Returns the number moved."""
+    with transaction.atomic(), connection.cursor() as cur:
+        cur.execute(
+            f"""
+            SELECT match_id FROM matches
+            WHERE {ELIGIBLE}
+            ORDER BY start_time, match_id
+            LIMIT %s
+            FOR UPDATE
+            """,
+            [cutoff_dt, cutoff_dt, batch_size]
+        )
+        ids = [r[0] for r in cur.fetchall()]
+        if not ids:
+            return 0
+
+        in_ids = ",".join(["%s"] * len(ids))
+        cur.execute(
+            f"""
+            INSERT INTO matches_archive ({COLUMNS}, archived_at)
+            SELECT {COLUMNS}, UTC_TIMESTAMP() FROM matches WHERE match_id IN ({in_ids})
+            """,
+            ids
+        )
+        # player_matches rows go with the FK's ON DELETE CASCADE
+        cur.execute(f"DELETE FROM matches WHERE match_id IN ({in_ids})", ids)
+    return len(ids)
+
+
+def run(horizon_days=None, batch_size=None, max_batches=None, pause_seconds=0.0, dry_run=False):
+    """
+    Archive everything eligible (or up to max_batches batches). Returns a report dict.
+    pause_seconds between batches keeps replication / lock pressure low on big backlogs.
+    """
+    started = time.perf_counter()
+    cutoff_dt = cutoff(horizon_days)
+    batch_size = batch_size or getattr(settings, "MATCH_ARCHIVE_BATCH_SIZE", 1000)
+
+    with connection.cursor() as cur:
+        cur.execute(f"SELECT MIN(start_time), MAX(start_time), COUNT(*) FROM matches WHERE {ELIGIBLE}",
+                    [cutoff_dt, cutoff_dt])
+        first, last, eligible = cur.fetchone()
+
+    report = {
+        "cutoff": cutoff_dt.isoformat(sep=" "),
+        "eligible": int(eligible or 0),
+        "moved": 0,
+        "batches": 0,
+        "partitions_added": [],
+        "dry_run": bool(dry_run),
+    }
+    if not eligible or dry_run:
+        report["seconds"] = round(time.perf_counter() - started, 3)
+        return report
+
+    with connection.cursor() as cur:
+        report["partitions_added"] = ensure_partitions(cur, first, last)
+
+    while max_batches is None or report["batches"] < max_batches:
+        moved = archive_batch(cutoff_dt, batch_size)
+        if not moved:
+            break
+        report["moved"] += moved
+        report["batches"] += 1
+        if pause_seconds:
+            time.sleep(pause_seconds)
+
+    report["seconds"] = round(time.perf_counter() - started, 3)
+    logger.info(
+        "match archive: moved %d of %d eligible (cutoff %s) in %d batches, %.2fs",
+        report["moved"], report["eligible"], report["cutoff"], report["batches"], report["seconds"]
+    )
+    return report
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from matches import archive
+
+
+class Command(BaseCommand):
+    help = "Move completed friendlies older than the horizon from matches into the partitioned matches_archive."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--horizon-days", type=int, default=None,
+                            help="Archive matches that ended more than N days ago (default: MATCH_ARCHIVE_HORIZON_DAYS)")
+        parser.add_argument("--batch-size", type=int, default=None,
+                            help="Rows per transaction (default: MATCH_ARCHIVE_BATCH_SIZE)")
+        parser.add_argument("--max-batches", type=int, default=None, help="Stop after N batches")
+        parser.add_argument("--pause", type=float, default=0.0, help="Seconds to sleep between batches")
+        parser.add_argument("--dry-run", action="store_true", help="Only count eligible matches")
+
+    def handle(self, *args, **o):
+        report = archive.run(
+            horizon_days=o["horizon_days"],
+            batch_size=o["batch_size"],
+            max_batches=o["max_batches"],
+            pause_seconds=o["pause"],
+            dry_run=o["dry_run"],
+        )
+
+        if report["partitions_added"]:
+            self.stdout.write(f"added partitions: {', '.join(report['partitions_added'])}")
+        verb = "would move" if report["dry_run"] else "moved"
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {report['eligible'] if report['dry_run'] else report['moved']} of {report['eligible']} "
+            f"eligible matches (ended before {report['cutoff']}) in {report['batches']} batch(es), {report['seconds']}s"
+        ))
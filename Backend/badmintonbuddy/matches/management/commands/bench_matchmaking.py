@@ -0,0 +1,76 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from matches import matchmaking
+from matches.matchmaking import Entry
+
+
+def _queue(players, days, seed):
+    """Synthetic queue: skill ~N(5, 2) in 0..10, 2-4 hour windows starting 07:00-20:00, 60/90 minute matches."""
+    rng = random.Random(seed)
+    entries = []
+    for i in range(players):
+        start = rng.randrange(days) * 24 * 60 + rng.randrange(7, 20) * 60
+        entries.append(Entry(
+            queue_id=i + 1,
+            user_id=i + 1,
+            skill=min(10, max(0, int(rng.gauss(5, 2)))),
+            tolerance=rng.choice([0, 1, 1, 2]),
+            start=start,
+            end=start + rng.choice([120, 180, 240]),
+            duration=rng.choice([60, 60, 90]),
+        ))
+    return entries
+
+
+def _bookings(courts, days, per_court_day, seed):
+    """Existing bookings: per_court_day random hour-long slots between 08:00 and 22:00."""
+    rng = random.Random(seed + 1)
+    busy = {}
+    for c in range(1, courts + 1):
+        intervals = set()
+        for day in range(days):
+            for hour in rng.sample(range(8, 22), min(per_court_day, 14)):
+                s = day * 24 * 60 + hour * 60
+                intervals.add((s, s + 60))
+        busy[c] = sorted(intervals)
+    return busy
+
+
+class Command(BaseCommand):
+    help = "Benchmark the batch matcher (pairing + court assignment) on a synthetic queue, without the DB."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--players", type=int, default=10000)
+        parser.add_argument("--courts", type=int, default=20)
+        parser.add_argument("--days", type=int, default=28)
+        parser.add_argument("--per-court-day", type=int, default=4, help="Existing bookings per court per day")
+        parser.add_argument("--neighbors", type=int, default=None)
+        parser.add_argument("--seed", type=int, default=7)
+
+    def handle(self, *args, **o):
+        entries = _queue(o["players"], o["days"], o["seed"])
+        court_busy = _bookings(o["courts"], o["days"], o["per_court_day"], o["seed"])
+        booked_before = sum(len(v) for v in court_busy.values())
+
+        t0 = time.perf_counter()
+        pairs = matchmaking.pair_players(entries, neighbors=o["neighbors"])
+        t1 = time.perf_counter()
+        bookings, unscheduled = matchmaking.schedule(pairs, court_busy, {})
+        t2 = time.perf_counter()
+
+        gaps = [abs(a.skill - b.skill) for a, b in pairs]
+        self.stdout.write(
+            f"{len(entries)} queued players, {o['courts']} courts x {o['days']} days, "
+            f"{booked_before} court-hours already booked"
+        )
+        self.stdout.write(
+            f"pairing:    {(t1 - t0) * 1000:8.1f} ms  {len(pairs)} pairs "
+            f"({2 * len(pairs) / len(entries):.1%} of players), mean skill gap {sum(gaps) / max(1, len(gaps)):.2f}"
+        )
+        self.stdout.write(
+            f"scheduling: {(t2 - t1) * 1000:8.1f} ms  {len(bookings)} booked, {len(unscheduled)} pairs without a court"
+        )
+        self.stdout.write(f"total:      {(t2 - t0) * 1000:8.1f} ms")
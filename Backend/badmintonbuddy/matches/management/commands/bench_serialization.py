@@ -0,0 +1,95 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+from django.core.management.base import BaseCommand
+from django.http import JsonResponse
+
+from badmintonbuddy import serializers
+from matches.views import DAY_ROW
+
+
+def _rows(n):
+    base = datetime(2026, 1, 10, 8, 0, tzinfo=timezone.utc)
+    rows = []
+    for i in range(n):
+        st = base + timedelta(hours=i)
+        open_slot = i % 7 == 0
+        tournament = 3 if i % 5 == 0 else None
+        rows.append((
+            i + 1, 1 + i % 8, st, st + timedelta(hours=1),
+            10 + i % 300, f"Player {10 + i % 300}",
+            None if open_slot else 20 + i % 300, None if open_slot else f"Player {20 + i % 300}",
+            tournament, "Club Open" if tournament else None, 1 if tournament else None,
+            None, None,
+        ))
+    return rows
+
+
+def _handbuilt(rows):
+    # the pre-serializer shape of matches_by_day: positional dicts + str() + JsonResponse
+    return JsonResponse({
+        "items": [
+            {
+                "match_id": r[0],
+                "court_id": r[1],
+                "start_time": str(r[2]),
+                "end_time": str(r[3]),
+                "player1_id": r[4],
+                "player1_name": r[5],
+                "player2_id": r[6],
+                "player2_name": r[7],
+                "tournament_id": r[8],
+                "tournament_name": r[9],
+                "round": r[10],
+                "winner_id": r[11],
+                "score": r[12],
+                "type": "tournament" if r[8] is not None else "friendly",
+                "open_slot": True if r[6] is None else False,
+            }
+            for r in rows
+        ]
+    })
+
+
+class Command(BaseCommand):
+    help = "Micro-benchmark per-row cost of list serialization: hand-built dicts vs RowMapper + encoder backends."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1000)
+        parser.add_argument("--repeat", type=int, default=200)
+
+    def _time(self, fn, rows, repeat):
+        fn(rows)  # warm-up
+        best = float("inf")
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            fn(rows)
+            best = min(best, time.perf_counter() - t0)
+        return best
+
+    def handle(self, *args, **o):
+        rows = _rows(o["rows"])
+        n, repeat = o["rows"], o["repeat"]
+
+        cases = [("handbuilt + JsonResponse", _handbuilt)]
+        backends = [("stdlib", serializers.stdlib_dumps)]
+        try:
+            import orjson  # noqa: F401
+            backends.append(("orjson", serializers.orjson_dumps))
+        except ImportError:
+            self.stdout.write("orjson not installed; only the stdlib backend is measured")
+
+        for label, dumps in backends:
+            def run(rs, dumps=dumps):
+                return dumps({"items": DAY_ROW.map(rs)})
+            cases.append((f"RowMapper + {label}", run))
+
+        self.stdout.write(f"{n} rows, best of {repeat}\n")
+        self.stdout.write(f"{'case':<28}{'ms/response':>14}{'us/row':>10}{'speedup':>10}")
+        baseline = None
+        for label, fn in cases:
+            secs = self._time(fn, rows, repeat)
+            baseline = baseline or secs
+            self.stdout.write(
+                f"{label:<28}{secs * 1000:>14.3f}{secs / n * 1e6:>10.2f}{baseline / secs:>9.2f}x"
+            )
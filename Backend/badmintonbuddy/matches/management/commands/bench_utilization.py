@@ -0,0 +1,48 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from matches import analytics
+
+
+def _intervals(np, courts, days, per_court_day, seed):
+    """Synthetic bookings: 60/90/120 minute slots between 07:00 and 22:00."""
+    rng = np.random.default_rng(seed)
+    n = courts * days * per_court_day
+    court_idx = np.repeat(np.arange(courts), days * per_court_day)
+    day = np.tile(np.repeat(np.arange(days), per_court_day), courts)
+    start = day * analytics.MINUTES_PER_DAY + rng.integers(7 * 60, 21 * 60, n)
+    end = start + rng.choice([60, 90, 120], n)
+    return court_idx, start, np.minimum(end, days * analytics.MINUTES_PER_DAY)
+
+
+class Command(BaseCommand):
+    help = "Benchmark the court utilization heatmap (difference arrays) on synthetic bookings, without the DB."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--courts", type=int, default=12)
+        parser.add_argument("--days", type=int, default=365)
+        parser.add_argument("--per-court-day", type=int, default=8)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=7)
+
+    def handle(self, *args, **o):
+        if not analytics.available():
+            raise CommandError("numpy is not installed")
+        np = analytics.np
+
+        courts, days = o["courts"], o["days"]
+        court_idx, start, end = _intervals(np, courts, days, o["per_court_day"], o["seed"])
+
+        best = float("inf")
+        for _ in range(max(1, o["repeat"])):
+            t0 = time.perf_counter()
+            matrix, _ = analytics.occupancy_matrix(court_idx, start, end, courts, days, first_weekday=0)
+            best = min(best, time.perf_counter() - t0)
+
+        self.stdout.write(
+            f"{len(start)} bookings, {courts} courts x {days} days "
+            f"({courts * days * analytics.MINUTES_PER_DAY:,} court-minutes)"
+        )
+        self.stdout.write(f"occupancy matrix: best of {o['repeat']} = {best * 1000:.1f} ms")
+        self.stdout.write(f"mean occupancy: {matrix.sum() / (courts * days * analytics.MINUTES_PER_DAY):.3f}")
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from matches import player_matches
+
+
+class Command(BaseCommand):
+    help = "Compare the player_matches side table with matches; --repair re-syncs the affected matches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repair", action="store_true", help="Re-derive rows for every inconsistent match")
+        parser.add_argument("--sample", type=int, default=20, help="How many example problems to print")
+
+    def handle(self, *args, **o):
+        report = player_matches.check(repair=o["repair"], sample=o["sample"])
+
+        for ex in report["examples"]:
+            self.stdout.write(f"  match {ex['match_id']} user {ex['user_id']}: {ex['problem']}")
+
+        summary = f"missing={report['missing']} stale={report['stale']} extra={report['extra']}"
+        if not (report["missing"] or report["stale"] or report["extra"]):
+            self.stdout.write(self.style.SUCCESS(f"player_matches consistent ({summary})"))
+        elif report["repaired"]:
+            self.stdout.write(self.style.SUCCESS(f"{summary}; re-synced {report['repaired']} match(es)"))
+        else:
+            self.stdout.write(self.style.WARNING(f"{summary}; run with --repair to fix"))
@@ -0,0 +1,224 @@
+import random
+from datetime import datetime, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from matches import player_matches, rollups
+
+
+def _insert_rows(cur, table, columns, rows, chunk_size):
+    """Chunked multi-row INSERT."""
+    cols = ", ".join(columns)
+    one = "(" + ",".join(["%s"] * len(columns)) + ")"
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        params = [v for row in chunk for v in row]
+        cur.execute(f"INSERT INTO {table} ({cols}) VALUES {','.join([one] * len(chunk))}", params)
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a synthetic club dataset: users with a skill distribution, courts, "
+        "friendlies + open slots over several months, and tournaments with results."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=500)
+        parser.add_argument("--courts", type=int, default=8)
+        parser.add_argument("--matches", type=int, default=5000, help="Friendly matches / open slots")
+        parser.add_argument("--months", type=int, default=6, help="History span before today")
+        parser.add_argument("--future-days", type=int, default=14, help="Bookings ahead of today")
+        parser.add_argument("--open-ratio", type=float, default=0.15, help="Share of future bookings left open")
+        parser.add_argument("--tournaments", type=int, default=4)
+        parser.add_argument("--tournament-size", type=int, default=16)
+        parser.add_argument("--password", default="password123", help="Password for every generated account")
+        parser.add_argument("--email-domain", default="club.test")
+        parser.add_argument("--seed", type=int, default=None)
+        parser.add_argument("--chunk-size", type=int, default=1000)
+
+    def handle(self, *args, **o):
+        rng = random.Random(o["seed"])
+        chunk = o["chunk_size"]
+        domain = o["email_domain"]
+        pw_hash = make_password(o["password"])  # one hash shared by all generated users
+
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        first_day = today - timedelta(days=30 * o["months"])
+        days = (today - first_day).days + o["future_days"]
+        hours = list(range(8, 22))  # 1h slots 08:00-22:00
+
+        with transaction.atomic(), connection.cursor() as cur:
+            # --- users ---
+            cur.execute("SELECT COALESCE(MAX(user_id), 0) FROM users")
+            base = cur.fetchone()[0]
+
+            users = []
+            for i in range(1, o["users"] + 1):
+                n = base + i
+                skill = max(1, min(10, int(round(rng.gauss(5, 2)))))
+                users.append((f"Player {n}", f"player{n}@{domain}", pw_hash, "player", skill))
+            _insert_rows(cur, "users", ["name", "email", "password", "role", "skill_rating"], users, chunk)
+
+            cur.execute("SELECT user_id, skill_rating FROM users WHERE email LIKE %s AND role='player'", [f"%@{domain}"])
+            players = cur.fetchall()
+            cur.execute("SELECT user_id FROM users WHERE email=%s", [f"admin@{domain}"])
+            row = cur.fetchone()
+            if row:
+                admin_id = row[0]
+            else:
+                cur.execute(
+                    "INSERT INTO users (name, email, password, role) VALUES ('Club Admin', %s, %s, 'admin')",
+                    [f"admin@{domain}", pw_hash]
+                )
+                admin_id = cur.lastrowid
+
+            by_skill = {}
+            for uid, skill in players:
+                by_skill.setdefault(skill, []).append(uid)
+
+            # --- courts ---
+            cur.execute("SELECT COUNT(*) FROM courts")
+            existing_courts = cur.fetchone()[0]
+            _insert_rows(
+                cur, "courts", ["name"],
+                [(f"Court {existing_courts + i}",) for i in range(1, o["courts"] + 1)], chunk
+            )
+            cur.execute("SELECT court_id FROM courts")
+            courts = [r[0] for r in cur.fetchall()]
+
+            # existing bookings in the window must not be double-booked
+            cur.execute(
+                "SELECT court_id, player1_id, player2_id, start_time FROM matches WHERE start_time >= %s AND start_time < %s",
+                [first_day, first_day + timedelta(days=days)]
+            )
+            court_busy = set()
+            player_busy = set()
+            for c, p1, p2, st in cur.fetchall():
+                st = st.replace(tzinfo=None) if st else st
+                court_busy.add((c, st))
+                player_busy.add((p1, st))
+                if p2:
+                    player_busy.add((p2, st))
+
+            def free_slot():
+                for _ in range(50):
+                    st = first_day + timedelta(days=rng.randrange(days), hours=rng.choice(hours))
+                    c = rng.choice(courts)
+                    if (c, st) not in court_busy:
+                        return c, st
+                return None
+
+            def pick_pair(st):
+                for _ in range(20):
+                    p1, s1 = rng.choice(players)
+                    if (p1, st) in player_busy:
+                        continue
+                    # opponents cluster around the same skill
+                    skill = max(1, min(10, s1 + rng.choice((-2, -1, -1, 0, 0, 0, 1, 1, 2))))
+                    pool = by_skill.get(skill) or by_skill.get(s1)
+                    p2 = rng.choice(pool)
+                    if p2 != p1 and (p2, st) not in player_busy:
+                        return p1, p2
+                return None, None
+
+            def score_for():
+                a = 21
+                b = rng.randint(8, 19)
+                return f"{a}-{b}, {a}-{rng.randint(8, 19)}"
+
+            results = {}  # user_id -> [wins, total]
+
+            def record(p1, p2, winner):
+                for p in (p1, p2):
+                    results.setdefault(p, [0, 0])[1] += 1
+                results[winner][0] += 1
+
+            # --- friendlies + open slots ---
+            rows = []
+            for _ in range(o["matches"]):
+                slot = free_slot()
+                if not slot:
+                    break
+                c, st = slot
+                p1, p2 = pick_pair(st)
+                if p1 is None:
+                    continue
+
+                winner = score = None
+                if st >= today and rng.random() < o["open_ratio"]:
+                    p2 = None
+                elif st < today and rng.random() < 0.6:
+                    winner = rng.choice((p1, p2))
+                    score = score_for()
+                    record(p1, p2, winner)
+
+                court_busy.add((c, st))
+                player_busy.add((p1, st))
+                if p2:
+                    player_busy.add((p2, st))
+                rows.append((c, p1, p2, st, st + timedelta(hours=1), None, None, winner, score))
+
+            # --- tournaments (oldest completed, then ongoing, newest upcoming) ---
+            size = max(2, o["tournament_size"])
+            n_t = o["tournaments"]
+            for t in range(n_t):
+                status = "upcoming" if t == n_t - 1 else "ongoing" if t == n_t - 2 else "completed"
+                entrants = [p[0] for p in rng.sample(players, min(size, len(players)))]
+                if status == "upcoming":
+                    entrants = entrants[: max(1, size // 2)]
+
+                cur.execute(
+                    "INSERT INTO tournaments (name, description, created_by, max_players, seats_left, status) "
+                    "VALUES (%s, %s, %s, %s, %s, %s)",
+                    [f"Club Open #{t + 1}", "Generated tournament", admin_id, size, size - len(entrants), status]
+                )
+                tid = cur.lastrowid
+                _insert_rows(
+                    cur, "tournament_participants", ["tournament_id", "user_id", "seed"],
+                    [(tid, uid, seed) for seed, uid in enumerate(entrants, start=1)], chunk
+                )
+                if status == "upcoming":
+                    continue
+
+                # round 1 on one court, sequential slots
+                day = first_day + timedelta(days=int(days * (t + 1) / (n_t + 1)))
+                court = courts[t % len(courts)]
+                st = day.replace(hour=9)
+                for i in range(0, len(entrants) - 1, 2):
+                    while (court, st) in court_busy:
+                        st += timedelta(hours=1)
+                    p1, p2 = entrants[i], entrants[i + 1]
+                    winner = score = None
+                    if status == "completed" or rng.random() < 0.5:
+                        winner = rng.choice((p1, p2))
+                        score = score_for()
+                        record(p1, p2, winner)
+                    court_busy.add((court, st))
+                    rows.append((court, p1, p2, st, st + timedelta(hours=1), tid, 1, winner, score))
+                    st += timedelta(hours=1)
+
+            cur.execute("SELECT COALESCE(MAX(match_id), 0) FROM matches")
+            last_match_id = cur.fetchone()[0]
+            _insert_rows(
+                cur, "matches",
+                ["court_id", "player1_id", "player2_id", "start_time", "end_time",
+                 "tournament_id", "round", "winner_id", "score"],
+                rows, chunk
+            )
+            player_matches.backfill(cur, last_match_id)
+
+            # keep users.wins / total_matches consistent with the generated results
+            cur.executemany(
+                "UPDATE users SET wins = wins + %s, total_matches = total_matches + %s WHERE user_id=%s",
+                [(w, n, uid) for uid, (w, n) in results.items()]
+            )
+
+        # daily rollups for the generated days, in chunked transactions
+        rollups.backfill(first_day.date(), (first_day + timedelta(days=days)).date())
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated {len(users)} users, {o['courts']} courts, {len(rows)} matches, "
+            f"{n_t} tournaments. Login: player<N>@{domain} / admin@{domain}, password '{o['password']}'"
+        ))
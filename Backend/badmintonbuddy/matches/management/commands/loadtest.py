@@ -0,0 +1,200 @@
+import http.cookiejar
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils.dateparse import parse_datetime
+
+from badmintonbuddy.percentiles import percentile
+
+
+# endpoint name -> weight in the request mix
+DEFAULT_MIX = {
+    "partners": 3,
+    "book": 2,
+    "history": 3,
+    "by_day": 4,
+    "open": 2,
+    "tournaments": 1,
+    "leaderboard": 2,
+    "tournament_leaderboard": 2,
+    "stats": 1,
+}
+
+
+class Session:
+    """One simulated logged-in client with its own cookie jar."""
+
+    def __init__(self, base_url, timeout):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar())
+        )
+
+    def call(self, method, path, payload=None):
+        data = json.dumps(payload).encode("utf-8") if payload is not None else None
+        req = urllib.request.Request(self.base_url + path, data=data, method=method)
+        if data is not None:
+            req.add_header("Content-Type", "application/json")
+        try:
+            with self.opener.open(req, timeout=self.timeout) as res:
+                res.read()
+                return res.status
+        except urllib.error.HTTPError as e:
+            e.read()
+            return e.code
+        except (urllib.error.URLError, OSError):
+            return 0
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive the real API routes with concurrent simulated sessions and report "
+        "per-endpoint throughput and latency percentiles. Run against a live server "
+        "seeded with `generate_club_data`."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+        parser.add_argument("--sessions", type=int, default=20, help="Concurrent simulated users")
+        parser.add_argument("--duration", type=float, default=30.0, help="Seconds to run")
+        parser.add_argument("--password", default="password123")
+        parser.add_argument("--email-domain", default="club.test")
+        parser.add_argument("--timeout", type=float, default=10.0)
+        parser.add_argument("--think-ms", type=int, default=0, help="Pause between requests per session")
+        parser.add_argument("--only", default="", help="Comma-separated endpoint names to restrict the mix")
+        parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+        parser.add_argument("--seed", type=int, default=None)
+
+    def handle(self, *args, **o):
+        rng = random.Random(o["seed"])
+
+        with connection.cursor() as cur:
+            cur.execute("SELECT email FROM users WHERE email LIKE %s AND role='player'", [f"%@{o['email_domain']}"])
+            emails = [r[0] for r in cur.fetchall()]
+            cur.execute("SELECT court_id FROM courts")
+            courts = [r[0] for r in cur.fetchall()]
+            cur.execute("SELECT tournament_id FROM tournaments")
+            tournaments = [r[0] for r in cur.fetchall()]
+            cur.execute("SELECT MIN(start_time), MAX(start_time) FROM matches")
+            lo, hi = cur.fetchone()
+
+        if not emails or not courts:
+            raise CommandError("No generated users/courts found. Run generate_club_data first.")
+
+        mix = dict(DEFAULT_MIX)
+        if o["only"]:
+            wanted = {x.strip() for x in o["only"].split(",") if x.strip()}
+            mix = {k: v for k, v in mix.items() if k in wanted}
+            if not mix:
+                raise CommandError(f"--only matched nothing; choose from {', '.join(DEFAULT_MIX)}")
+        if not tournaments:
+            mix.pop("tournament_leaderboard", None)
+
+        names = list(mix)
+        weights = [mix[n] for n in names]
+        lo = (parse_datetime(str(lo)) if lo else datetime.now()).replace(tzinfo=None)
+        hi = (parse_datetime(str(hi)) if hi else datetime.now()).replace(tzinfo=None)
+        span_days = max(1, (hi - lo).days)
+
+        def pick_request(r):
+            name = r.choices(names, weights)[0]
+            start = (lo + timedelta(days=r.randrange(span_days))).replace(hour=r.randint(8, 21), minute=0, second=0, microsecond=0)
+            end = start + timedelta(hours=1)
+            s, e = start.strftime("%Y-%m-%dT%H:%M:%S"), end.strftime("%Y-%m-%dT%H:%M:%S")
+
+            if name == "partners":
+                return name, "GET", f"/api/matches/partners/?start_time={s}&end_time={e}", None
+            if name == "book":
+                future = datetime.now() + timedelta(days=r.randint(1, 30), hours=r.randint(0, 12))
+                fs = future.replace(minute=0, second=0, microsecond=0)
+                return name, "POST", "/api/matches/book/", {
+                    "court_id": r.choice(courts),
+                    "start_time": fs.strftime("%Y-%m-%dT%H:%M:%S"),
+                    "end_time": (fs + timedelta(hours=1)).strftime("%Y-%m-%dT%H:%M:%S"),
+                }
+            if name == "history":
+                return name, "GET", "/api/matches/history/", None
+            if name == "by_day":
+                court = r.choice([0] + courts)
+                q = f"date={start.strftime('%Y-%m-%d')}" + (f"&court_id={court}" if court else "")
+                return name, "GET", f"/api/matches/by-day/?{q}", None
+            if name == "open":
+                return name, "GET", f"/api/matches/open/?start_time={s}&end_time={e}", None
+            if name == "tournaments":
+                return name, "GET", "/api/tournaments/", None
+            if name == "leaderboard":
+                return name, "GET", "/api/tournaments/leaderboard/", None
+            if name == "tournament_leaderboard":
+                return name, "GET", f"/api/tournaments/{r.choice(tournaments)}/leaderboard/", None
+            return name, "GET", "/api/users/stats/", None
+
+        lock = threading.Lock()
+        samples = {n: [] for n in names}   # latencies (ms)
+        statuses = {n: {} for n in names}
+        login_failures = [0]
+        deadline = time.perf_counter() + o["duration"]
+
+        def worker(idx):
+            r = random.Random(rng.random())
+            sess = Session(o["base_url"], o["timeout"])
+            if sess.call("POST", "/api/users/login/", {"email": r.choice(emails), "password": o["password"]}) != 200:
+                with lock:
+                    login_failures[0] += 1
+                return
+
+            while time.perf_counter() < deadline:
+                name, method, path, payload = pick_request(r)
+                t0 = time.perf_counter()
+                status = sess.call(method, path, payload)
+                ms = (time.perf_counter() - t0) * 1000
+                with lock:
+                    samples[name].append(ms)
+                    statuses[name][status] = statuses[name].get(status, 0) + 1
+                if o["think_ms"]:
+                    time.sleep(o["think_ms"] / 1000)
+
+        started = time.perf_counter()
+        threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(o["sessions"])]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - started
+
+        report = {"sessions": o["sessions"], "seconds": round(elapsed, 2), "login_failures": login_failures[0], "endpoints": {}}
+        for n in names:
+            lat = sorted(samples[n])
+            # 4xx conflicts (e.g. 409 on book) are expected outcomes; 0/5xx are errors
+            errors = sum(c for s, c in statuses[n].items() if s == 0 or s >= 500)
+            report["endpoints"][n] = {
+                "requests": len(lat),
+                "errors": errors,
+                "status": {str(k): v for k, v in sorted(statuses[n].items())},
+                "rps": round(len(lat) / elapsed, 1) if elapsed else 0.0,
+                "p50_ms": round(percentile(lat, 50), 1),
+                "p95_ms": round(percentile(lat, 95), 1),
+                "p99_ms": round(percentile(lat, 99), 1),
+                "max_ms": round(lat[-1], 1) if lat else 0.0,
+            }
+
+        if o["json"]:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        self.stdout.write(
+            f"{o['sessions']} sessions, {report['seconds']}s, login failures: {report['login_failures']}\n"
+        )
+        self.stdout.write(f"{'endpoint':<24}{'reqs':>7}{'err':>6}{'rps':>8}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}")
+        for n, e in report["endpoints"].items():
+            self.stdout.write(
+                f"{n:<24}{e['requests']:>7}{e['errors']:>6}{e['rps']:>8}"
+                f"{e['p50_ms']:>9}{e['p95_ms']:>9}{e['p99_ms']:>9}{e['max_ms']:>9}"
+            )
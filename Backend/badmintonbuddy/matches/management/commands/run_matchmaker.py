@@ -0,0 +1,44 @@
+import json
+import signal
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from matches import matchmaking, waitlist
+
+
+class Command(BaseCommand):
+    help = (
+        "Periodically pair everyone in the matchmaking queue and book courts for them. "
+        "Each tick also expires court waitlist entries whose window has started."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--interval", type=float, default=None,
+                            help="Seconds between batches (default: MATCHMAKING_INTERVAL_SECONDS)")
+        parser.add_argument("--once", action="store_true", help="Run one batch and exit")
+
+    def tick(self):
+        report = matchmaking.run_batch()
+        with transaction.atomic(), connection.cursor() as cur:
+            report["waitlist_expired"] = waitlist.expire_all(cur)
+        return report
+
+    def handle(self, *args, **o):
+        if o["once"]:
+            self.stdout.write(json.dumps(self.tick()))
+            return
+
+        interval = o["interval"] or getattr(settings, "MATCHMAKING_INTERVAL_SECONDS", 30)
+        stop = threading.Event()
+        signal.signal(signal.SIGINT, lambda *_: stop.set())
+        signal.signal(signal.SIGTERM, lambda *_: stop.set())
+
+        self.stdout.write(f"matchmaker running every {interval}s")
+        while not stop.is_set():
+            report = self.tick()
+            if report["waiting"] or report["waitlist_expired"]:
+                self.stdout.write(json.dumps(report))
+            stop.wait(interval)
@@ -0,0 +1,367 @@
+"""
+Matchmaking queue.
+
+Instead of every player running find_partners + book_match on their own,
+players enqueue once (POST /api/matches/matchmaking/join/) with:
+- a time window [window_start, window_end)
+- a match length (duration_minutes)
+- a skill tolerance (max |skill difference| they accept)
+
+A periodic batch matcher (`python manage.py run_matchmaker`) pairs everyone
+waiting at once, then books courts for the pairs:
+
+1. pair_players(): players are bucketed by skill, each bucket sorted by
+   window start. For every skill value within a player's tolerance, a
+   bisect finds the entries whose windows can overlap by a full match. Up
+   to NEIGHBORS of them that also accept the skill gap become candidate
+   edges. The edges are taken greedily, smallest skill gap first (ties:
+   longest-waiting entries first). Greedy is a 2-approximation of min-cost
+   matching and runs in O(n * tolerance * NEIGHBORS) plus the edge sort.
+2. schedule(): pairs with the tightest common window go first. Each pair
+   gets the earliest slot-aligned start in its common window where a court
+   and both players are free. Bookings made earlier in the batch count as
+   busy. Times are minutes since midnight UTC of the batch's first day, so
+   slot-aligned means on the wall clock (:00, :15, ... for 15-minute slots).
+3. run_batch() pairs and schedules against a snapshot of the bookings,
+   without court locks. It then locks only the courts it is about to book
+   (court_id order: the same locks book_match / the waitlist take), drops
+   any booking that a concurrent write made impossible, and writes the
+   matches (one executemany), their player_matches rows and the queue
+   updates. Normal bookings wait at most for that short write phase.
+
+Pairs that find no free court stay waiting for the next batch. Entries whose
+window has passed are expired.
+"""
+import bisect
+import logging
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from . import player_matches, rollups
+
+logger = logging.getLogger(__name__)
+
+Entry = namedtuple("Entry", "queue_id user_id skill tolerance start end duration")
+Booking = namedtuple("Booking", "a b court_id start end")
+
+IN_CHUNK = 1000
+
+
+def _neighbors():
+    return getattr(settings, "MATCHMAKING_NEIGHBORS", 50)
+
+
+def _slot():
+    return getattr(settings, "MATCHMAKING_SLOT_MINUTES", 15)
+
+
+# ---------- pure algorithm (times are integer minutes) ----------
+
+def pair_players(entries, neighbors=None):
+    """entries: [Entry]. Returns [(a, b)] with a, b Entries; every entry appears at most once."""
+    neighbors = neighbors or _neighbors()
+    if not entries:
+        return []
+
+    # per skill value, entries sorted by window start: candidates for `a` are a bisect range
+    buckets = {}
+    for e in entries:
+        buckets.setdefault(e.skill, []).append(e)
+    starts = {}
+    for skill, bucket in buckets.items():
+        bucket.sort(key=lambda e: (e.start, e.queue_id))
+        starts[skill] = [e.start for e in bucket]
+    longest = max(e.end - e.start for e in entries)
+    shortest = min(e.duration for e in entries)
+
+    edges = []
+    for a_skill, a_bucket in buckets.items():
+        for pos, a in enumerate(a_bucket):
+            a_start, a_end, a_dur = a.start, a.end, a.duration
+            for skill in range(a_skill, a_skill + a.tolerance + 1):
+                bucket = buckets.get(skill)
+                if not bucket:
+                    continue
+                gap = skill - a_skill
+                # b overlaps a by at least a match only if b.start is in this range;
+                # same-skill pairs are found once, from the earlier entry
+                lo = pos + 1 if gap == 0 else bisect.bisect_left(starts[skill], a_start - longest)
+                hi = bisect.bisect_right(starts[skill], a_end - shortest, lo)
+                found = 0
+                for i in range(lo, hi):
+                    b = bucket[i]
+                    if gap > b.tolerance or b.user_id == a.user_id:
+                        continue
+                    need = a_dur if a_dur > b.duration else b.duration
+                    overlap = (a_end if a_end < b.end else b.end) - (a_start if a_start > b.start else b.start)
+                    if overlap < need:
+                        continue
+                    edges.append((gap, a.queue_id + b.queue_id, a.queue_id, b.queue_id))
+                    found += 1
+                    if found >= neighbors:
+                        break
+
+    edges.sort()
+    by_id = {e.queue_id: e for e in entries}
+    taken = set()
+    pairs = []
+    for _, _, a_id, b_id in edges:
+        if a_id in taken or b_id in taken:
+            continue
+        taken.add(a_id)
+        taken.add(b_id)
+        pairs.append((by_id[a_id], by_id[b_id]))
+    return pairs
+
+
+def _align(t, slot):
+    # t counts minutes from a midnight, so multiples of slot are wall-clock aligned
+    return -(-t // slot) * slot
+
+
+def _earliest_fit(busy_lists, lo, hi, need, slot):
+    """
+    Earliest slot-aligned t in [lo, hi - need] such that [t, t + need) overlaps
+    no interval in any of busy_lists. Each list is sorted and non-overlapping
+    (one court's bookings, one player's matches), so only the last interval
+    starting before t + need can overlap. None if nothing fits.
+    """
+    t = _align(lo, slot)
+    moved = True
+    while moved and t + need <= hi:
+        moved = False
+        for intervals in busy_lists:
+            k = bisect.bisect_left(intervals, (t + need,))
+            if k and intervals[k - 1][1] > t:
+                t = _align(intervals[k - 1][1], slot)
+                moved = True
+    return t if t + need <= hi else None
+
+
+def schedule(pairs, court_busy, player_busy, slot=None):
+    """
+    Assign (court, start) to each pair.
+    court_busy:  {court_id: sorted [(start, end)]}, updated in place
+    player_busy: {user_id: sorted [(start, end)]}, updated in place
+    Returns ([Booking], [unscheduled pair]).
+    """
+    slot = slot or _slot()
+    court_ids = sorted(court_busy)
+
+    def window(pair):
+        a, b = pair
+        return max(a.start, b.start), min(a.end, b.end), max(a.duration, b.duration)
+
+    bookings, unscheduled = [], []
+    # tightest common window first: flexible pairs can still go elsewhere
+    for pair in sorted(pairs, key=lambda p: (window(p)[1] - window(p)[0], p[0].queue_id)):
+        lo, hi, need = window(pair)
+        a, b = pair
+        players = [player_busy.setdefault(a.user_id, []), player_busy.setdefault(b.user_id, [])]
+
+        best = None
+        for court_id in court_ids:
+            t = _earliest_fit([court_busy[court_id]] + players, lo, hi, need, slot)
+            if t is not None and (best is None or t < best[1]):
+                best = (court_id, t)
+                if t == _align(lo, slot):
+                    break  # can't start earlier than that
+
+        if best is None:
+            unscheduled.append(pair)
+            continue
+
+        court_id, t = best
+        for intervals in [court_busy[court_id]] + players:
+            bisect.insort(intervals, (t, t + need))
+        bookings.append(Booking(a, b, court_id, t, t + need))
+
+    return bookings, unscheduled
+
+
+# ---------- DB batch ----------
+
+def _utcnow():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _naive(dt):
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+def _minutes(dt, base):
+    return int((_naive(dt) - base).total_seconds() // 60)
+
+
+def _chunks(seq, n=IN_CHUNK):
+    for i in range(0, len(seq), n):
+        yield seq[i:i + n]
+
+
+def _in(ids):
+    return ",".join(["%s"] * len(ids))
+
+
+def _court_intervals(cur, court_ids, base, horizon):
+    """{court_id: sorted [(start, end)]} in minutes from base, for bookings overlapping [base, horizon)."""
+    busy = {}
+    for chunk in _chunks(court_ids):
+        cur.execute(
+            f"""
+            SELECT court_id, start_time, end_time FROM matches
+            WHERE court_id IN ({_in(chunk)}) AND start_time < %s AND end_time > %s
+            """,
+            [*chunk, horizon, base]
+        )
+        for court_id, s, e in cur.fetchall():
+            busy.setdefault(court_id, []).append((_minutes(s, base), _minutes(e, base)))
+    for intervals in busy.values():
+        intervals.sort()
+    return busy
+
+
+def _player_intervals(cur, user_ids, base, horizon):
+    """{user_id: sorted [(start, end)]} in minutes from base, through player_matches."""
+    busy = {}
+    for chunk in _chunks(user_ids):
+        cur.execute(
+            f"""
+            SELECT user_id, start_time, end_time FROM player_matches
+            WHERE user_id IN ({_in(chunk)}) AND start_time > %s AND start_time < %s AND end_time > %s
+            """,
+            [*chunk, base - timedelta(minutes=player_matches.MAX_MATCH_MINUTES), horizon, base]
+        )
+        for uid, s, e in cur.fetchall():
+            busy.setdefault(uid, []).append((_minutes(s, base), _minutes(e, base)))
+    for intervals in busy.values():
+        intervals.sort()
+    return busy
+
+
+def run_batch(now=None):
+    """Pair and book everyone waiting. Returns a report dict."""
+    started = time.perf_counter()
+    now = _naive(now) if now else _utcnow()
+
+    with transaction.atomic(), connection.cursor() as cur:
+        cur.execute(
+            "UPDATE matchmaking_queue SET status='expired' WHERE status='waiting' AND window_end <= %s",
+            [now]
+        )
+        expired = cur.rowcount
+
+        # read without locks: only the courts that get bookings are locked, below
+        cur.execute("SELECT court_id FROM courts ORDER BY court_id")
+        court_ids = [r[0] for r in cur.fetchall()]
+
+        cur.execute(
+            """
+            SELECT queue_id, user_id, skill_rating, skill_tolerance, window_start, window_end, duration_minutes
+            FROM matchmaking_queue
+            WHERE status='waiting'
+            ORDER BY queue_id
+            FOR UPDATE
+            """
+        )
+        rows = cur.fetchall()
+
+        report = {"waiting": len(rows), "expired": expired, "pairs": 0, "booked": 0, "unscheduled_pairs": 0}
+        if len(rows) < 2 or not court_ids:
+            report["seconds"] = round(time.perf_counter() - started, 3)
+            return report
+
+        # nothing gets booked to start in the past
+        earliest = (now + timedelta(seconds=59)).replace(second=0, microsecond=0)
+        # midnight: minute offsets from it are wall-clock minutes, so _align() lands on :00 / :15 / ...
+        base = min(max(_naive(r[4]), earliest) for r in rows).replace(hour=0, minute=0, second=0, microsecond=0)
+        horizon = max(_naive(r[5]) for r in rows)
+        entries = [
+            Entry(qid, uid, skill or 0, tol, _minutes(max(_naive(ws), earliest), base), _minutes(we, base), dur)
+            for qid, uid, skill, tol, ws, we, dur in rows
+        ]
+
+        court_busy = {c: [] for c in court_ids}
+        for court_id, intervals in _court_intervals(cur, court_ids, base, horizon).items():
+            court_busy[court_id] = intervals
+        player_busy = _player_intervals(cur, sorted({e.user_id for e in entries}), base, horizon)
+
+        pairs = pair_players(entries)
+        bookings, unscheduled = schedule(pairs, court_busy, player_busy)
+
+        # write phase: lock just the courts being booked, then re-check against what
+        # concurrent bookings added since the snapshot; losers wait for the next batch
+        booked_courts = sorted({bk.court_id for bk in bookings})
+        if booked_courts:
+            cur.execute(
+                f"SELECT court_id FROM courts WHERE court_id IN ({_in(booked_courts)}) ORDER BY court_id FOR UPDATE",
+                booked_courts
+            )
+            fresh_courts = _court_intervals(cur, booked_courts, base, horizon)
+            fresh_players = _player_intervals(
+                cur, sorted({u for bk in bookings for u in (bk.a.user_id, bk.b.user_id)}), base, horizon
+            )
+            kept = []
+            for bk in bookings:
+                busy = fresh_courts.get(bk.court_id, []) + fresh_players.get(bk.a.user_id, []) \
+                    + fresh_players.get(bk.b.user_id, [])
+                if any(s < bk.end and e > bk.start for s, e in busy):
+                    unscheduled.append((bk.a, bk.b))
+                else:
+                    kept.append(bk)
+            bookings = kept
+
+        rows_to_insert = [
+            (bk.court_id, bk.a.user_id, bk.b.user_id,
+             base + timedelta(minutes=bk.start), base + timedelta(minutes=bk.end))
+            for bk in bookings
+        ]
+        if rows_to_insert:
+            cur.executemany(
+                "INSERT INTO matches (court_id, player1_id, player2_id, start_time, end_time) VALUES (%s,%s,%s,%s,%s)",
+                rows_to_insert
+            )
+
+        # ids back by (court_id, start_time): unique while those courts are locked
+        ids_by_slot = {}
+        for court_id in booked_courts:
+            cur.execute(
+                "SELECT match_id, start_time FROM matches WHERE court_id=%s AND start_time >= %s AND start_time < %s",
+                [court_id, base, horizon]
+            )
+            for match_id, start_time in cur.fetchall():
+                ids_by_slot[(court_id, _naive(start_time))] = match_id
+
+        match_ids = []
+        queue_updates = []
+        for bk, row in zip(bookings, rows_to_insert):
+            match_id = ids_by_slot[(bk.court_id, row[3])]
+            match_ids.append(match_id)
+            queue_updates += [(match_id, bk.a.queue_id), (match_id, bk.b.queue_id)]
+
+        for chunk in _chunks(match_ids, 500):
+            player_matches.sync(cur, chunk)
+            rollups.sync(cur, chunk)
+        if queue_updates:
+            cur.executemany(
+                "UPDATE matchmaking_queue SET status='matched', match_id=%s, matched_at=%s WHERE queue_id=%s",
+                [(match_id, now, queue_id) for match_id, queue_id in queue_updates]
+            )
+
+    report.update({
+        "pairs": len(pairs),
+        "booked": len(bookings),
+        "unscheduled_pairs": len(unscheduled),
+        "seconds": round(time.perf_counter() - started, 3),
+    })
+    if bookings:
+        logger.info(
+            "matchmaking: %d waiting -> %d pairs, %d booked, %d without a court (%.2fs)",
+            report["waiting"], report["pairs"], report["booked"], report["unscheduled_pairs"], report["seconds"]
+        )
+    return report
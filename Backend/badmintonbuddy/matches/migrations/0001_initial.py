@@ -0,0 +1,74 @@
+# Generated by Django 5.2.4 on 2026-10-18 23:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('users', '0001_initial'),
+        ('tournaments', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Court',
+            fields=[
+                ('court_id', models.AutoField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=100)),
+            ],
+            options={
+                'db_table': 'courts',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Match',
+            fields=[
+                ('match_id', models.AutoField(primary_key=True, serialize=False)),
+                ('start_time', models.DateTimeField()),
+                ('end_time', models.DateTimeField()),
+                ('tournament_id', models.IntegerField(blank=True, null=True)),
+                ('round', models.SmallIntegerField(blank=True, null=True)),
+                ('score', models.CharField(blank=True, max_length=50, null=True)),
+            ],
+            options={
+                'db_table': 'matches',
+                'managed': False,
+            },
+        ),
+        migrations.RunSQL(
+            sql="""
+                CREATE TABLE IF NOT EXISTS courts (
+                    court_id   INT PRIMARY KEY AUTO_INCREMENT,
+                    name       VARCHAR(100) NOT NULL
+                )
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        # player2_id is NULL for open slots (book_match without opponent_id)
+        migrations.RunSQL(
+            sql="""
+                CREATE TABLE IF NOT EXISTS matches (
+                    match_id       INT PRIMARY KEY AUTO_INCREMENT,
+                    court_id       INT NOT NULL,
+                    player1_id     INT NOT NULL,
+                    player2_id     INT NULL,
+                    start_time     DATETIME NOT NULL,
+                    end_time       DATETIME NOT NULL,
+                    tournament_id  INT,
+                    round          TINYINT,
+                    winner_id      INT,
+                    score          VARCHAR(50),
+                    FOREIGN KEY (court_id) REFERENCES courts(court_id),
+                    FOREIGN KEY (player1_id) REFERENCES users(user_id),
+                    FOREIGN KEY (player2_id) REFERENCES users(user_id),
+                    FOREIGN KEY (tournament_id) REFERENCES tournaments(tournament_id),
+                    FOREIGN KEY (winner_id) REFERENCES users(user_id)
+                )
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,34 @@
+from django.db import migrations
+
+
+# Composite indexes for the real access paths in matches/views.py and
+# tournaments/views.py. MySQL cannot combine an OR across player1_id/player2_id
+# with a single index, so each side gets its own (player, start_time) index and
+# the optimizer answers the OR with an index_merge.
+INDEXES = [
+    # court overlap check in book_match + by-day with court_id filter
+    ("idx_matches_court_time", "(court_id, start_time, end_time)"),
+    # per-player conflict checks, history, by-day, find_partners NOT EXISTS
+    ("idx_matches_p1_start", "(player1_id, start_time)"),
+    # same for player2; the leading player2_id also serves open_slots (player2_id IS NULL)
+    ("idx_matches_p2_start", "(player2_id, start_time)"),
+    # tournament_matches / tournament_leaderboard / complete_tournament
+    ("idx_matches_tournament_round", "(tournament_id, round)"),
+    # by-day calendar across all courts
+    ("idx_matches_start", "(start_time)"),
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matches', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=f"CREATE INDEX {name} ON matches {cols}",
+            reverse_sql=f"DROP INDEX {name} ON matches",
+        )
+        for name, cols in INDEXES
+    ]
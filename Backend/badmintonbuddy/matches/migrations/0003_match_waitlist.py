@@ -0,0 +1,53 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matches', '0002_access_path_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WaitlistEntry',
+            fields=[
+                ('waitlist_id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('user', models.ForeignKey(db_column='user_id', on_delete=models.deletion.CASCADE, related_name='waitlist_entries', to='users.user')),
+                ('court', models.ForeignKey(db_column='court_id', on_delete=models.deletion.CASCADE, to='matches.court')),
+                ('opponent_id', models.IntegerField(blank=True, null=True)),
+                ('start_time', models.DateTimeField()),
+                ('end_time', models.DateTimeField()),
+                ('status', models.CharField(max_length=10)),
+                ('match_id', models.IntegerField(blank=True, null=True)),
+                ('created_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'match_waitlist',
+                'managed': False,
+            },
+        ),
+        # waitlist_id order is the queue order (FIFO per court).
+        # idx_waitlist_court serves promotion after a cancel:
+        #   court_id=? AND status='waiting' AND start_time < freed_end ... ORDER BY waitlist_id
+        migrations.RunSQL(
+            sql="""
+                CREATE TABLE IF NOT EXISTS match_waitlist (
+                    waitlist_id  BIGINT PRIMARY KEY AUTO_INCREMENT,
+                    user_id      INT NOT NULL,
+                    court_id     INT NOT NULL,
+                    opponent_id  INT NULL,
+                    start_time   DATETIME NOT NULL,
+                    end_time     DATETIME NOT NULL,
+                    status       ENUM('waiting','booked','left') NOT NULL DEFAULT 'waiting',
+                    match_id     INT NULL,
+                    created_at   DATETIME NOT NULL,
+                    KEY idx_waitlist_court (court_id, status, start_time),
+                    KEY idx_waitlist_user (user_id, status),
+                    FOREIGN KEY (user_id) REFERENCES users(user_id),
+                    FOREIGN KEY (court_id) REFERENCES courts(court_id),
+                    FOREIGN KEY (opponent_id) REFERENCES users(user_id)
+                )
+            """,
+            reverse_sql="DROP TABLE IF EXISTS match_waitlist",
+        ),
+    ]
@@ -0,0 +1,61 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matches', '0003_match_waitlist'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedMatch',
+            fields=[
+                ('match_id', models.IntegerField(primary_key=True, serialize=False)),
+                ('court_id', models.IntegerField()),
+                ('player1_id', models.IntegerField()),
+                ('player2_id', models.IntegerField(blank=True, null=True)),
+                ('start_time', models.DateTimeField()),
+                ('end_time', models.DateTimeField()),
+                ('tournament_id', models.IntegerField(blank=True, null=True)),
+                ('round', models.SmallIntegerField(blank=True, null=True)),
+                ('winner_id', models.IntegerField(blank=True, null=True)),
+                ('score', models.CharField(blank=True, max_length=50, null=True)),
+                ('archived_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'matches_archive',
+                'managed': False,
+            },
+        ),
+        # Monthly RANGE COLUMNS partitions on start_time. Only the two boundary
+        # partitions exist up front; `manage.py archive_matches` splits p_future
+        # into pYYYYMM partitions before moving rows into a month.
+        # Partitioned InnoDB tables can't have foreign keys, and every unique key
+        # must include the partition column, hence PRIMARY KEY (match_id, start_time).
+        migrations.RunSQL(
+            sql="""
+                CREATE TABLE IF NOT EXISTS matches_archive (
+                    match_id       INT NOT NULL,
+                    court_id       INT NOT NULL,
+                    player1_id     INT NOT NULL,
+                    player2_id     INT NULL,
+                    start_time     DATETIME NOT NULL,
+                    end_time       DATETIME NOT NULL,
+                    tournament_id  INT,
+                    round          TINYINT,
+                    winner_id      INT,
+                    score          VARCHAR(50),
+                    archived_at    DATETIME NOT NULL,
+                    PRIMARY KEY (match_id, start_time),
+                    KEY idx_archive_p1_start (player1_id, start_time),
+                    KEY idx_archive_p2_start (player2_id, start_time)
+                )
+                PARTITION BY RANGE COLUMNS (start_time) (
+                    PARTITION p_before VALUES LESS THAN ('2020-01-01'),
+                    PARTITION p_future VALUES LESS THAN (MAXVALUE)
+                )
+            """,
+            reverse_sql="DROP TABLE IF EXISTS matches_archive",
+        ),
+    ]
@@ -0,0 +1,53 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matches', '0004_matches_archive'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlayerMatch',
+            fields=[
+                ('pk', models.CompositePrimaryKey('user_id', 'start_time', 'match_id', blank=True, editable=False, primary_key=True, serialize=False)),
+                ('user_id', models.IntegerField()),
+                ('start_time', models.DateTimeField()),
+                ('end_time', models.DateTimeField()),
+                ('match_id', models.IntegerField()),
+            ],
+            options={
+                'db_table': 'player_matches',
+                'managed': False,
+            },
+        ),
+        # Clustered on (user_id, start_time): per-player overlap checks and history
+        # are one range scan. idx_player_matches_match serves sync() and the
+        # tournament leaderboard join; the FK cascade drops rows of deleted matches.
+        migrations.RunSQL(
+            sql="""
+                CREATE TABLE IF NOT EXISTS player_matches (
+                    user_id     INT NOT NULL,
+                    start_time  DATETIME NOT NULL,
+                    end_time    DATETIME NOT NULL,
+                    match_id    INT NOT NULL,
+                    PRIMARY KEY (user_id, start_time, match_id),
+                    KEY idx_player_matches_match (match_id, user_id),
+                    FOREIGN KEY (user_id) REFERENCES users(user_id),
+                    FOREIGN KEY (match_id) REFERENCES matches(match_id) ON DELETE CASCADE
+                )
+            """,
+            reverse_sql="DROP TABLE IF EXISTS player_matches",
+        ),
+        # backfill from existing matches
+        migrations.RunSQL(
+            sql="""
+                INSERT IGNORE INTO player_matches (user_id, start_time, end_time, match_id)
+                SELECT player1_id, start_time, end_time, match_id FROM matches
+                UNION ALL
+                SELECT player2_id, start_time, end_time, match_id FROM matches WHERE player2_id IS NOT NULL
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
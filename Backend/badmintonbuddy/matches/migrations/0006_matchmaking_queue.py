@@ -0,0 +1,53 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matches', '0005_player_matches'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MatchmakingEntry',
+            fields=[
+                ('queue_id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('skill_rating', models.IntegerField()),
+                ('skill_tolerance', models.IntegerField()),
+                ('window_start', models.DateTimeField()),
+                ('window_end', models.DateTimeField()),
+                ('duration_minutes', models.IntegerField()),
+                ('status', models.CharField(max_length=10)),
+                ('match_id', models.IntegerField(blank=True, null=True)),
+                ('created_at', models.DateTimeField()),
+                ('matched_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'matchmaking_queue',
+                'managed': False,
+            },
+        ),
+        # idx_matchmaking_status serves the batch matcher (status='waiting' ORDER BY queue_id)
+        # and expiry; idx_matchmaking_user the per-user "already queued?" check and listing.
+        migrations.RunSQL(
+            sql="""
+                CREATE TABLE IF NOT EXISTS matchmaking_queue (
+                    queue_id          BIGINT PRIMARY KEY AUTO_INCREMENT,
+                    user_id           INT NOT NULL,
+                    skill_rating      INT NOT NULL,
+                    skill_tolerance   INT NOT NULL,
+                    window_start      DATETIME NOT NULL,
+                    window_end        DATETIME NOT NULL,
+                    duration_minutes  INT NOT NULL,
+                    status            ENUM('waiting','matched','left','expired') NOT NULL DEFAULT 'waiting',
+                    match_id          INT NULL,
+                    created_at        DATETIME NOT NULL,
+                    matched_at        DATETIME NULL,
+                    KEY idx_matchmaking_status (status, window_end),
+                    KEY idx_matchmaking_user (user_id, status),
+                    FOREIGN KEY (user_id) REFERENCES users(user_id)
+                )
+            """,
+            reverse_sql="DROP TABLE IF EXISTS matchmaking_queue",
+        ),
+    ]
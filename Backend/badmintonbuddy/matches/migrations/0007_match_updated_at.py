@@ -0,0 +1,20 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matches', '0006_matchmaking_queue'),
+    ]
+
+    operations = [
+        # updated_at moves on every UPDATE of the row (booking joins, results, reschedules);
+        # the ICS feed's ETag / Last-Modified are derived from it.
+        migrations.RunSQL(
+            sql=(
+                "ALTER TABLE matches ADD COLUMN updated_at DATETIME(6) NOT NULL "
+                "DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6) AFTER score"
+            ),
+            reverse_sql="ALTER TABLE matches DROP COLUMN updated_at",
+        ),
+    ]
@@ -0,0 +1,74 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matches', '0007_match_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourtDailyStats',
+            fields=[
+                ('pk', models.CompositePrimaryKey('court_id', 'day', blank=True, editable=False, primary_key=True, serialize=False)),
+                ('court_id', models.IntegerField()),
+                ('day', models.DateField()),
+                ('bookings', models.IntegerField()),
+                ('booked_minutes', models.IntegerField()),
+            ],
+            options={
+                'db_table': 'court_daily_stats',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='UserDailyStats',
+            fields=[
+                ('pk', models.CompositePrimaryKey('user_id', 'day', blank=True, editable=False, primary_key=True, serialize=False)),
+                ('user_id', models.IntegerField()),
+                ('day', models.DateField()),
+                ('matches', models.IntegerField()),
+                ('played', models.IntegerField()),
+                ('won', models.IntegerField()),
+                ('friendly', models.IntegerField()),
+                ('tournament', models.IntegerField()),
+            ],
+            options={
+                'db_table': 'user_daily_stats',
+                'managed': False,
+            },
+        ),
+        # Range reads are primary-key range scans: one user's (or court's) days.
+        # idx_court_daily_day serves the all-courts range. Fill existing history with
+        # `manage.py backfill_rollups` (chunked), not in this migration.
+        migrations.RunSQL(
+            sql="""
+                CREATE TABLE IF NOT EXISTS user_daily_stats (
+                    user_id     INT NOT NULL,
+                    day         DATE NOT NULL,
+                    matches     INT NOT NULL DEFAULT 0,
+                    played      INT NOT NULL DEFAULT 0,
+                    won         INT NOT NULL DEFAULT 0,
+                    friendly    INT NOT NULL DEFAULT 0,
+                    tournament  INT NOT NULL DEFAULT 0,
+                    PRIMARY KEY (user_id, day),
+                    KEY idx_user_daily_day (day)
+                )
+            """,
+            reverse_sql="DROP TABLE IF EXISTS user_daily_stats",
+        ),
+        migrations.RunSQL(
+            sql="""
+                CREATE TABLE IF NOT EXISTS court_daily_stats (
+                    court_id        INT NOT NULL,
+                    day             DATE NOT NULL,
+                    bookings        INT NOT NULL DEFAULT 0,
+                    booked_minutes  INT NOT NULL DEFAULT 0,
+                    PRIMARY KEY (court_id, day),
+                    KEY idx_court_daily_day (day)
+                )
+            """,
+            reverse_sql="DROP TABLE IF EXISTS court_daily_stats",
+        ),
+    ]
@@ -0,0 +1,23 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matches', '0008_daily_rollups'),
+    ]
+
+    operations = [
+        # waitlist entries whose window has started are marked 'expired' (matches/waitlist.py expire())
+        migrations.RunSQL(
+            sql=(
+                "ALTER TABLE match_waitlist MODIFY status "
+                "ENUM('waiting','booked','left','expired') NOT NULL DEFAULT 'waiting'"
+            ),
+            reverse_sql=[
+                "UPDATE match_waitlist SET status='left' WHERE status='expired'",
+                "ALTER TABLE match_waitlist MODIFY status "
+                "ENUM('waiting','booked','left') NOT NULL DEFAULT 'waiting'",
+            ],
+        ),
+    ]
@@ -0,0 +1,33 @@
+from django.db import migrations
+
+# Frozen copy of matches/player_matches.py MAX_MATCH_MINUTES as of this migration.
+MAX_MATCH_MINUTES = 240
+
+
+def check_match_length(apps, schema_editor):
+    # player_busy() and partner_matching.sql only look MAX_MATCH_MINUTES back from the
+    # requested start; a longer live match would be invisible to them, so refuse to deploy.
+    with schema_editor.connection.cursor() as cur:
+        cur.execute(
+            "SELECT match_id, start_time, end_time FROM matches "
+            "WHERE end_time > start_time + INTERVAL %s MINUTE ORDER BY match_id LIMIT 20",
+            [MAX_MATCH_MINUTES],
+        )
+        rows = cur.fetchall()
+    if rows:
+        listed = ", ".join(f"{match_id} ({start} - {end})" for match_id, start, end in rows)
+        raise RuntimeError(
+            f"matches longer than {MAX_MATCH_MINUTES} minutes exist (first {len(rows)}: {listed}). "
+            "Split or shorten them before applying this migration."
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matches', '0009_waitlist_expired'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_match_length, migrations.RunPython.noop),
+    ]
@@ -27,6 +27,7 @@ class Match(models.Model):
     round = models.SmallIntegerField(null=True, blank=True)
     winner = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, db_column='winner_id', related_name='wins_as_winner')
     score = models.CharField(max_length=50, null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)  # DB default + ON UPDATE; see migration 0007
 
     class Meta:
         managed = False
@@ -34,3 +35,116 @@ class Match(models.Model):
 
     def __str__(self):
         return f"Match {self.match_id}"
+
+
+class WaitlistEntry(models.Model):
+    waitlist_id = models.BigAutoField(primary_key=True)
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, db_column='user_id', related_name='waitlist_entries')
+    court = models.ForeignKey(Court, on_delete=models.CASCADE, db_column='court_id')
+    opponent_id = models.IntegerField(null=True, blank=True)
+
+    start_time = models.DateTimeField()
+    end_time = models.DateTimeField()
+
+    status = models.CharField(max_length=10)  # waiting | booked | left
+    match_id = models.IntegerField(null=True, blank=True)
+    created_at = models.DateTimeField()
+
+    class Meta:
+        managed = False
+        db_table = 'match_waitlist'
+
+    def __str__(self):
+        return f"Waitlist {self.waitlist_id}"
+
+
+class ArchivedMatch(models.Model):
+    # same columns as matches; table is RANGE-partitioned by month on start_time (see matches/archive.py)
+    match_id = models.IntegerField(primary_key=True)
+    court_id = models.IntegerField()
+    player1_id = models.IntegerField()
+    player2_id = models.IntegerField(null=True, blank=True)
+
+    start_time = models.DateTimeField()
+    end_time = models.DateTimeField()
+
+    tournament_id = models.IntegerField(null=True, blank=True)
+    round = models.SmallIntegerField(null=True, blank=True)
+    winner_id = models.IntegerField(null=True, blank=True)
+    score = models.CharField(max_length=50, null=True, blank=True)
+    archived_at = models.DateTimeField()
+
+    class Meta:
+        managed = False
+        db_table = 'matches_archive'
+
+    def __str__(self):
+        return f"Archived match {self.match_id}"
+
+
+class PlayerMatch(models.Model):
+    # denormalized (player, match) index maintained by matches/player_matches.py
+    pk = models.CompositePrimaryKey('user_id', 'start_time', 'match_id')
+    user_id = models.IntegerField()
+    start_time = models.DateTimeField()
+    end_time = models.DateTimeField()
+    match_id = models.IntegerField()
+
+    class Meta:
+        managed = False
+        db_table = 'player_matches'
+
+
+class MatchmakingEntry(models.Model):
+    # one player waiting to be paired by the batch matcher (matches/matchmaking.py)
+    queue_id = models.BigAutoField(primary_key=True)
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, db_column='user_id', related_name='matchmaking_entries')
+    skill_rating = models.IntegerField()
+    skill_tolerance = models.IntegerField()
+
+    window_start = models.DateTimeField()
+    window_end = models.DateTimeField()
+    duration_minutes = models.IntegerField()
+
+    status = models.CharField(max_length=10)  # waiting | matched | left | expired
+    match_id = models.IntegerField(null=True, blank=True)
+    created_at = models.DateTimeField()
+    matched_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        managed = False
+        db_table = 'matchmaking_queue'
+
+    def __str__(self):
+        return f"Matchmaking {self.queue_id}"
+
+
+class UserDailyStats(models.Model):
+    # per-user per-day rollup maintained by matches/rollups.py
+    pk = models.CompositePrimaryKey('user_id', 'day')
+    user_id = models.IntegerField()
+    day = models.DateField()
+    matches = models.IntegerField()
+    played = models.IntegerField()
+    won = models.IntegerField()
+    friendly = models.IntegerField()
+    tournament = models.IntegerField()
+
+    class Meta:
+        managed = False
+        db_table = 'user_daily_stats'
+
+
+class CourtDailyStats(models.Model):
+    # per-court per-day rollup maintained by matches/rollups.py
+    pk = models.CompositePrimaryKey('court_id', 'day')
+    court_id = models.IntegerField()
+    day = models.DateField()
+    bookings = models.IntegerField()
+    booked_minutes = models.IntegerField()
+
+    class Meta:
+        managed = False
+        db_table = 'court_daily_stats'
@@ -0,0 +1,126 @@
+"""
+player_matches: one row per (player, live match).
+
+Per-player queries used to filter `matches` on
+`player1_id = X OR player2_id = X`. MySQL can only answer that with an
+index_merge of two indexes. With this table they become one clustered range
+scan on PRIMARY KEY (user_id, start_time, match_id):
+
+    SELECT 1 FROM player_matches
+    WHERE user_id=%s AND start_time < %s AND end_time > %s
+
+Maintenance: every write path that inserts a match, changes its players or
+changes its times calls sync(cur, match_ids) in the same transaction:
+book_match / waitlist (insert_match), join_slot, cancel (player2 leaves),
+start_tournament, reschedule_tournament. Deleted matches (cancel, archive)
+lose their rows through the FK's ON DELETE CASCADE. Bulk loaders call
+backfill().
+
+`python manage.py check_player_matches [--repair]` compares the table
+against `matches`.
+
+No match is longer than MAX_MATCH_MINUTES (book_match, waitlist,
+start_tournament and matchmaking validate it; migration 0010 refuses to
+apply while an older row breaks it). That bounds start_time from
+below for an overlap check, so player_busy() is a range on the primary key
+instead of every earlier row of the player.
+"""
+from datetime import timedelta
+
+from django.db import connection, transaction
+
+MAX_MATCH_MINUTES = 240
+
+_DERIVE = """
+    SELECT player1_id AS user_id, start_time, end_time, match_id FROM matches WHERE {where}
+    UNION ALL
+    SELECT player2_id, start_time, end_time, match_id FROM matches WHERE {where} AND player2_id IS NOT NULL
+"""
+
+
+def sync(cur, match_ids):
+    """Re-derive the rows of these matches from `matches` (after an insert / join / time change)."""
+    ids = [int(i) for i in match_ids if i is not None]
+    if not ids:
+        return
+    in_ids = ",".join(["%s"] * len(ids))
+    cur.execute(f"DELETE FROM player_matches WHERE match_id IN ({in_ids})", ids)
+    cur.execute(
+        "INSERT INTO player_matches (user_id, start_time, end_time, match_id) "
+        + _DERIVE.format(where=f"match_id IN ({in_ids})"),
+        ids + ids
+    )
+
+
+def backfill(cur, after_match_id=0):
+    """Index every match with match_id > after_match_id (migration, data generators, test fixtures)."""
+    cur.execute(
+        "INSERT INTO player_matches (user_id, start_time, end_time, match_id) "
+        + _DERIVE.format(where="match_id > %s"),
+        [after_match_id, after_match_id]
+    )
+    return cur.rowcount
+
+
+def player_busy(cur, user_id, start_dt, end_dt):
+    """True if the player has any live match overlapping [start_dt, end_dt)."""
+    cur.execute(
+        """
+        SELECT 1 FROM player_matches
+        WHERE user_id=%s AND start_time > %s AND start_time < %s AND end_time > %s
+        LIMIT 1
+        """,
+        [user_id, start_dt - timedelta(minutes=MAX_MATCH_MINUTES), end_dt, start_dt]
+    )
+    return cur.fetchone() is not None
+
+
+def check(repair=False, sample=20):
+    """
+    Compare player_matches with what `matches` implies.
+    Returns {"missing": n, "stale": n, "extra": n, "examples": [...], "repaired": n}.
+    - missing: a player of a match has no row
+    - stale:   row exists but start/end differ from the match
+    - extra:   row for a match that's gone or a user no longer in it
+    repair=True re-syncs every affected match_id (and deletes orphan rows).
+    """
+    expected = _DERIVE.format(where="1=1")
+    with connection.cursor() as cur:
+        cur.execute(f"""
+            SELECT e.match_id, e.user_id,
+                   CASE WHEN pm.match_id IS NULL THEN 'missing' ELSE 'stale' END
+            FROM ({expected}) e
+            LEFT JOIN player_matches pm
+              ON pm.match_id = e.match_id AND pm.user_id = e.user_id
+            WHERE pm.match_id IS NULL
+               OR pm.start_time <> e.start_time
+               OR pm.end_time <> e.end_time
+        """)
+        problems = [(mid, uid, kind) for mid, uid, kind in cur.fetchall()]
+
+        cur.execute("""
+            SELECT pm.match_id, pm.user_id, 'extra'
+            FROM player_matches pm
+            LEFT JOIN matches m
+              ON m.match_id = pm.match_id
+             AND (m.player1_id = pm.user_id OR m.player2_id = pm.user_id)
+            WHERE m.match_id IS NULL
+        """)
+        problems += [(mid, uid, kind) for mid, uid, kind in cur.fetchall()]
+
+        report = {
+            kind: sum(1 for p in problems if p[2] == kind) for kind in ("missing", "stale", "extra")
+        }
+        report["examples"] = [
+            {"match_id": mid, "user_id": uid, "problem": kind} for mid, uid, kind in problems[:sample]
+        ]
+        report["repaired"] = 0
+
+        if repair and problems:
+            match_ids = sorted({p[0] for p in problems})
+            with transaction.atomic():
+                for start in range(0, len(match_ids), 500):
+                    sync(cur, match_ids[start:start + 500])
+            report["repaired"] = len(match_ids)
+
+    return report
@@ -0,0 +1,306 @@
+"""
+Daily rollups of match activity.
+
+"Last N days" statistics read these tables instead of scanning `matches`:
+
+- user_daily_stats  (user_id, day): matches, played (has a result), won,
+  friendly, tournament
+- court_daily_stats (court_id, day): bookings, booked_minutes
+
+A day is the UTC date of start_time, the same as the stored DATETIMEs. A range
+query is one primary-key range scan of O(days) rows per user or court.
+
+Both tables are derived from matches UNION ALL matches_archive. Moving a match
+into the archive therefore changes nothing, and archive_matches doesn't touch
+the rollups.
+
+Maintenance: rather than adding deltas, every write path recomputes the
+(user, day) and (court, day) rows it affects from the source rows, in the
+same transaction. Then a retried or partially applied write can't drift the
+counters. A recompute reads one day of one user / court through
+idx_matches_p1_start / idx_matches_p2_start / idx_matches_court_time.
+
+    sync(cur, match_ids)                      # after insert / join / result
+    before = match_keys(cur, match_ids)       # before a change that can move or drop keys
+    ...UPDATE / DELETE...
+    sync(cur, match_ids, also=before)         # (reschedule, cancel, player2 leaving)
+
+Call sites: book_match / waitlist (insert_match), join_slot, cancel_match,
+matchmaking, start_tournament, reschedule_tournament, report_match_result.
+`python manage.py backfill_rollups` rebuilds a date range in chunks of days,
+one transaction per chunk (initial load, bulk imports, repairs).
+"""
+import logging
+import time
+from datetime import datetime, time as dt_time, timedelta, timezone
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.http import JsonResponse
+
+logger = logging.getLogger(__name__)
+
+SOURCES = ("matches", "matches_archive")
+
+# longest range the stats endpoints accept
+MAX_RANGE_DAYS = 731
+
+USER_COLUMNS = ("matches", "played", "won", "friendly", "tournament")
+COURT_COLUMNS = ("bookings", "booked_minutes")
+
+
+class Keys:
+    """(user_id, day) and (court_id, day) rollup rows touched by a write."""
+
+    __slots__ = ("users", "courts")
+
+    def __init__(self):
+        self.users = set()
+        self.courts = set()
+
+    def add(self, court_id, player_ids, start_time):
+        day = _day(start_time)
+        self.courts.add((court_id, day))
+        for player_id in player_ids:
+            if player_id is not None:
+                self.users.add((player_id, day))
+
+    def update(self, other):
+        if other is not None:
+            self.users |= other.users
+            self.courts |= other.courts
+        return self
+
+
+def _day(dt):
+    if isinstance(dt, str):
+        dt = datetime.fromisoformat(dt)
+    if isinstance(dt, datetime):
+        if dt.tzinfo is not None:
+            dt = dt.astimezone(timezone.utc)
+        return dt.date()
+    return dt
+
+
+def _bounds(first_day, last_day):
+    """[lo, hi) as naive UTC datetimes covering first_day .. last_day."""
+    return datetime.combine(first_day, dt_time.min), datetime.combine(last_day + timedelta(days=1), dt_time.min)
+
+
+def today():
+    return datetime.now(timezone.utc).date()
+
+
+# ---------- aggregates ----------
+
+def _in(ids):
+    return ",".join(["%s"] * len(ids))
+
+
+def _user_aggregate(lo, hi, user_ids=None):
+    """INSERT ... SELECT of the user rows for start_time in [lo, hi), optionally only user_ids."""
+    branches, params = [], []
+    for table in SOURCES:
+        for column in ("player1_id", "player2_id"):
+            where = f"{column} IN ({_in(user_ids)})" if user_ids else f"{column} IS NOT NULL"
+            branches.append(
+                f"SELECT {column} AS user_id, start_time, winner_id, tournament_id FROM {table} "
+                f"WHERE start_time >= %s AND start_time < %s AND {where}"
+            )
+            params += [lo, hi, *(user_ids or ())]
+    sql = f"""
+        INSERT INTO user_daily_stats (user_id, day, {", ".join(USER_COLUMNS)})
+        SELECT user_id, DATE(start_time), COUNT(*),
+               SUM(CASE WHEN winner_id IS NOT NULL THEN 1 ELSE 0 END),
+               SUM(CASE WHEN winner_id = user_id THEN 1 ELSE 0 END),
+               SUM(CASE WHEN tournament_id IS NULL THEN 1 ELSE 0 END),
+               SUM(CASE WHEN tournament_id IS NOT NULL THEN 1 ELSE 0 END)
+        FROM ({" UNION ALL ".join(branches)}) x
+        GROUP BY user_id, DATE(start_time)
+    """
+    return sql, params
+
+
+def _court_aggregate(lo, hi, court_ids=None):
+    branches, params = [], []
+    for table in SOURCES:
+        where = f" AND court_id IN ({_in(court_ids)})" if court_ids else ""
+        branches.append(
+            f"SELECT court_id, start_time, end_time FROM {table} WHERE start_time >= %s AND start_time < %s{where}"
+        )
+        params += [lo, hi, *(court_ids or ())]
+    sql = f"""
+        INSERT INTO court_daily_stats (court_id, day, {", ".join(COURT_COLUMNS)})
+        SELECT court_id, DATE(start_time), COUNT(*), SUM(TIMESTAMPDIFF(MINUTE, start_time, end_time))
+        FROM ({" UNION ALL ".join(branches)}) x
+        GROUP BY court_id, DATE(start_time)
+    """
+    return sql, params
+
+
+# ---------- incremental maintenance ----------
+
+def match_keys(cur, match_ids):
+    """Keys of these matches as they are now (deleted ones contribute nothing)."""
+    keys = Keys()
+    ids = [int(i) for i in match_ids if i is not None]
+    if not ids:
+        return keys
+    cur.execute(
+        f"SELECT court_id, player1_id, player2_id, start_time FROM matches WHERE match_id IN ({_in(ids)})",
+        ids
+    )
+    for court_id, p1, p2, start_time in cur.fetchall():
+        keys.add(court_id, (p1, p2), start_time)
+    return keys
+
+
+def refresh(cur, keys):
+    """Recompute the given rollup rows from the source tables. One DELETE + INSERT per table per day."""
+    by_day = {}
+    for user_id, day in keys.users:
+        by_day.setdefault(day, (set(), set()))[0].add(user_id)
+    for court_id, day in keys.courts:
+        by_day.setdefault(day, (set(), set()))[1].add(court_id)
+
+    for day, (user_ids, court_ids) in sorted(by_day.items()):
+        lo, hi = _bounds(day, day)
+        if user_ids:
+            user_ids = sorted(user_ids)
+            cur.execute(f"DELETE FROM user_daily_stats WHERE day=%s AND user_id IN ({_in(user_ids)})",
+                        [day, *user_ids])
+            cur.execute(*_user_aggregate(lo, hi, user_ids))
+        if court_ids:
+            court_ids = sorted(court_ids)
+            cur.execute(f"DELETE FROM court_daily_stats WHERE day=%s AND court_id IN ({_in(court_ids)})",
+                        [day, *court_ids])
+            cur.execute(*_court_aggregate(lo, hi, court_ids))
+
+
+def sync(cur, match_ids, also=None):
+    """Refresh the rollup rows of these matches, plus `also` (keys captured before the write)."""
+    refresh(cur, match_keys(cur, match_ids).update(also))
+
+
+# ---------- backfill ----------
+
+def source_range(cur):
+    """(first_day, last_day) over matches and matches_archive, or None if both are empty."""
+    firsts, lasts = [], []
+    for table in SOURCES:
+        cur.execute(f"SELECT MIN(start_time), MAX(start_time) FROM {table}")
+        first, last = cur.fetchone()
+        if first is not None:
+            firsts.append(_day(first))
+            lasts.append(_day(last))
+    return (min(firsts), max(lasts)) if firsts else None
+
+
+def backfill_chunk(first_day, last_day):
+    """Rebuild both tables for first_day .. last_day in one transaction. Returns (user rows, court rows)."""
+    lo, hi = _bounds(first_day, last_day)
+    with transaction.atomic(), connection.cursor() as cur:
+        cur.execute("DELETE FROM user_daily_stats WHERE day >= %s AND day <= %s", [first_day, last_day])
+        cur.execute(*_user_aggregate(lo, hi))
+        user_rows = cur.rowcount
+        cur.execute("DELETE FROM court_daily_stats WHERE day >= %s AND day <= %s", [first_day, last_day])
+        cur.execute(*_court_aggregate(lo, hi))
+        court_rows = cur.rowcount
+    return user_rows, court_rows
+
+
+def backfill(first_day=None, last_day=None, chunk_days=None, pause_seconds=0.0):
+    """
+    Rebuild the rollups for first_day .. last_day (default: everything in the source tables),
+    chunk_days per transaction. Returns a report dict.
+    """
+    started = time.perf_counter()
+    chunk_days = max(1, chunk_days or getattr(settings, "ROLLUP_BACKFILL_CHUNK_DAYS", 7))
+
+    if first_day is None or last_day is None:
+        with connection.cursor() as cur:
+            found = source_range(cur)
+        if found is None:
+            return {"from": None, "to": None, "chunks": 0, "user_rows": 0, "court_rows": 0,
+                    "seconds": round(time.perf_counter() - started, 3)}
+        first_day = first_day or found[0]
+        last_day = last_day or found[1]
+
+    report = {"from": first_day.isoformat(), "to": last_day.isoformat(), "chunks": 0, "user_rows": 0, "court_rows": 0}
+    day = first_day
+    while day <= last_day:
+        chunk_end = min(day + timedelta(days=chunk_days - 1), last_day)
+        user_rows, court_rows = backfill_chunk(day, chunk_end)
+        report["chunks"] += 1
+        report["user_rows"] += user_rows
+        report["court_rows"] += court_rows
+        day = chunk_end + timedelta(days=1)
+        if pause_seconds and day <= last_day:
+            time.sleep(pause_seconds)
+
+    report["seconds"] = round(time.perf_counter() - started, 3)
+    logger.info(
+        "rollup backfill %s..%s: %d chunks, %d user rows, %d court rows, %.2fs",
+        report["from"], report["to"], report["chunks"], report["user_rows"], report["court_rows"], report["seconds"]
+    )
+    return report
+
+
+# ---------- reads ----------
+
+def date_range(params, default_days=30):
+    """
+    ((first_day, last_day), error_response) from ?from=YYYY-MM-DD&to=YYYY-MM-DD
+    or ?days=N (the last N days up to today, UTC). Inclusive, at most MAX_RANGE_DAYS.
+    """
+    if params.get("from") or params.get("to"):
+        try:
+            first_day = datetime.strptime(params.get("from") or "", "%Y-%m-%d").date()
+            last_day = datetime.strptime(params.get("to") or "", "%Y-%m-%d").date()
+        except ValueError:
+            return None, JsonResponse({"error": "from and to must both be YYYY-MM-DD"}, status=400)
+        if last_day < first_day:
+            return None, JsonResponse({"error": "to must not be before from"}, status=400)
+    else:
+        try:
+            days = int(params.get("days") or default_days)
+        except ValueError:
+            return None, JsonResponse({"error": "days must be an integer"}, status=400)
+        if days < 1:
+            return None, JsonResponse({"error": "days must be at least 1"}, status=400)
+        last_day = today()
+        first_day = last_day - timedelta(days=min(days, MAX_RANGE_DAYS) - 1)
+
+    if (last_day - first_day).days + 1 > MAX_RANGE_DAYS:
+        return None, JsonResponse({"error": f"Range too large (max {MAX_RANGE_DAYS} days)"}, status=400)
+    return (first_day, last_day), None
+
+
+def user_days(cur, user_id, first_day, last_day):
+    """[(day, matches, played, won, friendly, tournament)] with activity, oldest first."""
+    cur.execute(
+        f"""
+        SELECT day, {", ".join(USER_COLUMNS)} FROM user_daily_stats
+        WHERE user_id=%s AND day >= %s AND day <= %s
+        ORDER BY day
+        """,
+        [user_id, first_day, last_day]
+    )
+    return cur.fetchall()
+
+
+def court_days(cur, first_day, last_day, court_id=None):
+    """[(court_id, day, bookings, booked_minutes)] with activity, by court then day."""
+    where, params = "day >= %s AND day <= %s", [first_day, last_day]
+    if court_id is not None:
+        where = "court_id=%s AND " + where
+        params.insert(0, court_id)
+    cur.execute(
+        f"""
+        SELECT court_id, day, {", ".join(COURT_COLUMNS)} FROM court_daily_stats
+        WHERE {where}
+        ORDER BY court_id, day
+        """,
+        params
+    )
+    return cur.fetchall()
@@ -1,3 +1,324 @@
-from django.test import TestCase
+import json
+from datetime import datetime, timedelta
+from unittest import skipUnless
 
-# Create your tests here.
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+
+from badmintonbuddy.sql_registry import QUERIES
+from matches import analytics, player_matches, rollups
+from matches.matchmaking import Entry, pair_players, schedule
+from matches.views import _parse_booking
+
+
+# Hot queries from matches/views.py, users/views.py and tournaments/views.py.
+# Named queries come from the SQL registry (db/sql); keep the inline ones in sync with the views.
+T0 = datetime(2026, 1, 10, 10, 0)
+T1 = T0 + timedelta(hours=1)
+
+HOT_QUERIES = {
+    "book_match.court_conflict": (
+        "SELECT COUNT(*) FROM matches WHERE court_id=%s AND NOT (end_time <= %s OR start_time >= %s)",
+        [3, T0, T1],
+    ),
+    "book_match.player_conflict": (
+        "SELECT 1 FROM player_matches WHERE user_id=%s AND start_time > %s AND start_time < %s AND end_time > %s LIMIT 1",
+        [7, T0 - timedelta(minutes=player_matches.MAX_MATCH_MINUTES), T1, T0],
+    ),
+    "match_history": QUERIES.bind("match_history", user_id=7, limit=50),
+    "matches_by_day": (
+        """
+        SELECT m.match_id
+        FROM matches m
+        WHERE m.start_time >= %s AND m.start_time < %s
+        ORDER BY m.court_id ASC, m.start_time ASC
+        """,
+        [T0, T0 + timedelta(days=1)],
+    ),
+    "matches_by_day.court": (
+        """
+        SELECT m.match_id
+        FROM matches m
+        WHERE m.start_time >= %s AND m.start_time < %s AND m.court_id = %s
+        ORDER BY m.court_id ASC, m.start_time ASC
+        """,
+        [T0, T0 + timedelta(days=1), 3],
+    ),
+    "open_slots": (
+        """
+        SELECT m.match_id
+        FROM matches m
+        WHERE m.player2_id IS NULL
+          AND NOT (m.end_time <= %s OR m.start_time >= %s)
+        ORDER BY m.start_time ASC
+        LIMIT 50
+        """,
+        [T0, T1],
+    ),
+    "find_partners.not_exists": QUERIES.bind(
+        "partner_matching",
+        current_user_id=7, current_user_skill=5, max_skill_diff=2,
+        requested_start=T0, requested_end=T1, limit=5,
+        earliest_start=T0 - timedelta(minutes=player_matches.MAX_MATCH_MINUTES),
+    ),
+    "tournament_matches": (
+        "SELECT match_id FROM matches WHERE tournament_id=%s ORDER BY round ASC, match_id ASC",
+        [1],
+    ),
+    "tournament_leaderboard": QUERIES.bind("tournament_leaderboard", tournament_id=1),
+    # per-write recompute of one day's rollup rows (matches/rollups.py)
+    "rollups.user_day": rollups._user_aggregate(T0, T0 + timedelta(days=1), [7, 8]),
+    "rollups.court_day": rollups._court_aggregate(T0, T0 + timedelta(days=1), [3]),
+}
+
+INDEXED_TABLES = ("m", "lm", "matches", "pm", "player_matches")
+
+
+@skipUnless(connection.vendor == "mysql", "EXPLAIN checks target MySQL")
+class HotQueryPlanTests(TestCase):
+    """
+    Fails if any hot query regresses to a full scan (type=ALL) of `matches` or `player_matches`.
+    Needs enough rows that the optimizer prefers an index over a scan.
+    """
+
+    USERS = 300
+    COURTS = 10
+    MATCHES = 6000
+
+    @classmethod
+    def setUpTestData(cls):
+        with connection.cursor() as cur:
+            cur.executemany(
+                "INSERT INTO users (user_id, name, email, password, role, skill_rating) VALUES (%s,%s,%s,'x','player',%s)",
+                [(i, f"u{i}", f"u{i}@test.local", i % 10) for i in range(1, cls.USERS + 1)]
+            )
+            cur.executemany(
+                "INSERT INTO courts (court_id, name) VALUES (%s,%s)",
+                [(i, f"Court {i}") for i in range(1, cls.COURTS + 1)]
+            )
+            cur.execute(
+                "INSERT INTO tournaments (tournament_id, name, created_by, max_players, status) "
+                "VALUES (1, 'Open', 1, 16, 'ongoing')"
+            )
+
+            rows = []
+            for i in range(cls.MATCHES):
+                start = T0 + timedelta(hours=i // cls.COURTS)
+                p1 = 1 + (i * 7) % cls.USERS
+                p2 = None if i % 9 == 0 else 1 + (i * 13 + 1) % cls.USERS
+                if p2 == p1:
+                    p2 = None
+                rows.append((
+                    1 + i % cls.COURTS, p1, p2, start, start + timedelta(hours=1),
+                    1 if i % 50 == 0 else None, 1 if i % 50 == 0 else None,
+                ))
+            cur.executemany(
+                "INSERT INTO matches (court_id, player1_id, player2_id, start_time, end_time, tournament_id, round) "
+                "VALUES (%s,%s,%s,%s,%s,%s,%s)",
+                rows
+            )
+            player_matches.backfill(cur)
+            cur.executemany(
+                "INSERT INTO tournament_participants (tournament_id, user_id) VALUES (1, %s)",
+                [(i,) for i in range(1, 33)]
+            )
+
+    def _explain(self, sql, params):
+        with connection.cursor() as cur:
+            cur.execute("EXPLAIN " + sql, params)
+            cols = [c[0].lower() for c in cur.description]
+            return [dict(zip(cols, r)) for r in cur.fetchall()]
+
+    def test_hot_queries_use_an_index_on_matches(self):
+        for name, (sql, params) in HOT_QUERIES.items():
+            with self.subTest(query=name):
+                plan = self._explain(sql, params)
+                match_rows = [p for p in plan if p.get("table") in INDEXED_TABLES]
+                self.assertTrue(match_rows, f"{name}: matches / player_matches not in plan {plan}")
+                for p in match_rows:
+                    self.assertNotEqual(
+                        (p.get("type") or "").upper(), "ALL",
+                        f"{name}: full scan on matches: {p}"
+                    )
+                    self.assertIsNotNone(p.get("key"), f"{name}: no index used: {p}")
+
+
+def _entry(queue_id, user_id, skill, start, end, duration=60, tolerance=1):
+    return Entry(queue_id, user_id, skill, tolerance, start, end, duration)
+
+
+class PairPlayersTests(SimpleTestCase):
+    def test_pairs_closest_skill_first(self):
+        entries = [_entry(1, 11, 5, 0, 240), _entry(2, 12, 6, 0, 240), _entry(3, 13, 5, 0, 240)]
+        pairs = pair_players(entries)
+        self.assertEqual([(a.queue_id, b.queue_id) for a, b in pairs], [(1, 3)])
+
+    def test_respects_tolerance_of_both_players(self):
+        entries = [_entry(1, 11, 5, 0, 240, tolerance=2), _entry(2, 12, 7, 0, 240, tolerance=1)]
+        self.assertEqual(pair_players(entries), [])
+
+    def test_needs_a_long_enough_common_window(self):
+        entries = [_entry(1, 11, 5, 0, 90), _entry(2, 12, 5, 45, 240)]
+        self.assertEqual(pair_players(entries), [])
+        entries = [_entry(1, 11, 5, 0, 120), _entry(2, 12, 5, 60, 240)]
+        self.assertEqual(len(pair_players(entries)), 1)
+
+    def test_never_pairs_a_user_with_themselves(self):
+        entries = [_entry(1, 11, 5, 0, 240), _entry(2, 11, 5, 0, 240)]
+        self.assertEqual(pair_players(entries), [])
+
+    def test_each_entry_used_once(self):
+        entries = [_entry(i, 100 + i, 5, 0, 240) for i in range(1, 6)]
+        pairs = pair_players(entries)
+        used = [e.queue_id for pair in pairs for e in pair]
+        self.assertEqual(len(pairs), 2)
+        self.assertEqual(len(used), len(set(used)))
+
+
+class ScheduleTests(SimpleTestCase):
+    # times are minutes since midnight, as in run_batch()
+    def test_start_is_aligned_to_the_wall_clock(self):
+        pair = (_entry(1, 11, 5, 18 * 60 + 7, 21 * 60), _entry(2, 12, 5, 18 * 60, 21 * 60))
+        bookings, unscheduled = schedule([pair], {1: []}, {}, slot=15)
+        self.assertEqual(unscheduled, [])
+        self.assertEqual(bookings[0].start, 18 * 60 + 15)
+        self.assertEqual(bookings[0].start % 15, 0)
+
+    def test_window_on_a_slot_boundary_starts_on_it(self):
+        pair = (_entry(1, 11, 5, 18 * 60, 21 * 60), _entry(2, 12, 5, 18 * 60, 21 * 60))
+        bookings, _ = schedule([pair], {1: []}, {}, slot=15)
+        self.assertEqual((bookings[0].start, bookings[0].end), (18 * 60, 19 * 60))
+
+    def test_skips_busy_court_and_players(self):
+        pair = (_entry(1, 11, 5, 600, 900), _entry(2, 12, 5, 600, 900))
+        court_busy = {1: [(600, 660)], 2: [(600, 720)]}
+        player_busy = {12: [(660, 700)]}
+        bookings, _ = schedule([pair], court_busy, player_busy, slot=15)
+        self.assertEqual((bookings[0].court_id, bookings[0].start), (1, 705))
+
+    def test_later_pairs_see_earlier_bookings(self):
+        pairs = [
+            (_entry(1, 11, 5, 600, 720), _entry(2, 12, 5, 600, 720)),
+            (_entry(3, 13, 5, 600, 720), _entry(4, 14, 5, 600, 720)),
+        ]
+        bookings, unscheduled = schedule(pairs, {1: []}, {}, slot=15)
+        self.assertEqual(sorted(b.start for b in bookings), [600, 660])
+        self.assertEqual(unscheduled, [])
+
+    def test_unscheduled_when_nothing_fits(self):
+        pair = (_entry(1, 11, 5, 600, 660), _entry(2, 12, 5, 600, 660))
+        bookings, unscheduled = schedule([pair], {1: [(630, 700)]}, {}, slot=15)
+        self.assertEqual(bookings, [])
+        self.assertEqual(unscheduled, [pair])
+
+
+class ParseBookingTests(SimpleTestCase):
+    BODY = {"court_id": "3", "start_time": "2026-01-10T10:00:00", "end_time": "2026-01-10T11:00:00"}
+
+    def _error(self, user_id=7, **changes):
+        parsed, err = _parse_booking({**self.BODY, **changes}, user_id)
+        self.assertIsNone(parsed)
+        self.assertEqual(err.status_code, 400)
+        return json.loads(err.content)["error"]
+
+    def test_valid_body(self):
+        parsed, err = _parse_booking({**self.BODY, "opponent_id": "9"}, 7)
+        self.assertIsNone(err)
+        self.assertEqual(parsed, (3, 9, T0, T1))
+
+    def test_blank_or_non_positive_opponent_means_none(self):
+        for opponent_id in ("", None, 0, "-2"):
+            parsed, _ = _parse_booking({**self.BODY, "opponent_id": opponent_id}, 7)
+            self.assertIsNone(parsed[1])
+
+    def test_rejected_bodies(self):
+        self.assertEqual(self._error(court_id=None), "court_id, start_time, end_time required")
+        self.assertEqual(self._error(court_id="one"), "court_id must be an integer")
+        self.assertEqual(self._error(start_time="tomorrow"), "Invalid datetime format")
+        self.assertEqual(self._error(opponent_id="x"), "opponent_id must be an integer")
+        self.assertEqual(self._error(opponent_id="7"), "opponent_id cannot be same as user")
+        self.assertEqual(self._error(end_time="2026-01-10T10:00:00"), "end_time must be after start_time")
+
+    def test_booking_longer_than_max_match_minutes(self):
+        too_long = T0 + timedelta(minutes=player_matches.MAX_MATCH_MINUTES + 1)
+        self.assertIn("at most", self._error(end_time=too_long.isoformat()))
+        exact = T0 + timedelta(minutes=player_matches.MAX_MATCH_MINUTES)
+        _, err = _parse_booking({**self.BODY, "end_time": exact.isoformat()}, 7)
+        self.assertIsNone(err)
+
+
+@skipUnless(analytics.available(), "numpy is not installed")
+class OccupancyMatrixTests(SimpleTestCase):
+    # 2026-01-05 is a Monday
+    MONDAY = datetime(2026, 1, 5)
+
+    def _matrix(self, bookings, n_courts=1, days=1, first_weekday=0):
+        import numpy as np
+
+        court_idx, starts, ends = zip(*bookings) if bookings else ((), (), ())
+        return analytics.occupancy_matrix(
+            np.asarray(court_idx, dtype=np.int64), np.asarray(starts, dtype=np.int64),
+            np.asarray(ends, dtype=np.int64), n_courts, days, first_weekday,
+        )
+
+    def test_overlapping_bookings_count_each_minute_once(self):
+        matrix, _ = self._matrix([(0, 60, 120), (0, 90, 150)])
+        self.assertEqual(matrix[0, 0, 1], 60)
+        self.assertEqual(matrix[0, 0, 2], 30)
+        self.assertEqual(matrix.sum(), 90)
+
+    def test_courts_are_counted_separately(self):
+        matrix, _ = self._matrix([(0, 60, 120), (1, 60, 120)], n_courts=2)
+        self.assertEqual(matrix[0, 0, 1], 60)
+        self.assertEqual(matrix[1, 0, 1], 60)
+
+    def test_empty_bookings_are_ignored(self):
+        matrix, _ = self._matrix([(0, 60, 60), (0, 90, 80)])
+        self.assertEqual(matrix.sum(), 0)
+
+    def test_bookings_are_clipped_to_the_range(self):
+        rows = [
+            (4, self.MONDAY - timedelta(minutes=30), self.MONDAY + timedelta(minutes=30)),
+            (4, self.MONDAY + timedelta(hours=23, minutes=30), self.MONDAY + timedelta(days=1, minutes=30)),
+        ]
+        court_ids, starts, ends = analytics.to_minutes(rows, self.MONDAY, analytics.MINUTES_PER_DAY)
+        self.assertEqual(court_ids.tolist(), [4, 4])
+        self.assertEqual(starts.tolist(), [0, 23 * 60 + 30])
+        self.assertEqual(ends.tolist(), [30, analytics.MINUTES_PER_DAY])
+
+        matrix, _ = self._matrix(list(zip([0, 0], starts, ends)))
+        self.assertEqual(matrix[0, 0, 0], 30)
+        self.assertEqual(matrix[0, 0, 23], 30)
+        self.assertEqual(matrix.sum(), 60)
+
+    def test_days_fold_into_weekday_and_hour(self):
+        day = analytics.MINUTES_PER_DAY
+        # eight days starting on a Sunday: Sunday appears twice
+        matrix, per_weekday = self._matrix(
+            [(0, 10 * 60, 11 * 60), (0, 7 * day + 10 * 60, 7 * day + 10 * 60 + 15), (0, day + 18 * 60, day + 19 * 60)],
+            days=8, first_weekday=6,
+        )
+        self.assertEqual(per_weekday.tolist(), [1, 1, 1, 1, 1, 1, 2])
+        self.assertEqual(matrix[0, 6, 10], 75)
+        self.assertEqual(matrix[0, 0, 18], 60)
+        self.assertEqual(matrix.sum(), 135)
+
+    def test_idle_threshold(self):
+        import numpy as np
+
+        all_courts = np.zeros((7, 24))
+        all_courts[0, 9] = 0.5
+        all_courts[0, 12] = 0.06
+        all_courts[0, 17] = 0.05
+        per_weekday = np.asarray([1, 0, 0, 0, 0, 0, 1])
+
+        idle, suggested = analytics.idle_hours(all_courts, per_weekday, 0.05)
+        self.assertEqual(set(idle), {"Mon", "Sun"})
+        self.assertNotIn(9, idle["Mon"])
+        self.assertNotIn(12, idle["Mon"])
+        self.assertIn(17, idle["Mon"])
+        self.assertEqual(suggested["Mon"], {"open": 9, "close": 13})
+        self.assertIsNone(suggested["Sun"])
+
+        _, suggested = analytics.idle_hours(all_courts, per_weekday, 0.04)
+        self.assertEqual(suggested["Mon"], {"open": 9, "close": 18})
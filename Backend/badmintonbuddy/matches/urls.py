@@ -5,13 +5,29 @@ urlpatterns = [
     path("partners/", views.find_partners, name="find_partners"),
     path("book/", views.book_match, name="book_match"),
     path("history/", views.match_history, name="match_history"),
+    path("history/export/", views.export_history, name="export_history"),
 
     # open-slot feature 
     path("open/", views.open_slots, name="open_slots"),
     path("<int:match_id>/join/", views.join_slot, name="join_slot"),
+    path("<int:match_id>/cancel/", views.cancel_match, name="cancel_match"),
+
+    # waitlist for busy slots (auto-booked on cancellation)
+    path("waitlist/", views.my_waitlist, name="my_waitlist"),
+    path("waitlist/join/", views.join_waitlist, name="join_waitlist"),
+    path("waitlist/<int:waitlist_id>/leave/", views.leave_waitlist, name="leave_waitlist"),
+
+    # matchmaking queue (paired + booked by `manage.py run_matchmaker`)
+    path("matchmaking/", views.my_matchmaking, name="my_matchmaking"),
+    path("matchmaking/join/", views.join_matchmaking, name="join_matchmaking"),
+    path("matchmaking/<int:queue_id>/leave/", views.leave_matchmaking, name="leave_matchmaking"),
 
     # ✅ calendar agenda
     path("by-day/", views.matches_by_day, name="matches_by_day"),
+
+    # venue analytics (admin)
+    path("utilization/", views.court_utilization, name="court_utilization"),
+    path("courts/usage/", views.court_usage, name="court_usage"),
 ]
 
 
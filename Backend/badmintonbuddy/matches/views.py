@@ -1,10 +1,62 @@
+import csv
 import json
-from django.http import JsonResponse
+from datetime import timedelta
+from django.http import JsonResponse, StreamingHttpResponse
 from django.views.decorators.http import require_GET
 from django.views.decorators.csrf import csrf_exempt
-from django.db import connection
+from django.db import connection, transaction
 from django.utils.dateparse import parse_datetime
 
+from badmintonbuddy.serializers import RowMapper, json_response
+from badmintonbuddy.db_routing import current_read_alias, read_only, reader, streaming_cursor
+from badmintonbuddy.admission import admission_control, bounded_int, streaming
+from badmintonbuddy.auth import db_role, require_admin
+from badmintonbuddy.idempotency import idempotent
+from badmintonbuddy.sql_registry import QUERIES
+
+from . import player_matches, rollups, waitlist
+
+
+PARTNER_ROW = RowMapper("user_id", "name", "email", "skill_rating")
+
+HISTORY_ROW = RowMapper(
+    "match_id", "court_id", "player1_id", "player1_name", "player2_id", "player2_name",
+    "start_time", "end_time", "tournament_id", "round", "winner_id", "score",
+)
+
+DAY_ROW = RowMapper(
+    "match_id", "court_id", "start_time", "end_time", "player1_id", "player1_name",
+    "player2_id", "player2_name", "tournament_id", "tournament_name", "round", "winner_id", "score",
+    extra={
+        "type": lambda d: "tournament" if d["tournament_id"] is not None else "friendly",
+        "open_slot": lambda d: d["player2_id"] is None,
+    },
+)
+
+OPEN_SLOT_ROW = RowMapper("match_id", "court_id", "host_user_id", "host_name", "start_time", "end_time")
+
+WAITLIST_ROW = RowMapper(
+    "waitlist_id", "court_id", "opponent_id", "start_time", "end_time", "status", "match_id", "created_at",
+)
+
+MATCHMAKING_ROW = RowMapper(
+    "queue_id", "window_start", "window_end", "duration_minutes", "skill_tolerance", "status", "match_id",
+    "created_at", "matched_at",
+)
+
+HISTORY_LIMIT = 50
+HISTORY_EXPORT_MAX_ROWS = 100000
+
+MATCHMAKING_DURATIONS = (30, 180)   # minutes
+MATCHMAKING_MAX_TOLERANCE = 10
+MATCHMAKING_MAX_WINDOW_DAYS = 14
+
+CONFLICT_ERRORS = {
+    "court": "Court not available in that slot",
+    "user": "You already have a match in that slot",
+    "opponent": "Opponent not available in that slot",
+}
+
 
 def _current_user_id(request):
     return request.session.get("user_id")
@@ -18,6 +70,8 @@ def _get_json(request):
 
 
 @require_GET
+@admission_control("partners")
+@read_only
 def find_partners(request):
     user_id = _current_user_id(request)
     if not user_id:
@@ -33,71 +87,59 @@ def find_partners(request):
     if not start_dt or not end_dt:
         return JsonResponse({"error": "Invalid datetime format. Use 2025-12-28T17:00:00"}, status=400)
 
-    max_skill_diff = int(request.GET.get("max_skill_diff", 2))
-    limit = int(request.GET.get("limit", 5))
+    # bounded so a client can't ask for the whole users table
+    max_skill_diff, err = bounded_int(request.GET, "max_skill_diff", 2, 0, 10)
+    if err:
+        return err
+    limit, err = bounded_int(request.GET, "limit", 5, 1, 50)
+    if err:
+        return err
 
-    with connection.cursor() as cur:
+    with reader().cursor() as cur:
         cur.execute("SELECT skill_rating FROM users WHERE user_id=%s", [user_id])
         row = cur.fetchone()
         if not row:
             return JsonResponse({"error": "User not found"}, status=404)
         my_skill = row[0]
 
-    query = """
-        SELECT u.user_id, u.name, u.email, u.skill_rating
-        FROM users u
-        WHERE u.user_id <> %s
-          AND u.role = 'player'
-          AND ABS(u.skill_rating - %s) <= %s
-          AND NOT EXISTS (
-              SELECT 1
-              FROM matches m
-              WHERE (m.player1_id = u.user_id OR m.player2_id = u.user_id)
-                AND NOT (m.end_time <= %s OR m.start_time >= %s)
-          )
-        ORDER BY ABS(u.skill_rating - %s) ASC
-        LIMIT %s
-    """
-
-    partners = []
-    with connection.cursor() as cur:
-        cur.execute(query, [user_id, my_skill, max_skill_diff, start_dt, end_dt, my_skill, limit])
-        for pid, name, email, skill in cur.fetchall():
-            partners.append({"user_id": pid, "name": name, "email": email, "skill_rating": skill})
+    with reader().cursor() as cur:
+        QUERIES.execute(
+            cur, "partner_matching",
+            current_user_id=user_id, current_user_skill=my_skill, max_skill_diff=max_skill_diff,
+            requested_start=start_dt, requested_end=end_dt, limit=limit,
+            earliest_start=start_dt - timedelta(minutes=player_matches.MAX_MATCH_MINUTES),
+        )
+        partners = PARTNER_ROW.map(cur.fetchall())
 
-    return JsonResponse({
+    return json_response({
         "me": {"user_id": int(user_id), "skill_rating": my_skill},
         "desired": {"start_time": start_s, "end_time": end_s},
         "available_partners": partners
     })
 
 
-@csrf_exempt
-def book_match(request):
+def _parse_booking(data, user_id):
     """
-    POST /api/matches/book/
-    opponent_id OPTIONAL (open slot booking)
+    Shared body parsing for book_match / join_waitlist.
+    Returns ((court_id, opponent_id, start_dt, end_dt), error_response).
     """
-    if request.method != "POST":
-        return JsonResponse({"error": "POST required"}, status=405)
-
-    user_id = _current_user_id(request)
-    if not user_id:
-        return JsonResponse({"error": "Not logged in"}, status=401)
-
-    data = _get_json(request)
     court_id = data.get("court_id")
     opponent_id = data.get("opponent_id")  # optional
     start_s = data.get("start_time")
     end_s = data.get("end_time")
 
     if not court_id or not start_s or not end_s:
-        return JsonResponse({"error": "court_id, start_time, end_time required"}, status=400)
+        return None, JsonResponse({"error": "court_id, start_time, end_time required"}, status=400)
+
+    try:
+        court_id = int(court_id)
+    except (TypeError, ValueError):
+        return None, JsonResponse({"error": "court_id must be an integer"}, status=400)
 
     start_dt = parse_datetime(start_s)
     end_dt = parse_datetime(end_s)
     if not start_dt or not end_dt:
-        return JsonResponse({"error": "Invalid datetime format"}, status=400)
+        return None, JsonResponse({"error": "Invalid datetime format"}, status=400)
 
     # normalize opponent_id
     if opponent_id in ("", None):
@@ -108,45 +150,50 @@ def book_match(request):
             if opponent_id <= 0:
                 opponent_id = None
         except Exception:
-            return JsonResponse({"error": "opponent_id must be an integer"}, status=400)
+            return None, JsonResponse({"error": "opponent_id must be an integer"}, status=400)
 
     if opponent_id is not None and int(opponent_id) == int(user_id):
-        return JsonResponse({"error": "opponent_id cannot be same as user"}, status=400)
+        return None, JsonResponse({"error": "opponent_id cannot be same as user"}, status=400)
 
-    overlap = "NOT (end_time <= %s OR start_time >= %s)"
-
-    with connection.cursor() as cur:
-        # court conflict
-        cur.execute(
-            f"SELECT COUNT(*) FROM matches WHERE court_id=%s AND {overlap}",
-            [court_id, start_dt, end_dt]
+    if end_dt <= start_dt:
+        return None, JsonResponse({"error": "end_time must be after start_time"}, status=400)
+    if end_dt - start_dt > timedelta(minutes=player_matches.MAX_MATCH_MINUTES):
+        return None, JsonResponse(
+            {"error": f"A booking can be at most {player_matches.MAX_MATCH_MINUTES} minutes"}, status=400
         )
-        if cur.fetchone()[0] > 0:
-            return JsonResponse({"error": "Court not available in that slot"}, status=409)
 
-        # current user conflict
-        cur.execute(
-            f"SELECT COUNT(*) FROM matches WHERE (player1_id=%s OR player2_id=%s) AND {overlap}",
-            [user_id, user_id, start_dt, end_dt]
-        )
-        if cur.fetchone()[0] > 0:
-            return JsonResponse({"error": "You already have a match in that slot"}, status=409)
+    return (court_id, opponent_id, start_dt, end_dt), None
 
-        # opponent conflict (only if provided)
-        if opponent_id is not None:
-            cur.execute(
-                f"SELECT COUNT(*) FROM matches WHERE (player1_id=%s OR player2_id=%s) AND {overlap}",
-                [opponent_id, opponent_id, start_dt, end_dt]
-            )
-            if cur.fetchone()[0] > 0:
-                return JsonResponse({"error": "Opponent not available in that slot"}, status=409)
 
-        # insert
-        cur.execute(
-            "INSERT INTO matches (court_id, player1_id, player2_id, start_time, end_time) VALUES (%s,%s,%s,%s,%s)",
-            [court_id, user_id, opponent_id, start_dt, end_dt]
-        )
-        match_id = cur.lastrowid
+@csrf_exempt
+@idempotent("book_match")
+def book_match(request):
+    """
+    POST /api/matches/book/
+    opponent_id OPTIONAL (open slot booking)
+    """
+    if request.method != "POST":
+        return JsonResponse({"error": "POST required"}, status=405)
+
+    user_id = _current_user_id(request)
+    if not user_id:
+        return JsonResponse({"error": "Not logged in"}, status=401)
+
+    booking, err = _parse_booking(_get_json(request), user_id)
+    if err:
+        return err
+    court_id, opponent_id, start_dt, end_dt = booking
+
+    with transaction.atomic(), connection.cursor() as cur:
+        # court row lock: concurrent bookings / cancellations on this court run one at a time
+        if not waitlist.lock_court(cur, court_id):
+            return JsonResponse({"error": "Court not found"}, status=404)
+
+        conflict = waitlist.booking_conflict(cur, court_id, user_id, opponent_id, start_dt, end_dt)
+        if conflict:
+            return JsonResponse({"error": CONFLICT_ERRORS[conflict]}, status=409)
+
+        match_id = waitlist.insert_match(cur, court_id, user_id, opponent_id, start_dt, end_dt)
 
     return JsonResponse(
         {"message": "Match booked", "match_id": match_id, "open_slot": opponent_id is None},
@@ -155,59 +202,72 @@ def book_match(request):
 
 
 @require_GET
+@admission_control("history")
+@read_only
 def match_history(request):
     user_id = _current_user_id(request)
     if not user_id:
         return JsonResponse({"error": "Not logged in"}, status=401)
 
-    with connection.cursor() as cur:
-        cur.execute("""
-            SELECT
-                m.match_id,
-                m.court_id,
-                m.player1_id,
-                u1.name AS player1_name,
-                m.player2_id,
-                u2.name AS player2_name,
-                m.start_time,
-                m.end_time,
-                m.tournament_id,
-                m.round,
-                m.winner_id,
-                m.score
-            FROM matches m
-            JOIN users u1 ON u1.user_id = m.player1_id
-            LEFT JOIN users u2 ON u2.user_id = m.player2_id
-            WHERE m.player1_id=%s OR m.player2_id=%s
-            ORDER BY m.start_time DESC
-            LIMIT 50
-        """, [user_id, user_id])
-        rows = cur.fetchall()
-
-    return JsonResponse({
+    return json_response({
         "user_id": int(user_id),
-        "history": [
-            {
-                "match_id": r[0],
-                "court_id": r[1],
-                "player1_id": r[2],
-                "player1_name": r[3],
-                "player2_id": r[4],
-                "player2_name": r[5],
-                "start_time": str(r[6]),
-                "end_time": str(r[7]),
-                "tournament_id": r[8],
-                "round": r[9],
-                "winner_id": r[10],
-                "score": r[11],
-            }
-            for r in rows
-        ]
+        "history": _history(user_id),
     })
 
+
+def _history(user_id, limit=HISTORY_LIMIT):
+    """Live + archived matches of one player (matches/archive.py), newest first."""
+    with reader().cursor() as cur:
+        QUERIES.execute(cur, "match_history", user_id=user_id, limit=limit)
+        return HISTORY_ROW.map(cur.fetchall())
+
+
+class _Echo:
+    def write(self, value):
+        return value
+
+
+@require_GET
+@admission_control("history", slot=False)
+@read_only
+def export_history(request):
+    """
+    GET /api/matches/history/export/
+    Full match history (live + archive) as CSV, streamed in batches.
+
+    The body is produced after the view (and @read_only) returned, so the
+    generator opens its own cursor on the alias chosen here, and the
+    admission slot is held until the response is closed. On MySQL the
+    cursor is server-side: rows come off the wire 500 at a time.
+    """
+    user_id = _current_user_id(request)
+    if not user_id:
+        return JsonResponse({"error": "Not logged in"}, status=401)
+
+    alias = current_read_alias()
+
+    def rows():
+        writer = csv.writer(_Echo())
+        yield writer.writerow(HISTORY_ROW.columns)
+        with streaming_cursor(alias) as cur:
+            QUERIES.execute(cur, "match_history", user_id=user_id, limit=HISTORY_EXPORT_MAX_ROWS)
+            while True:
+                batch = cur.fetchmany(500)
+                if not batch:
+                    break
+                for r in batch:
+                    yield writer.writerow([
+                        "" if v is None else v.isoformat() if hasattr(v, "isoformat") else v for v in r
+                    ])
+
+    res = StreamingHttpResponse(streaming("history", rows()), content_type="text/csv")
+    res["Content-Disposition"] = f'attachment; filename="match-history-{int(user_id)}.csv"'
+    return res
+
 from datetime import datetime, timedelta
 
 @require_GET
+@read_only
 def matches_by_day(request):
     """
     GET /api/matches/by-day/?date=YYYY-MM-DD
@@ -229,7 +289,7 @@ def matches_by_day(request):
     day_start = day
     day_end = day + timedelta(days=1)
 
-    with connection.cursor() as cur:
+    with reader().cursor() as cur:
         cur.execute("""
             SELECT
                 m.match_id,
@@ -257,31 +317,14 @@ def matches_by_day(request):
 
         rows = cur.fetchall()
 
-    return JsonResponse({
+    return json_response({
         "date": date_s,
-        "items": [
-            {
-                "match_id": r[0],
-                "court_id": r[1],
-                "start_time": str(r[2]),
-                "end_time": str(r[3]),
-                "player1_id": r[4],
-                "player1_name": r[5],
-                "player2_id": r[6],
-                "player2_name": r[7],
-                "tournament_id": r[8],
-                "tournament_name": r[9],
-                "round": r[10],
-                "winner_id": r[11],
-                "score": r[12],
-                "type": "tournament" if r[8] is not None else "friendly",
-            }
-            for r in rows
-        ]
+        "items": DAY_ROW.map(rows),
     })
 
 
 @require_GET
+@read_only
 def open_slots(request):
     """
     GET /api/matches/open/?start_time=...&end_time=...
@@ -299,7 +342,7 @@ def open_slots(request):
 
     overlap = "NOT (m.end_time <= %s OR m.start_time >= %s)"
 
-    with connection.cursor() as cur:
+    with reader().cursor() as cur:
         cur.execute(f"""
             SELECT m.match_id, m.court_id, m.player1_id, u.name, m.start_time, m.end_time
             FROM matches m
@@ -311,22 +354,13 @@ def open_slots(request):
         """, [start_dt, end_dt])
         rows = cur.fetchall()
 
-    return JsonResponse({
-        "open_slots": [
-            {
-                "match_id": r[0],
-                "court_id": r[1],
-                "host_user_id": r[2],
-                "host_name": r[3],
-                "start_time": str(r[4]),
-                "end_time": str(r[5]),
-            }
-            for r in rows
-        ]
+    return json_response({
+        "open_slots": OPEN_SLOT_ROW.map(rows),
     })
 
 
 @csrf_exempt
+@idempotent("join_slot")
 def join_slot(request, match_id):
     """
     POST /api/matches/<match_id>/join/
@@ -339,9 +373,7 @@ def join_slot(request, match_id):
     if not user_id:
         return JsonResponse({"error": "Not logged in"}, status=401)
 
-    overlap = "NOT (end_time <= %s OR start_time >= %s)"
-
-    with connection.cursor() as cur:
+    with transaction.atomic(), connection.cursor() as cur:
         cur.execute("SELECT player1_id, player2_id, start_time, end_time FROM matches WHERE match_id=%s", [match_id])
         row = cur.fetchone()
         if not row:
@@ -354,11 +386,7 @@ def join_slot(request, match_id):
             return JsonResponse({"error": "You cannot join your own slot"}, status=400)
 
         # user availability
-        cur.execute(
-            f"SELECT COUNT(*) FROM matches WHERE (player1_id=%s OR player2_id=%s) AND {overlap}",
-            [user_id, user_id, start_dt, end_dt]
-        )
-        if cur.fetchone()[0] > 0:
+        if player_matches.player_busy(cur, user_id, start_dt, end_dt):
             return JsonResponse({"error": "You already have a match in that slot"}, status=409)
 
         # claim slot
@@ -368,9 +396,279 @@ def join_slot(request, match_id):
         )
         if cur.rowcount == 0:
             return JsonResponse({"error": "Slot already taken"}, status=409)
+        player_matches.sync(cur, [match_id])
+        rollups.sync(cur, [match_id])
 
     return JsonResponse({"message": "Joined slot", "match_id": int(match_id)}, status=200)
 
+
+@csrf_exempt
+def cancel_match(request, match_id):
+    """
+    POST /api/matches/<match_id>/cancel/
+    - host (player1) or admin: deletes the booking, then books waitlisted players
+      that fit the freed interval (first come, first served)
+    - player2: leaves the match, which becomes an open slot again
+    Tournament matches and matches with a result cannot be cancelled.
+    """
+    if request.method != "POST":
+        return JsonResponse({"error": "POST required"}, status=405)
+
+    user_id = _current_user_id(request)
+    if not user_id:
+        return JsonResponse({"error": "Not logged in"}, status=401)
+    user_id = int(user_id)
+
+    with connection.cursor() as cur:
+        cur.execute("SELECT court_id FROM matches WHERE match_id=%s", [match_id])
+        row = cur.fetchone()
+    if not row:
+        return JsonResponse({"error": "Match not found"}, status=404)
+    court_id = row[0]
+
+    with transaction.atomic(), connection.cursor() as cur:
+        waitlist.lock_court(cur, court_id)
+        cur.execute("""
+            SELECT player1_id, player2_id, start_time, end_time, tournament_id, winner_id
+            FROM matches
+            WHERE match_id=%s
+            FOR UPDATE
+        """, [match_id])
+        row = cur.fetchone()
+        if not row:
+            return JsonResponse({"error": "Match not found"}, status=404)
+
+        host_id, p2, start_dt, end_dt, tournament_id, winner_id = row
+        if tournament_id is not None:
+            return JsonResponse({"error": "Tournament matches cannot be cancelled"}, status=400)
+        if winner_id is not None:
+            return JsonResponse({"error": "Match already has a result"}, status=400)
+
+        before = rollups.match_keys(cur, [match_id])  # the rows the cancel/leave takes the match out of
+        if p2 is not None and int(p2) == user_id:
+            cur.execute("UPDATE matches SET player2_id=NULL WHERE match_id=%s", [match_id])
+            player_matches.sync(cur, [match_id])
+            rollups.sync(cur, [match_id], also=before)
+            return JsonResponse({"message": "Left match; slot is open again", "match_id": int(match_id)})
+
+        if int(host_id) != user_id and db_role(user_id) != "admin":
+            return JsonResponse({"error": "Only the host or an admin can cancel this match"}, status=403)
+
+        cur.execute("DELETE FROM matches WHERE match_id=%s", [match_id])  # player_matches rows: FK cascade
+        rollups.refresh(cur, before)
+        promoted = waitlist.promote(cur, court_id, start_dt, end_dt)
+
+    return JsonResponse({"message": "Match cancelled", "match_id": int(match_id), "promoted": promoted})
+
+
+@csrf_exempt
+def join_waitlist(request):
+    """
+    POST /api/matches/waitlist/join/
+    Same body as book/. If the slot is free it is booked right away (201);
+    if only the court is busy the request is queued (202) and booked
+    automatically when a cancellation frees it.
+    """
+    if request.method != "POST":
+        return JsonResponse({"error": "POST required"}, status=405)
+
+    user_id = _current_user_id(request)
+    if not user_id:
+        return JsonResponse({"error": "Not logged in"}, status=401)
+
+    booking, err = _parse_booking(_get_json(request), user_id)
+    if err:
+        return err
+    court_id, opponent_id, start_dt, end_dt = booking
+
+    with transaction.atomic(), connection.cursor() as cur:
+        if not waitlist.lock_court(cur, court_id):
+            return JsonResponse({"error": "Court not found"}, status=404)
+
+        conflict = waitlist.booking_conflict(cur, court_id, user_id, opponent_id, start_dt, end_dt)
+        if conflict is None:
+            match_id = waitlist.insert_match(cur, court_id, user_id, opponent_id, start_dt, end_dt)
+            return JsonResponse(
+                {"message": "Match booked", "match_id": match_id, "open_slot": opponent_id is None, "waitlisted": False},
+                status=201
+            )
+        if conflict != "court":
+            # waiting can't help when the players themselves are busy
+            return JsonResponse({"error": CONFLICT_ERRORS[conflict]}, status=409)
+
+        waitlist_id, position = waitlist.join(cur, court_id, user_id, opponent_id, start_dt, end_dt)
+        if waitlist_id is None:
+            return JsonResponse({"error": "Already on the waitlist for that slot"}, status=409)
+
+    return JsonResponse(
+        {"message": "Added to waitlist", "waitlist_id": waitlist_id, "position": position, "waitlisted": True},
+        status=202
+    )
+
+
+@require_GET
+def my_waitlist(request):
+    """
+    GET /api/matches/waitlist/
+    Current user's waitlist entries (waiting + booked), newest first.
+    """
+    user_id = _current_user_id(request)
+    if not user_id:
+        return JsonResponse({"error": "Not logged in"}, status=401)
+
+    with connection.cursor() as cur:
+        cur.execute("""
+            SELECT waitlist_id, court_id, opponent_id, start_time, end_time, status, match_id, created_at
+            FROM match_waitlist
+            WHERE user_id=%s AND status IN ('waiting', 'booked')
+              AND NOT (status='waiting' AND start_time <= UTC_TIMESTAMP())
+            ORDER BY waitlist_id DESC
+            LIMIT 50
+        """, [user_id])
+        rows = cur.fetchall()
+
+    return json_response({"waitlist": WAITLIST_ROW.map(rows)})
+
+
+@csrf_exempt
+def leave_waitlist(request, waitlist_id):
+    """
+    POST /api/matches/waitlist/<waitlist_id>/leave/
+    """
+    if request.method != "POST":
+        return JsonResponse({"error": "POST required"}, status=405)
+
+    user_id = _current_user_id(request)
+    if not user_id:
+        return JsonResponse({"error": "Not logged in"}, status=401)
+
+    with connection.cursor() as cur:
+        cur.execute(
+            "UPDATE match_waitlist SET status='left' WHERE waitlist_id=%s AND user_id=%s AND status='waiting'",
+            [waitlist_id, user_id]
+        )
+        if cur.rowcount == 0:
+            return JsonResponse({"error": "Waitlist entry not found"}, status=404)
+
+    return JsonResponse({"message": "Left waitlist", "waitlist_id": int(waitlist_id)})
+
+
+@csrf_exempt
+def join_matchmaking(request):
+    """
+    POST /api/matches/matchmaking/join/
+    Queue for automatic pairing (matches/matchmaking.py). The batch matcher
+    books a court for you and an opponent within skill_tolerance.
+    Body:
+    {
+      "window_start": "2026-01-10T17:00:00",
+      "window_end": "2026-01-10T21:00:00",
+      "duration_minutes": 60,      (optional, 30..180)
+      "skill_tolerance": 1         (optional, 0..10)
+    }
+    """
+    if request.method != "POST":
+        return JsonResponse({"error": "POST required"}, status=405)
+
+    user_id = _current_user_id(request)
+    if not user_id:
+        return JsonResponse({"error": "Not logged in"}, status=401)
+
+    data = _get_json(request)
+    window_start = parse_datetime(data.get("window_start") or "")
+    window_end = parse_datetime(data.get("window_end") or "")
+    if not window_start or not window_end:
+        return JsonResponse({"error": "window_start and window_end required"}, status=400)
+
+    try:
+        duration = int(data.get("duration_minutes") or 60)
+        tolerance = int(data.get("skill_tolerance") if data.get("skill_tolerance") is not None else 1)
+    except (TypeError, ValueError):
+        return JsonResponse({"error": "duration_minutes and skill_tolerance must be integers"}, status=400)
+
+    lo, hi = MATCHMAKING_DURATIONS
+    if not lo <= duration <= hi:
+        return JsonResponse({"error": f"duration_minutes must be between {lo} and {hi}"}, status=400)
+    if not 0 <= tolerance <= MATCHMAKING_MAX_TOLERANCE:
+        return JsonResponse({"error": f"skill_tolerance must be between 0 and {MATCHMAKING_MAX_TOLERANCE}"}, status=400)
+    if (window_end - window_start).total_seconds() < duration * 60:
+        return JsonResponse({"error": "Window is shorter than duration_minutes"}, status=400)
+    if (window_end - window_start).days >= MATCHMAKING_MAX_WINDOW_DAYS:
+        return JsonResponse({"error": f"Window too long (max {MATCHMAKING_MAX_WINDOW_DAYS} days)"}, status=400)
+
+    with transaction.atomic(), connection.cursor() as cur:
+        cur.execute("SELECT skill_rating FROM users WHERE user_id=%s FOR UPDATE", [user_id])
+        row = cur.fetchone()
+        if not row:
+            return JsonResponse({"error": "User not found"}, status=404)
+
+        cur.execute(
+            "SELECT queue_id FROM matchmaking_queue WHERE user_id=%s AND status='waiting'",
+            [user_id]
+        )
+        existing = cur.fetchone()
+        if existing:
+            return JsonResponse({"error": "Already in the matchmaking queue", "queue_id": existing[0]}, status=409)
+
+        cur.execute(
+            """
+            INSERT INTO matchmaking_queue
+              (user_id, skill_rating, skill_tolerance, window_start, window_end, duration_minutes, status, created_at)
+            VALUES (%s, %s, %s, %s, %s, %s, 'waiting', UTC_TIMESTAMP())
+            """,
+            [user_id, row[0] or 0, tolerance, window_start, window_end, duration]
+        )
+        queue_id = cur.lastrowid
+
+    return JsonResponse({"message": "Queued for matchmaking", "queue_id": queue_id}, status=202)
+
+
+@require_GET
+def my_matchmaking(request):
+    """
+    GET /api/matches/matchmaking/
+    Current user's matchmaking entries, newest first (match_id once paired).
+    """
+    user_id = _current_user_id(request)
+    if not user_id:
+        return JsonResponse({"error": "Not logged in"}, status=401)
+
+    with connection.cursor() as cur:
+        cur.execute("""
+            SELECT queue_id, window_start, window_end, duration_minutes, skill_tolerance, status, match_id,
+                   created_at, matched_at
+            FROM matchmaking_queue
+            WHERE user_id=%s
+            ORDER BY queue_id DESC
+            LIMIT 20
+        """, [user_id])
+        rows = cur.fetchall()
+
+    return json_response({"matchmaking": MATCHMAKING_ROW.map(rows)})
+
+
+@csrf_exempt
+def leave_matchmaking(request, queue_id):
+    """
+    POST /api/matches/matchmaking/<queue_id>/leave/
+    """
+    if request.method != "POST":
+        return JsonResponse({"error": "POST required"}, status=405)
+
+    user_id = _current_user_id(request)
+    if not user_id:
+        return JsonResponse({"error": "Not logged in"}, status=401)
+
+    with connection.cursor() as cur:
+        cur.execute(
+            "UPDATE matchmaking_queue SET status='left' WHERE queue_id=%s AND user_id=%s AND status='waiting'",
+            [queue_id, user_id]
+        )
+        if cur.rowcount == 0:
+            return JsonResponse({"error": "Matchmaking entry not found"}, status=404)
+
+    return JsonResponse({"message": "Left matchmaking", "queue_id": int(queue_id)})
+
 from datetime import datetime, timedelta
 from django.http import JsonResponse
 from django.views.decorators.http import require_GET
@@ -382,6 +680,7 @@ from django.views.decorators.http import require_GET
 from django.db import connection
 
 @require_GET
+@read_only
 def matches_by_day(request):
     """
     GET /api/matches/by-day/?date=YYYY-MM-DD[&court_id=1]
@@ -416,7 +715,7 @@ def matches_by_day(request):
         court_filter_sql = " AND m.court_id = %s "
         params.append(court_id_int)
 
-    with connection.cursor() as cur:
+    with reader().cursor() as cur:
         cur.execute(f"""
             SELECT
                 m.match_id,
@@ -444,29 +743,98 @@ def matches_by_day(request):
 
         rows = cur.fetchall()
 
-    return JsonResponse({
+    return json_response({
         "date": date_s,
         "court_id": court_id_int,
-        "items": [
-            {
-                "match_id": r[0],
-                "court_id": r[1],
-                "start_time": str(r[2]),
-                "end_time": str(r[3]),
-                "player1_id": r[4],
-                "player1_name": r[5],
-                "player2_id": r[6],
-                "player2_name": r[7],
-                "tournament_id": r[8],
-                "tournament_name": r[9],
-                "round": r[10],
-                "winner_id": r[11],
-                "score": r[12],
-                "type": "tournament" if r[8] is not None else "friendly",
-                "open_slot": True if r[6] is None else False,
-            }
-            for r in rows
-        ]
+        "items": DAY_ROW.map(rows),
     })
 
 
+@require_GET
+@read_only
+def court_utilization(request):
+    """
+    GET /api/matches/utilization/?from=YYYY-MM-DD&to=YYYY-MM-DD[&court_id=1][&idle_threshold=0.05]
+    Admin only. Per-court weekday x hour occupancy (fraction of minutes booked)
+    over an inclusive date range of at most 366 days, plus peak / idle summaries.
+    """
+    admin_id, err = require_admin(request)
+    if err:
+        return err
+    # the analytics slot is only taken once the caller is known to be an admin
+    return _court_utilization(request)
+
+
+@admission_control("analytics")
+def _court_utilization(request):
+    # numpy: imported on first use instead of at worker start
+    from . import analytics
+
+    if not analytics.available():
+        return JsonResponse({"error": "Court analytics require numpy"}, status=503)
+
+    try:
+        date_from = datetime.strptime(request.GET.get("from") or "", "%Y-%m-%d").date()
+        date_to = datetime.strptime(request.GET.get("to") or "", "%Y-%m-%d").date()
+    except ValueError:
+        return JsonResponse({"error": "from and to are required (YYYY-MM-DD)"}, status=400)
+
+    if date_to < date_from:
+        return JsonResponse({"error": "to must not be before from"}, status=400)
+    if (date_to - date_from).days + 1 > analytics.MAX_RANGE_DAYS:
+        return JsonResponse({"error": f"Range too large (max {analytics.MAX_RANGE_DAYS} days)"}, status=400)
+
+    court_id = request.GET.get("court_id")
+    try:
+        court_id = int(court_id) if court_id not in (None, "", "0") else None
+    except ValueError:
+        return JsonResponse({"error": "court_id must be an integer"}, status=400)
+
+    try:
+        idle_threshold = float(request.GET.get("idle_threshold") or 0.05)
+    except ValueError:
+        return JsonResponse({"error": "idle_threshold must be a number"}, status=400)
+
+    return json_response(analytics.court_utilization(date_from, date_to, court_id, idle_threshold))
+
+
+@require_GET
+@read_only
+def court_usage(request):
+    """
+    GET /api/matches/courts/usage/?days=7   (or ?from=YYYY-MM-DD&to=YYYY-MM-DD)[&court_id=1]
+    Admin only. Bookings and booked minutes per court over a UTC date range:
+    totals plus the days with activity. Reads the daily rollup (matches/rollups.py),
+    so cost grows with courts x days, not with the number of matches.
+    """
+    admin_id, err = require_admin(request)
+    if err:
+        return err
+
+    span, err = rollups.date_range(request.GET, default_days=7)
+    if err:
+        return err
+    first_day, last_day = span
+
+    court_id = request.GET.get("court_id")
+    try:
+        court_id = int(court_id) if court_id not in (None, "", "0") else None
+    except ValueError:
+        return JsonResponse({"error": "court_id must be an integer"}, status=400)
+
+    with reader().cursor() as cur:
+        rows = rollups.court_days(cur, first_day, last_day, court_id)
+        if court_id is None:
+            cur.execute("SELECT court_id, name FROM courts ORDER BY court_id")
+        else:
+            cur.execute("SELECT court_id, name FROM courts WHERE court_id=%s", [court_id])
+        courts = {cid: {"court_id": cid, "name": name, "bookings": 0, "booked_minutes": 0, "days": []}
+                  for cid, name in cur.fetchall()}
+
+    for cid, day, bookings, booked_minutes in rows:
+        court = courts.setdefault(cid, {"court_id": cid, "name": None, "bookings": 0, "booked_minutes": 0, "days": []})
+        court["bookings"] += int(bookings)
+        court["booked_minutes"] += int(booked_minutes)
+        court["days"].append({"day": day, "bookings": bookings, "booked_minutes": booked_minutes})
+
+    return json_response({"from": first_day, "to": last_day, "courts": list(courts.values())})
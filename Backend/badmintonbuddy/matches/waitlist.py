@@ -0,0 +1,150 @@
+"""
+Court bookings: conflict checks, cancellation, and the per-court waitlist.
+
+Players who want a busy slot join the waitlist once instead of re-polling
+book_match / open_slots. The queue is per court and FIFO (waitlist_id
+order). Each entry is the exact [start_time, end_time) window the player
+wants.
+
+When a booking is cancelled, promote() walks the waiting entries whose window
+overlaps the freed interval, in queue order. It books every entry that now
+fits (court free, player and opponent free), in the same transaction as the
+cancel. Only windows that haven't started yet are promoted.
+
+Entries whose window has started are marked 'expired' (expire()): on the
+court being joined or promoted, and for every court on each matchmaker tick
+(run_matchmaker), so they neither count towards queue positions nor linger
+as 'waiting'.
+
+Every writer that check-then-inserts on a court (book_match, waitlist join,
+cancel + promote) first takes lock_court(). Two requests therefore cannot
+both see a slot as free and double-book it.
+"""
+from . import player_matches, rollups
+
+OVERLAP = "NOT (end_time <= %s OR start_time >= %s)"
+
+
+def lock_court(cur, court_id):
+    """Row lock on the court for the rest of the transaction. False if the court does not exist."""
+    cur.execute("SELECT court_id FROM courts WHERE court_id=%s FOR UPDATE", [court_id])
+    return cur.fetchone() is not None
+
+
+def booking_conflict(cur, court_id, user_id, opponent_id, start_dt, end_dt):
+    """
+    Returns None if the slot can be booked, otherwise which side is busy:
+    "court" | "user" | "opponent".
+    """
+    cur.execute(
+        f"SELECT COUNT(*) FROM matches WHERE court_id=%s AND {OVERLAP}",
+        [court_id, start_dt, end_dt]
+    )
+    if cur.fetchone()[0] > 0:
+        return "court"
+
+    for side, player_id in (("user", user_id), ("opponent", opponent_id)):
+        if player_id is not None and player_matches.player_busy(cur, player_id, start_dt, end_dt):
+            return side
+
+    return None
+
+
+def insert_match(cur, court_id, user_id, opponent_id, start_dt, end_dt):
+    cur.execute(
+        "INSERT INTO matches (court_id, player1_id, player2_id, start_time, end_time) VALUES (%s,%s,%s,%s,%s)",
+        [court_id, user_id, opponent_id, start_dt, end_dt]
+    )
+    match_id = cur.lastrowid
+    player_matches.sync(cur, [match_id])
+    rollups.sync(cur, [match_id])
+    return match_id
+
+
+def expire(cur, court_id):
+    """Mark the court's waiting entries whose window has started as expired. Returns how many."""
+    cur.execute(
+        """
+        UPDATE match_waitlist SET status='expired'
+        WHERE court_id=%s AND status='waiting' AND start_time <= UTC_TIMESTAMP()
+        """,
+        [court_id]
+    )
+    return cur.rowcount
+
+
+def expire_all(cur):
+    """expire() for every court, one idx_waitlist_court range each. Returns how many."""
+    cur.execute("SELECT court_id FROM courts ORDER BY court_id")
+    return sum(expire(cur, court_id) for (court_id,) in cur.fetchall())
+
+
+def join(cur, court_id, user_id, opponent_id, start_dt, end_dt):
+    """
+    Queue a request for a busy slot. Caller holds lock_court().
+    Returns (waitlist_id, position) or (None, None) if the user already waits for that window.
+    """
+    expire(cur, court_id)
+    cur.execute(
+        """
+        SELECT waitlist_id FROM match_waitlist
+        WHERE court_id=%s AND user_id=%s AND status='waiting'
+          AND start_time=%s AND end_time=%s
+        """,
+        [court_id, user_id, start_dt, end_dt]
+    )
+    if cur.fetchone():
+        return None, None
+
+    cur.execute(
+        """
+        INSERT INTO match_waitlist (user_id, court_id, opponent_id, start_time, end_time, status, created_at)
+        VALUES (%s, %s, %s, %s, %s, 'waiting', UTC_TIMESTAMP())
+        """,
+        [user_id, court_id, opponent_id, start_dt, end_dt]
+    )
+    waitlist_id = cur.lastrowid
+
+    # position among everyone waiting for an overlapping window on this court
+    cur.execute(
+        f"""
+        SELECT COUNT(*) FROM match_waitlist
+        WHERE court_id=%s AND status='waiting' AND waitlist_id < %s AND {OVERLAP}
+        """,
+        [court_id, waitlist_id, start_dt, end_dt]
+    )
+    return waitlist_id, cur.fetchone()[0] + 1
+
+
+def promote(cur, court_id, start_dt, end_dt):
+    """
+    Book waiting entries that overlap a freed [start_dt, end_dt) on the court, FIFO.
+    Caller holds lock_court() and has already removed the booking.
+    Returns [{"waitlist_id", "user_id", "match_id"}] for each promoted entry.
+    """
+    expire(cur, court_id)
+    cur.execute(
+        f"""
+        SELECT waitlist_id, user_id, opponent_id, start_time, end_time
+        FROM match_waitlist
+        WHERE court_id=%s AND status='waiting' AND {OVERLAP} AND start_time > UTC_TIMESTAMP()
+        ORDER BY waitlist_id
+        FOR UPDATE
+        """,
+        [court_id, start_dt, end_dt]
+    )
+    waiting = cur.fetchall()
+
+    promoted = []
+    for waitlist_id, user_id, opponent_id, w_start, w_end in waiting:
+        if booking_conflict(cur, court_id, user_id, opponent_id, w_start, w_end):
+            continue  # still blocked (other booking, or the player got busy); keeps its place
+
+        match_id = insert_match(cur, court_id, user_id, opponent_id, w_start, w_end)
+        cur.execute(
+            "UPDATE match_waitlist SET status='booked', match_id=%s WHERE waitlist_id=%s",
+            [match_id, waitlist_id]
+        )
+        promoted.append({"waitlist_id": waitlist_id, "user_id": user_id, "match_id": match_id})
+
+    return promoted
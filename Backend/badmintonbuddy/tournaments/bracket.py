@@ -0,0 +1,122 @@
+"""
+Tournament bracket (GET /api/tournaments/<id>/bracket/).
+
+One joined query returns every match of the tournament with both players'
+names and seeds. build() turns the rows into rounds of matches linked as a
+tree: match i of round r feeds match i // 2 of round r + 1. Clients no longer
+look up names or rebuild the tree from tournament_matches' bare ids.
+
+- ongoing / upcoming: built on request and kept in the result cache
+  (result_cache.tournament_bracket_key, invalidated with the other tournament
+  keys).
+- completed: complete_tournament() calls freeze() in the same transaction as
+  the status change. The encoded JSON is stored once in
+  tournament_bracket_snapshots and served byte-for-byte with an ETag and a
+  long-lived Cache-Control. A completed bracket never changes.
+"""
+import hashlib
+
+from badmintonbuddy.serializers import dumps
+
+BRACKET_SQL = """
+    SELECT t.tournament_id, t.name, t.status, t.max_players,
+           m.match_id, m.round, m.court_id, m.start_time, m.end_time, m.winner_id, m.score,
+           m.player1_id, u1.name, tp1.seed,
+           m.player2_id, u2.name, tp2.seed
+    FROM tournaments t
+    LEFT JOIN matches m ON m.tournament_id = t.tournament_id
+    LEFT JOIN users u1 ON u1.user_id = m.player1_id
+    LEFT JOIN users u2 ON u2.user_id = m.player2_id
+    LEFT JOIN tournament_participants tp1
+      ON tp1.tournament_id = t.tournament_id AND tp1.user_id = m.player1_id
+    LEFT JOIN tournament_participants tp2
+      ON tp2.tournament_id = t.tournament_id AND tp2.user_id = m.player2_id
+    WHERE t.tournament_id = %s
+    ORDER BY m.round ASC, m.match_id ASC
+"""
+
+
+def _player(user_id, name, seed):
+    if user_id is None:
+        return None
+    return {"user_id": user_id, "name": name, "seed": seed}
+
+
+def build(rows):
+    """BRACKET_SQL rows -> bracket dict, or None if the tournament doesn't exist."""
+    if not rows:
+        return None
+
+    tournament_id, name, status, max_players = rows[0][:4]
+    rounds = {}
+    for (_, _, _, _, match_id, rnd, court_id, start_time, end_time, winner_id, score,
+         p1_id, p1_name, p1_seed, p2_id, p2_name, p2_seed) in rows:
+        if match_id is None:
+            continue  # LEFT JOIN row of a tournament without matches
+        rounds.setdefault(rnd, []).append({
+            "match_id": match_id,
+            "court_id": court_id,
+            "start_time": start_time,
+            "end_time": end_time,
+            "player1": _player(p1_id, p1_name, p1_seed),
+            "player2": _player(p2_id, p2_name, p2_seed),
+            "winner_id": winner_id,
+            "score": score,
+        })
+
+    ordered = [(rnd, rounds[rnd]) for rnd in sorted(rounds, key=lambda r: (r is None, r))]
+    for i, (rnd, matches) in enumerate(ordered):
+        prev_matches = ordered[i - 1][1] if i > 0 else []
+        next_matches = ordered[i + 1][1] if i + 1 < len(ordered) else []
+        for pos, m in enumerate(matches):
+            m["position"] = pos
+            m["source_match_ids"] = [s["match_id"] for s in prev_matches[2 * pos:2 * pos + 2]]
+            m["next_match_id"] = next_matches[pos // 2]["match_id"] if pos // 2 < len(next_matches) else None
+
+    champion = None
+    if ordered and len(ordered[-1][1]) == 1:
+        final = ordered[-1][1][0]
+        for side in ("player1", "player2"):
+            if final[side] and final[side]["user_id"] == final["winner_id"]:
+                champion = final[side]
+
+    return {
+        "tournament_id": tournament_id,
+        "name": name,
+        "status": status,
+        "max_players": max_players,
+        "champion": champion,
+        "rounds": [{"round": rnd, "matches": matches} for rnd, matches in ordered],
+    }
+
+
+def load(cur, tournament_id):
+    """Read the bracket live from the tables."""
+    cur.execute(BRACKET_SQL, [tournament_id])
+    return build(cur.fetchall())
+
+
+def load_snapshot(cur, tournament_id):
+    """(body, etag) of the frozen bracket, or None if it isn't frozen (yet)."""
+    cur.execute(
+        "SELECT body, etag FROM tournament_bracket_snapshots WHERE tournament_id=%s",
+        [tournament_id]
+    )
+    return cur.fetchone()
+
+
+def freeze(cur, tournament_id):
+    """
+    Store the bracket as it is now. First write wins: a second call (double
+    complete, backfill) keeps the existing snapshot. Returns (body, etag).
+    """
+    body = dumps(load(cur, tournament_id)).decode("utf-8")
+    etag = hashlib.sha1(body.encode("utf-8")).hexdigest()
+    cur.execute(
+        """
+        INSERT IGNORE INTO tournament_bracket_snapshots (tournament_id, body, etag, frozen_at)
+        VALUES (%s, %s, %s, UTC_TIMESTAMP())
+        """,
+        [tournament_id, body, etag]
+    )
+    return load_snapshot(cur, tournament_id)
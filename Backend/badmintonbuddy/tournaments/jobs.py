@@ -0,0 +1,22 @@
+from django.db import transaction
+
+from badmintonbuddy import result_cache
+from jobs.queue import handler
+
+
+@handler("match_result")
+def apply_match_result(payload, cur):
+    """
+    Derived work after report_match_result:
+    - users.total_matches (+1) for both players
+    - users.wins (+1) for winner
+
+    Runs in the job's claim transaction, so the counters move exactly once per job.
+    """
+    cur.execute(
+        "UPDATE users SET total_matches = total_matches + 1 WHERE user_id IN (%s, %s)",
+        [payload["player1_id"], payload["player2_id"]]
+    )
+    cur.execute("UPDATE users SET wins = wins + 1 WHERE user_id=%s", [payload["winner_id"]])
+
+    transaction.on_commit(lambda: result_cache.invalidate(result_cache.GLOBAL_LEADERBOARD))
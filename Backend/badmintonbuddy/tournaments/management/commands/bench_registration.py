@@ -0,0 +1,161 @@
+import json
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import RequestFactory
+
+from badmintonbuddy.percentiles import percentile
+from tournaments import views
+
+
+class Command(BaseCommand):
+    help = (
+        "Sign-up burst against join_tournament: --players users join a fresh --seats tournament from "
+        "--threads threads at once. Checks that exactly --seats get in, that the rest are waitlisted "
+        "in order, and that leaving promotes the head of the waitlist. Reports latency and statements "
+        "per join. Needs generated users (generate_club_data); the tournament is removed afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--players", type=int, default=1000)
+        parser.add_argument("--seats", type=int, default=128)
+        parser.add_argument("--threads", type=int, default=32)
+        parser.add_argument("--leavers", type=int, default=10, help="Participants that leave afterwards")
+        parser.add_argument("--keep", action="store_true", help="Keep the benchmark tournament")
+
+    def handle(self, *args, **o):
+        with connection.cursor() as cur:
+            cur.execute("SELECT user_id FROM users WHERE role='player' ORDER BY user_id LIMIT %s", [o["players"]])
+            players = [r[0] for r in cur.fetchall()]
+            cur.execute("SELECT user_id FROM users WHERE role='admin' ORDER BY user_id LIMIT 1")
+            admin = cur.fetchone()
+        if len(players) < 2 or not admin:
+            raise CommandError("Need an admin and player users. Run generate_club_data first.")
+
+        seats = max(2, min(o["seats"], len(players)))
+        with connection.cursor() as cur:
+            cur.execute(
+                "INSERT INTO tournaments (name, description, created_by, max_players, seats_left, status) "
+                "VALUES ('Registration burst', 'bench_registration', %s, %s, %s, 'upcoming')",
+                [admin[0], seats, seats]
+            )
+            tid = cur.lastrowid
+
+        try:
+            results = self._burst(tid, players, o["threads"])
+            self._report(tid, players, seats, results)
+            self._leave(tid, results, o["leavers"])
+        finally:
+            if not o["keep"]:
+                with connection.cursor() as cur:
+                    for table in ("tournament_waitlist", "tournament_participants", "tournaments"):
+                        cur.execute(f"DELETE FROM {table} WHERE tournament_id=%s", [tid])
+
+    def _burst(self, tid, players, threads):
+        factory = RequestFactory()
+        barrier = threading.Barrier(threads)
+        lock = threading.Lock()
+        results = []  # (user_id, status, ms, statements, body)
+        counter = {}  # thread -> statements executed
+
+        def count(execute, sql, params, many, context):
+            counter[threading.get_ident()] += 1
+            return execute(sql, params, many, context)
+
+        def worker(users):
+            counter[threading.get_ident()] = 0
+            mine = []
+            try:
+                with connection.execute_wrapper(count):
+                    barrier.wait()
+                    for uid in users:
+                        request = factory.post(f"/api/tournaments/{tid}/join/")
+                        request.session = {"user_id": uid}
+                        before = counter[threading.get_ident()]
+                        t0 = time.perf_counter()
+                        response = views.join_tournament(request, tid)
+                        ms = (time.perf_counter() - t0) * 1000
+                        mine.append((uid, response.status_code, ms, counter[threading.get_ident()] - before,
+                                     response.content))
+            finally:
+                connection.close()
+            with lock:
+                results.extend(mine)
+
+        started = time.perf_counter()
+        pool = [threading.Thread(target=worker, args=(players[i::threads],)) for i in range(threads)]
+        for t in pool:
+            t.start()
+        for t in pool:
+            t.join()
+        self.elapsed = time.perf_counter() - started
+        return results
+
+    def _report(self, tid, players, seats, results):
+        by_status = {}
+        for _, status, ms, statements, _ in results:
+            lat, stmts = by_status.setdefault(status, ([], []))
+            lat.append(ms)
+            stmts.append(statements)
+
+        self.stdout.write(
+            f"{len(results)} joins for {seats} seats, {self.elapsed:.2f}s, "
+            f"{len(results) / self.elapsed:.0f} joins/s"
+        )
+        self.stdout.write(f"{'status':<8}{'count':>7}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'stmts':>7}")
+        for status, (lat, stmts) in sorted(by_status.items()):
+            lat.sort()
+            self.stdout.write(
+                f"{status:<8}{len(lat):>7}{percentile(lat, 50):>9.1f}{percentile(lat, 95):>9.1f}{percentile(lat, 99):>9.1f}"
+                f"{sum(stmts) / len(stmts):>7.1f}"
+            )
+
+        with connection.cursor() as cur:
+            cur.execute("SELECT seats_left FROM tournaments WHERE tournament_id=%s", [tid])
+            seats_left = cur.fetchone()[0]
+            cur.execute("SELECT COUNT(*) FROM tournament_participants WHERE tournament_id=%s", [tid])
+            participants = cur.fetchone()[0]
+            cur.execute(
+                "SELECT waitlist_id FROM tournament_waitlist WHERE tournament_id=%s AND status='waiting' "
+                "ORDER BY waitlist_id", [tid]
+            )
+            waiting = [r[0] for r in cur.fetchall()]
+
+        positions = sorted(json.loads(body)["position"] for _, status, _, _, body in results if status == 202)
+        expected_waiting = len(players) - seats
+        checks = {
+            f"participants == {seats}": participants == seats,
+            "seats_left == 0": seats_left == 0,
+            f"waiting == {expected_waiting}": len(waiting) == expected_waiting,
+            "positions 1..n": positions == list(range(1, expected_waiting + 1)),
+        }
+        for name, ok in checks.items():
+            self.stdout.write(f"  {'ok  ' if ok else 'FAIL'} {name}")
+
+    def _leave(self, tid, results, leavers):
+        joined = [uid for uid, status, *_ in results if status == 201][:leavers]
+        if not joined:
+            return
+        with connection.cursor() as cur:
+            cur.execute(
+                "SELECT user_id FROM tournament_waitlist WHERE tournament_id=%s AND status='waiting' "
+                "ORDER BY waitlist_id LIMIT %s", [tid, len(joined)]
+            )
+            head = [r[0] for r in cur.fetchall()]
+
+        factory = RequestFactory()
+        for uid in joined:
+            request = factory.post(f"/api/tournaments/{tid}/leave/")
+            request.session = {"user_id": uid}
+            views.leave_tournament(request, tid)
+
+        with connection.cursor() as cur:
+            cur.execute(
+                "SELECT user_id FROM tournament_waitlist WHERE tournament_id=%s AND status='promoted' "
+                "ORDER BY promoted_at, waitlist_id", [tid]
+            )
+            promoted = [r[0] for r in cur.fetchall()]
+        ok = promoted == head
+        self.stdout.write(f"  {'ok  ' if ok else 'FAIL'} {len(joined)} leavers -> head of the waitlist promoted in order")
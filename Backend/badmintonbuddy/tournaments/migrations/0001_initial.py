@@ -0,0 +1,68 @@
+# Generated by Django 5.2.4 on 2026-10-18 23:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tournament',
+            fields=[
+                ('tournament_id', models.AutoField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=100)),
+                ('description', models.CharField(blank=True, max_length=255, null=True)),
+                ('max_players', models.IntegerField()),
+                ('status', models.CharField(max_length=10)),
+            ],
+            options={
+                'db_table': 'tournaments',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='TournamentParticipant',
+            fields=[
+                ('participant_id', models.AutoField(primary_key=True, serialize=False)),
+                ('seed', models.IntegerField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'tournament_participants',
+                'managed': False,
+            },
+        ),
+        migrations.RunSQL(
+            sql="""
+                CREATE TABLE IF NOT EXISTS tournaments (
+                    tournament_id  INT PRIMARY KEY AUTO_INCREMENT,
+                    name           VARCHAR(100) NOT NULL,
+                    description    VARCHAR(255),
+                    created_by     INT NOT NULL,
+                    max_players    INT NOT NULL,
+                    status         ENUM('upcoming','ongoing','completed') NOT NULL DEFAULT 'upcoming',
+                    FOREIGN KEY (created_by) REFERENCES users(user_id)
+                )
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.RunSQL(
+            sql="""
+                CREATE TABLE IF NOT EXISTS tournament_participants (
+                    participant_id  INT PRIMARY KEY AUTO_INCREMENT,
+                    tournament_id   INT NOT NULL,
+                    user_id         INT NOT NULL,
+                    seed            INT,
+                    FOREIGN KEY (tournament_id) REFERENCES tournaments(tournament_id),
+                    FOREIGN KEY (user_id) REFERENCES users(user_id),
+                    UNIQUE KEY unique_participation (tournament_id, user_id)
+                )
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
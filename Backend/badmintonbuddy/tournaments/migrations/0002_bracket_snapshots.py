@@ -0,0 +1,141 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:12
+
+import datetime
+import decimal
+import hashlib
+import json
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Frozen copy of tournaments/bracket.py (BRACKET_SQL, build(), freeze()) as of this
+# migration, so later changes to the app module can't change what it does.
+BRACKET_SQL = """
+    SELECT t.tournament_id, t.name, t.status, t.max_players,
+           m.match_id, m.round, m.court_id, m.start_time, m.end_time, m.winner_id, m.score,
+           m.player1_id, u1.name, tp1.seed,
+           m.player2_id, u2.name, tp2.seed
+    FROM tournaments t
+    LEFT JOIN matches m ON m.tournament_id = t.tournament_id
+    LEFT JOIN users u1 ON u1.user_id = m.player1_id
+    LEFT JOIN users u2 ON u2.user_id = m.player2_id
+    LEFT JOIN tournament_participants tp1
+      ON tp1.tournament_id = t.tournament_id AND tp1.user_id = m.player1_id
+    LEFT JOIN tournament_participants tp2
+      ON tp2.tournament_id = t.tournament_id AND tp2.user_id = m.player2_id
+    WHERE t.tournament_id = %s
+    ORDER BY m.round ASC, m.match_id ASC
+"""
+
+
+def _default(obj):
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, decimal.Decimal):
+        return int(obj) if obj == obj.to_integral_value() else float(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _player(user_id, name, seed):
+    if user_id is None:
+        return None
+    return {"user_id": user_id, "name": name, "seed": seed}
+
+
+def _build(rows):
+    tournament_id, name, status, max_players = rows[0][:4]
+    rounds = {}
+    for (_, _, _, _, match_id, rnd, court_id, start_time, end_time, winner_id, score,
+         p1_id, p1_name, p1_seed, p2_id, p2_name, p2_seed) in rows:
+        if match_id is None:
+            continue
+        rounds.setdefault(rnd, []).append({
+            "match_id": match_id,
+            "court_id": court_id,
+            "start_time": start_time,
+            "end_time": end_time,
+            "player1": _player(p1_id, p1_name, p1_seed),
+            "player2": _player(p2_id, p2_name, p2_seed),
+            "winner_id": winner_id,
+            "score": score,
+        })
+
+    ordered = [(rnd, rounds[rnd]) for rnd in sorted(rounds, key=lambda r: (r is None, r))]
+    for i, (rnd, matches) in enumerate(ordered):
+        prev_matches = ordered[i - 1][1] if i > 0 else []
+        next_matches = ordered[i + 1][1] if i + 1 < len(ordered) else []
+        for pos, m in enumerate(matches):
+            m["position"] = pos
+            m["source_match_ids"] = [s["match_id"] for s in prev_matches[2 * pos:2 * pos + 2]]
+            m["next_match_id"] = next_matches[pos // 2]["match_id"] if pos // 2 < len(next_matches) else None
+
+    champion = None
+    if ordered and len(ordered[-1][1]) == 1:
+        final = ordered[-1][1][0]
+        for side in ("player1", "player2"):
+            if final[side] and final[side]["user_id"] == final["winner_id"]:
+                champion = final[side]
+
+    return {
+        "tournament_id": tournament_id,
+        "name": name,
+        "status": status,
+        "max_players": max_players,
+        "champion": champion,
+        "rounds": [{"round": rnd, "matches": matches} for rnd, matches in ordered],
+    }
+
+
+def freeze_completed(apps, schema_editor):
+    # tournaments completed before snapshots existed
+    with schema_editor.connection.cursor() as cur:
+        cur.execute("SELECT tournament_id FROM tournaments WHERE status='completed'")
+        for (tournament_id,) in cur.fetchall():
+            cur.execute(BRACKET_SQL, [tournament_id])
+            rows = cur.fetchall()
+            if not rows:
+                continue
+            body = json.dumps(_build(rows), default=_default, separators=(",", ":"))
+            cur.execute(
+                """
+                INSERT IGNORE INTO tournament_bracket_snapshots (tournament_id, body, etag, frozen_at)
+                VALUES (%s, %s, %s, UTC_TIMESTAMP())
+                """,
+                [tournament_id, body, hashlib.sha1(body.encode("utf-8")).hexdigest()]
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournaments', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BracketSnapshot',
+            fields=[
+                ('tournament', models.OneToOneField(db_column='tournament_id', on_delete=django.db.models.deletion.CASCADE, primary_key=True, serialize=False, to='tournaments.tournament')),
+                ('body', models.TextField()),
+                ('etag', models.CharField(max_length=40)),
+                ('frozen_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'tournament_bracket_snapshots',
+                'managed': False,
+            },
+        ),
+        migrations.RunSQL(
+            sql="""
+                CREATE TABLE IF NOT EXISTS tournament_bracket_snapshots (
+                    tournament_id  INT PRIMARY KEY,
+                    body           LONGTEXT NOT NULL,
+                    etag           CHAR(40) NOT NULL,
+                    frozen_at      DATETIME NOT NULL,
+                    FOREIGN KEY (tournament_id) REFERENCES tournaments(tournament_id) ON DELETE CASCADE
+                )
+            """,
+            reverse_sql="DROP TABLE IF EXISTS tournament_bracket_snapshots",
+        ),
+        migrations.RunPython(freeze_completed, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,55 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournaments', '0002_bracket_snapshots'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TournamentWaitlistEntry',
+            fields=[
+                ('waitlist_id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('status', models.CharField(max_length=10)),
+                ('created_at', models.DateTimeField()),
+                ('promoted_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'tournament_waitlist',
+                'managed': False,
+            },
+        ),
+        # seats_left: free seats, decremented by one conditional UPDATE per join
+        migrations.RunSQL(
+            sql=[
+                "ALTER TABLE tournaments ADD COLUMN seats_left INT NOT NULL DEFAULT 0 AFTER max_players",
+                """
+                UPDATE tournaments t
+                SET seats_left = GREATEST(t.max_players - (
+                    SELECT COUNT(*) FROM tournament_participants tp WHERE tp.tournament_id = t.tournament_id
+                ), 0)
+                """,
+            ],
+            reverse_sql="ALTER TABLE tournaments DROP COLUMN seats_left",
+        ),
+        # idx_tournament_waitlist_queue serves promotion (first waiting entry) and positions
+        migrations.RunSQL(
+            sql="""
+                CREATE TABLE IF NOT EXISTS tournament_waitlist (
+                    waitlist_id    BIGINT PRIMARY KEY AUTO_INCREMENT,
+                    tournament_id  INT NOT NULL,
+                    user_id        INT NOT NULL,
+                    status         ENUM('waiting','promoted','left','closed') NOT NULL DEFAULT 'waiting',
+                    created_at     DATETIME NOT NULL,
+                    promoted_at    DATETIME NULL,
+                    KEY idx_tournament_waitlist_queue (tournament_id, status, waitlist_id),
+                    KEY idx_tournament_waitlist_user (user_id, status),
+                    FOREIGN KEY (tournament_id) REFERENCES tournaments(tournament_id),
+                    FOREIGN KEY (user_id) REFERENCES users(user_id)
+                )
+            """,
+            reverse_sql="DROP TABLE IF EXISTS tournament_waitlist",
+        ),
+    ]
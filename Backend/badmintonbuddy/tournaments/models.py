@@ -7,6 +7,7 @@ class Tournament(models.Model):
     description = models.CharField(max_length=255, null=True, blank=True)
     created_by = models.ForeignKey(User, on_delete=models.CASCADE, db_column='created_by')
     max_players = models.IntegerField()
+    seats_left = models.IntegerField(default=0)
     status = models.CharField(max_length=10)
 
     class Meta:
@@ -30,3 +31,29 @@ class TournamentParticipant(models.Model):
 
     def __str__(self):
         return f"{self.user.name} in {self.tournament.name}"
+
+
+class BracketSnapshot(models.Model):
+    """Frozen bracket JSON of a completed tournament (tournaments/bracket.py)."""
+    tournament = models.OneToOneField(Tournament, primary_key=True, on_delete=models.CASCADE, db_column='tournament_id')
+    body = models.TextField()
+    etag = models.CharField(max_length=40)
+    frozen_at = models.DateTimeField()
+
+    class Meta:
+        managed = False
+        db_table = 'tournament_bracket_snapshots'
+
+
+class TournamentWaitlistEntry(models.Model):
+    """A user waiting for a seat in a full tournament (tournaments/registration.py)."""
+    waitlist_id = models.BigAutoField(primary_key=True)
+    tournament = models.ForeignKey(Tournament, on_delete=models.CASCADE, db_column='tournament_id')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, db_column='user_id')
+    status = models.CharField(max_length=10)
+    created_at = models.DateTimeField()
+    promoted_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        managed = False
+        db_table = 'tournament_waitlist'
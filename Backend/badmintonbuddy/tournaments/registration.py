@@ -0,0 +1,156 @@
+"""
+Tournament registration that holds up when a popular tournament opens.
+
+tournaments.seats_left counts the free seats. create_tournament sets it to
+max_players. A join takes a seat with ONE conditional UPDATE
+(take_seat). Exactly `max_players` of those can succeed, however many run at
+once, and no COUNT(*) over tournament_participants is needed. The
+participant row is inserted under the row lock that UPDATE holds. A duplicate
+join hits unique_participation, and rolling the transaction back gives the
+seat back.
+
+Only when take_seat fails does the join fall to the slow path (overflow). It
+locks the tournament row and tells apart "not found", "not open",
+"already joined" and "full". A full tournament puts the user on the
+tournament_waitlist, FIFO by waitlist_id. A seat freed in the meantime is
+taken there instead, because leave() holds the same row lock.
+
+When a participant leaves an upcoming tournament, the first waiting entry is
+promoted into their seat in the same transaction. With nobody waiting, the
+seat goes back to seats_left. start_tournament closes the waitlist.
+"""
+
+# MySQL ER_DUP_ENTRY: the only IntegrityError that means "already joined"
+DUP_ENTRY = 1062
+
+TAKE_SEAT = """
+    UPDATE tournaments SET seats_left = seats_left - 1
+    WHERE tournament_id=%s AND status='upcoming' AND seats_left > 0
+"""
+
+
+def take_seat(cur, tournament_id):
+    """True if a seat was taken. The tournament row stays locked until the transaction ends."""
+    cur.execute(TAKE_SEAT, [tournament_id])
+    return cur.rowcount == 1
+
+
+def add_participant(cur, tournament_id, user_id):
+    """Raises IntegrityError if the user already joined."""
+    cur.execute(
+        "INSERT INTO tournament_participants (tournament_id, user_id, seed) VALUES (%s, %s, NULL)",
+        [tournament_id, user_id]
+    )
+
+
+def is_duplicate(exc):
+    """True if an IntegrityError is a duplicate key, not e.g. a missing user or tournament (FK)."""
+    return bool(exc.args) and exc.args[0] == DUP_ENTRY
+
+
+def lock_tournament(cur, tournament_id):
+    """(status, seats_left) with the row locked for the rest of the transaction, or None."""
+    cur.execute("SELECT status, seats_left FROM tournaments WHERE tournament_id=%s FOR UPDATE", [tournament_id])
+    return cur.fetchone()
+
+
+def is_participant(cur, tournament_id, user_id):
+    cur.execute(
+        "SELECT 1 FROM tournament_participants WHERE tournament_id=%s AND user_id=%s",
+        [tournament_id, user_id]
+    )
+    return cur.fetchone() is not None
+
+
+def position(cur, tournament_id, waitlist_id):
+    cur.execute(
+        """
+        SELECT COUNT(*) FROM tournament_waitlist
+        WHERE tournament_id=%s AND status='waiting' AND waitlist_id <= %s
+        """,
+        [tournament_id, waitlist_id]
+    )
+    return cur.fetchone()[0]
+
+
+def join_waitlist(cur, tournament_id, user_id):
+    """
+    Queue the user. Caller holds lock_tournament().
+    Returns (waitlist_id, position, created). created is False if the user was already waiting.
+    """
+    cur.execute(
+        "SELECT waitlist_id FROM tournament_waitlist WHERE tournament_id=%s AND user_id=%s AND status='waiting'",
+        [tournament_id, user_id]
+    )
+    row = cur.fetchone()
+    if row:
+        return row[0], position(cur, tournament_id, row[0]), False
+
+    cur.execute(
+        """
+        INSERT INTO tournament_waitlist (tournament_id, user_id, status, created_at)
+        VALUES (%s, %s, 'waiting', UTC_TIMESTAMP())
+        """,
+        [tournament_id, user_id]
+    )
+    waitlist_id = cur.lastrowid
+    return waitlist_id, position(cur, tournament_id, waitlist_id), True
+
+
+def promote(cur, tournament_id):
+    """
+    Give a freed seat to the first waiting entry. Caller holds lock_tournament().
+    Returns the promoted user_id, or None if nobody waits (the seat goes back to seats_left).
+    """
+    cur.execute(
+        """
+        SELECT waitlist_id, user_id FROM tournament_waitlist
+        WHERE tournament_id=%s AND status='waiting'
+        ORDER BY waitlist_id
+        LIMIT 1
+        FOR UPDATE
+        """,
+        [tournament_id]
+    )
+    row = cur.fetchone()
+    if not row:
+        cur.execute(
+            "UPDATE tournaments SET seats_left = LEAST(seats_left + 1, max_players) WHERE tournament_id=%s",
+            [tournament_id]
+        )
+        return None
+
+    waitlist_id, user_id = row
+    add_participant(cur, tournament_id, user_id)
+    cur.execute(
+        "UPDATE tournament_waitlist SET status='promoted', promoted_at=UTC_TIMESTAMP() WHERE waitlist_id=%s",
+        [waitlist_id]
+    )
+    return user_id
+
+
+def leave(cur, tournament_id, user_id):
+    """
+    Caller holds lock_tournament() on an upcoming tournament.
+    Returns "participant" (seat freed, maybe promoted), "waitlist", or None if the user was neither.
+    """
+    cur.execute(
+        "DELETE FROM tournament_participants WHERE tournament_id=%s AND user_id=%s",
+        [tournament_id, user_id]
+    )
+    if cur.rowcount:
+        promote(cur, tournament_id)
+        return "participant"
+
+    cur.execute(
+        "UPDATE tournament_waitlist SET status='left' WHERE tournament_id=%s AND user_id=%s AND status='waiting'",
+        [tournament_id, user_id]
+    )
+    return "waitlist" if cur.rowcount else None
+
+
+def close_waitlist(cur, tournament_id):
+    cur.execute(
+        "UPDATE tournament_waitlist SET status='closed' WHERE tournament_id=%s AND status='waiting'",
+        [tournament_id]
+    )
@@ -1,3 +1,73 @@
-from django.test import TestCase
+from datetime import datetime
 
-# Create your tests here.
+from django.test import SimpleTestCase
+
+from tournaments.bracket import build
+
+T0 = datetime(2026, 3, 1, 9, 0)
+NAMES = {1: "Ann", 2: "Bo", 3: "Cy", 4: "Di", 5: "Ed"}
+
+
+def _row(match_id, rnd, p1, p2, winner_id=None, seeds=None, tournament=(7, "Spring Open", "ongoing", 8)):
+    """One BRACKET_SQL row; seeds maps user_id -> seed."""
+    seeds = seeds or {}
+    return (
+        *tournament,
+        match_id, rnd, 1, T0, T0, winner_id, None,
+        p1, NAMES.get(p1), seeds.get(p1),
+        p2, NAMES.get(p2), seeds.get(p2),
+    )
+
+
+class BracketBuildTests(SimpleTestCase):
+    def test_missing_tournament(self):
+        self.assertIsNone(build([]))
+
+    def test_tournament_without_matches(self):
+        row = (7, "Spring Open", "upcoming", 8) + (None,) * 13
+        bracket = build([row])
+        self.assertEqual(bracket["rounds"], [])
+        self.assertIsNone(bracket["champion"])
+        self.assertEqual(bracket["status"], "upcoming")
+
+    def test_rounds_are_linked_as_a_tree(self):
+        bracket = build([
+            _row(10, 1, 1, 2, winner_id=1), _row(11, 1, 3, 4, winner_id=4),
+            _row(12, 1, 5, 6), _row(13, 1, 7, 8),
+            _row(20, 2, 1, 4), _row(21, 2, None, None),
+            _row(30, 3, None, None),
+        ])
+        first, second, final = (r["matches"] for r in bracket["rounds"])
+        self.assertEqual([m["next_match_id"] for m in first], [20, 20, 21, 21])
+        self.assertEqual([m["source_match_ids"] for m in second], [[10, 11], [12, 13]])
+        self.assertEqual([m["position"] for m in second], [0, 1])
+        self.assertEqual(final[0]["source_match_ids"], [20, 21])
+        self.assertIsNone(final[0]["next_match_id"])
+
+    def test_bye_leaves_a_short_first_round(self):
+        # three players: 1 and 2 play, 3 has a bye straight into the final
+        seeds = {1: 2, 2: 3, 3: 1}
+        bracket = build([
+            _row(10, 1, 1, 2, winner_id=1, seeds=seeds),
+            _row(20, 2, 3, 1, winner_id=3, seeds=seeds),
+        ])
+        first, final = (r["matches"] for r in bracket["rounds"])
+        self.assertEqual(first[0]["next_match_id"], 20)
+        self.assertEqual(final[0]["source_match_ids"], [10])
+        self.assertEqual(final[0]["player1"], {"user_id": 3, "name": "Cy", "seed": 1})
+        self.assertEqual(bracket["champion"], {"user_id": 3, "name": "Cy", "seed": 1})
+
+    def test_open_side_and_unseeded_players(self):
+        bracket = build([_row(10, 1, 1, None, seeds={})])
+        match = bracket["rounds"][0]["matches"][0]
+        self.assertEqual(match["player1"], {"user_id": 1, "name": "Ann", "seed": None})
+        self.assertIsNone(match["player2"])
+        self.assertIsNone(bracket["champion"])   # final not decided
+
+    def test_no_champion_while_the_last_round_has_several_matches(self):
+        bracket = build([_row(10, 1, 1, 2, winner_id=1), _row(11, 1, 3, 4, winner_id=3)])
+        self.assertIsNone(bracket["champion"])
+
+    def test_matches_without_a_round_come_last(self):
+        bracket = build([_row(10, None, 1, 2), _row(11, 1, 3, 4)])
+        self.assertEqual([r["round"] for r in bracket["rounds"]], [1, None])
@@ -6,8 +6,11 @@ urlpatterns = [
     path("create/", views.create_tournament, name="create_tournament"),
 
     path("<int:tournament_id>/join/", views.join_tournament, name="join_tournament"),
+    path("<int:tournament_id>/leave/", views.leave_tournament, name="leave_tournament"),
     path("<int:tournament_id>/start/", views.start_tournament, name="start_tournament"),
+    path("<int:tournament_id>/reschedule/", views.reschedule_tournament, name="reschedule_tournament"),
     path("<int:tournament_id>/matches/", views.tournament_matches, name="tournament_matches"),
+    path("<int:tournament_id>/bracket/", views.tournament_bracket, name="tournament_bracket"),
 
     path("match/<int:match_id>/result/", views.report_match_result, name="report_match_result"),
 
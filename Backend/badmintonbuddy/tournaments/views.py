@@ -2,71 +2,66 @@ import json
 import random
 from datetime import timedelta
 
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
 from django.views.decorators.csrf import csrf_exempt
-from django.db import connection
+from django.db import IntegrityError, connection, transaction
 from django.utils.dateparse import parse_datetime
 
+from badmintonbuddy.serializers import RowMapper, json_response
+from badmintonbuddy.db_routing import read_only, reader
+from badmintonbuddy import result_cache
+from badmintonbuddy.admission import admission_control, concurrency_slot
+from badmintonbuddy.auth import require_admin, require_login
+from badmintonbuddy.idempotency import idempotent
+from badmintonbuddy.sql_registry import QUERIES
+from jobs.queue import enqueue
+from matches import player_matches, rollups
+from matches.waitlist import lock_court
 
-def _get_json(request):
-    try:
-        return json.loads(request.body.decode("utf-8"))
-    except Exception:
-        return {}
+from . import bracket, registration
 
 
-def _require_login(request):
-    user_id = request.session.get("user_id")
-    if not user_id:
-        return None, JsonResponse({"error": "Not logged in"}, status=401)
-    return int(user_id), None
+TOURNAMENT_ROW = RowMapper("tournament_id", "name", "description", "created_by", "max_players", "status")
 
+TOURNAMENT_MATCH_ROW = RowMapper(
+    "match_id", "player1_id", "player2_id", "start_time", "end_time", "round", "winner_id", "score",
+)
 
-def _db_role(user_id):
-    """Safer than session role. Reads role from DB."""
-    with connection.cursor() as cur:
-        cur.execute("SELECT role FROM users WHERE user_id=%s", [user_id])
-        row = cur.fetchone()
-    return row[0] if row else None
+LEADERBOARD_ROW = RowMapper("user_id", "name", "wins", "total_matches", "skill_rating")
 
+TOURNAMENT_LEADERBOARD_ROW = RowMapper(
+    "user_id", "name", "matches_played", "wins",
+    convert={"matches_played": int, "wins": int},
+)
 
-def _require_admin(request):
-    user_id, err = _require_login(request)
-    if err:
-        return None, err
+# a completed bracket is immutable
+SNAPSHOT_CACHE_CONTROL = "public, max-age=31536000, immutable"
 
-    role = _db_role(user_id)
-    if role != "admin":
-        return None, JsonResponse({"error": "Admin only"}, status=403)
 
-    return user_id, None
+def _get_json(request):
+    try:
+        return json.loads(request.body.decode("utf-8"))
+    except Exception:
+        return {}
 
 
+@read_only
 def list_tournaments(request):
     """
     GET /api/tournaments/
+    Cached (result_cache.TOURNAMENTS_LIST).
     """
-    with connection.cursor() as cur:
-        cur.execute("""
-            SELECT tournament_id, name, description, created_by, max_players, status
-            FROM tournaments
-            ORDER BY tournament_id DESC
-        """)
-        rows = cur.fetchall()
+    def compute():
+        with reader().cursor() as cur:
+            cur.execute("""
+                SELECT tournament_id, name, description, created_by, max_players, status
+                FROM tournaments
+                ORDER BY tournament_id DESC
+            """)
+            rows = cur.fetchall()
+        return {"tournaments": TOURNAMENT_ROW.map(rows)}
 
-    return JsonResponse({
-        "tournaments": [
-            {
-                "tournament_id": r[0],
-                "name": r[1],
-                "description": r[2],
-                "created_by": r[3],
-                "max_players": r[4],
-                "status": r[5],
-            }
-            for r in rows
-        ]
-    })
+    return json_response(result_cache.cached(result_cache.TOURNAMENTS_LIST, compute))
 
 
 @csrf_exempt
@@ -84,7 +79,7 @@ def create_tournament(request):
     if request.method != "POST":
         return JsonResponse({"error": "POST required"}, status=405)
 
-    admin_id, err = _require_admin(request)
+    admin_id, err = require_admin(request)
     if err:
         return err
 
@@ -106,13 +101,15 @@ def create_tournament(request):
     with connection.cursor() as cur:
         cur.execute(
             """
-            INSERT INTO tournaments (name, description, created_by, max_players, status)
-            VALUES (%s, %s, %s, %s, 'upcoming')
+            INSERT INTO tournaments (name, description, created_by, max_players, seats_left, status)
+            VALUES (%s, %s, %s, %s, %s, 'upcoming')
             """,
-            [name, description, admin_id, max_players]
+            [name, description, admin_id, max_players, max_players]
         )
         new_id = cur.lastrowid
 
+    result_cache.invalidate(result_cache.TOURNAMENTS_LIST)
+
     return JsonResponse({"message": "Tournament created", "tournament_id": new_id}, status=201)
 
 
@@ -121,52 +118,92 @@ def create_tournament(request):
 # ------------------------------
 
 @csrf_exempt
+@idempotent("join_tournament")
 def join_tournament(request, tournament_id):
     """
     POST /api/tournaments/<id>/join/
-    Logged-in user joins tournament (must be upcoming + not full)
+    Logged-in user joins tournament (must be upcoming).
+    201 with a seat; 202 + waitlist position when the tournament is full.
     """
     if request.method != "POST":
         return JsonResponse({"error": "POST required"}, status=405)
 
-    user_id, err = _require_login(request)
+    user_id, err = require_login(request)
     if err:
         return err
 
-    with connection.cursor() as cur:
-        cur.execute("SELECT max_players, status FROM tournaments WHERE tournament_id=%s", [tournament_id])
-        t = cur.fetchone()
+    # hot path: one conditional UPDATE takes a seat, no counting (tournaments/registration.py)
+    try:
+        with transaction.atomic(), connection.cursor() as cur:
+            joined = registration.take_seat(cur, tournament_id)
+            if joined:
+                registration.add_participant(cur, tournament_id, user_id)
+    except IntegrityError as exc:
+        # unique_participation; the rollback gave the seat back
+        if not registration.is_duplicate(exc):
+            raise
+        return JsonResponse({"error": "Already joined"}, status=400)
+
+    if not joined:
+        with transaction.atomic(), connection.cursor() as cur:
+            t = registration.lock_tournament(cur, tournament_id)
+            if not t:
+                return JsonResponse({"error": "Tournament not found"}, status=404)
+
+            status, seats_left = t
+            if status != "upcoming":
+                return JsonResponse({"error": "Tournament not open for joining"}, status=400)
+            if registration.is_participant(cur, tournament_id, user_id):
+                return JsonResponse({"error": "Already joined"}, status=400)
+
+            # a seat may have been freed since take_seat failed
+            if seats_left > 0 and registration.take_seat(cur, tournament_id):
+                registration.add_participant(cur, tournament_id, user_id)
+            else:
+                waitlist_id, position, created = registration.join_waitlist(cur, tournament_id, user_id)
+                if not created:
+                    return JsonResponse({"error": "Already on the waitlist", "position": position}, status=400)
+                return JsonResponse({
+                    "message": "Tournament is full; added to the waitlist",
+                    "waitlist_id": waitlist_id,
+                    "position": position,
+                }, status=202)
+
+    # new participant shows up with 0 matches in the tournament leaderboard
+    result_cache.invalidate(result_cache.tournament_leaderboard_key(tournament_id))
 
-    if not t:
-        return JsonResponse({"error": "Tournament not found"}, status=404)
+    return JsonResponse({"message": "Joined tournament successfully"}, status=201)
 
-    max_players, status = t
-    if status != "upcoming":
-        return JsonResponse({"error": "Tournament not open for joining"}, status=400)
 
-    with connection.cursor() as cur:
-        # already joined?
-        cur.execute("""
-            SELECT COUNT(*) FROM tournament_participants
-            WHERE tournament_id=%s AND user_id=%s
-        """, [tournament_id, user_id])
-        already = cur.fetchone()[0]
-        if already > 0:
-            return JsonResponse({"error": "Already joined"}, status=400)
-
-        # full?
-        cur.execute("SELECT COUNT(*) FROM tournament_participants WHERE tournament_id=%s", [tournament_id])
-        count_now = cur.fetchone()[0]
-        if count_now >= max_players:
-            return JsonResponse({"error": "Tournament is full"}, status=400)
-
-        # insert
-        cur.execute("""
-            INSERT INTO tournament_participants (tournament_id, user_id, seed)
-            VALUES (%s, %s, NULL)
-        """, [tournament_id, user_id])
+@csrf_exempt
+def leave_tournament(request, tournament_id):
+    """
+    POST /api/tournaments/<id>/leave/
+    Logged-in user leaves an upcoming tournament or its waitlist.
+    A freed seat goes to the first user on the waitlist, in the same transaction.
+    """
+    if request.method != "POST":
+        return JsonResponse({"error": "POST required"}, status=405)
 
-    return JsonResponse({"message": "Joined tournament successfully"}, status=201)
+    user_id, err = require_login(request)
+    if err:
+        return err
+
+    with transaction.atomic(), connection.cursor() as cur:
+        t = registration.lock_tournament(cur, tournament_id)
+        if not t:
+            return JsonResponse({"error": "Tournament not found"}, status=404)
+        if t[0] != "upcoming":
+            return JsonResponse({"error": "Tournament already started"}, status=400)
+
+        left = registration.leave(cur, tournament_id, user_id)
+
+    if left is None:
+        return JsonResponse({"error": "Not registered for this tournament"}, status=404)
+    if left == "participant":
+        result_cache.invalidate(result_cache.tournament_leaderboard_key(tournament_id))
+        return JsonResponse({"message": "Left tournament"})
+    return JsonResponse({"message": "Left the waitlist"})
 
 
 @csrf_exempt
@@ -187,7 +224,7 @@ def start_tournament(request, tournament_id):
     if request.method != "POST":
         return JsonResponse({"error": "POST required"}, status=405)
 
-    admin_id, err = _require_admin(request)
+    admin_id, err = require_admin(request)
     if err:
         return err
 
@@ -203,6 +240,10 @@ def start_tournament(request, tournament_id):
     data = _get_json(request)
     court_id = int(data.get("court_id") or 1)
     match_minutes = int(data.get("match_minutes") or 60)
+    if not 1 <= match_minutes <= player_matches.MAX_MATCH_MINUTES:
+        return JsonResponse(
+            {"error": f"match_minutes must be between 1 and {player_matches.MAX_MATCH_MINUTES}"}, status=400
+        )
 
     start_dt = parse_datetime(data.get("start_time") or "")
     # if not provided, just use "now" from DB time (simpler approach: schedule sequentially anyway)
@@ -236,8 +277,9 @@ def start_tournament(request, tournament_id):
     bye_user = participants[-1] if len(participants) % 2 == 1 else None
 
     # set tournament ongoing + insert matches (round 1)
-    with connection.cursor() as cur:
+    with transaction.atomic(), connection.cursor() as cur:
         cur.execute("UPDATE tournaments SET status='ongoing' WHERE tournament_id=%s", [tournament_id])
+        registration.close_waitlist(cur, tournament_id)
 
         current_start = start_dt
         created_matches = []
@@ -256,52 +298,204 @@ def start_tournament(request, tournament_id):
                 "match_id": cur.lastrowid,
                 "player1_id": p1,
                 "player2_id": p2,
-                "start_time": str(current_start),
-                "end_time": str(current_end),
+                "start_time": current_start,
+                "end_time": current_end,
                 "round": 1
             })
 
             current_start = current_end  # next slot
 
-    return JsonResponse({
+        player_matches.sync(cur, [m["match_id"] for m in created_matches])
+        rollups.sync(cur, [m["match_id"] for m in created_matches])
+
+    result_cache.invalidate(result_cache.TOURNAMENTS_LIST, *result_cache.tournament_keys(tournament_id))
+
+    return json_response({
         "message": "Tournament started (round 1 generated)",
         "bye_user_id": bye_user,
         "matches_created": created_matches
     }, status=201)
 
 
-def tournament_matches(request, tournament_id):
+MAX_RESCHEDULE_MINUTES = 24 * 60
+
+
+@csrf_exempt
+def reschedule_tournament(request, tournament_id):
     """
-    GET /api/tournaments/<id>/matches/
+    POST /api/tournaments/<id>/reschedule/
+    Admin only. Shift every unplayed match of this tournament on a court that
+    starts at/after a pivot by delta_minutes (negative = earlier).
+    Body:
+    {
+      "court_id": 1,
+      "from_time": "2026-01-10T14:00:00",
+      "delta_minutes": 30
+    }
+    - one query checks the shifted intervals against every other booking on the
+      court and every other match of the moved players -> 409 with the conflicts
+    - one UPDATE moves all rows; returns the moved matches
     """
+    if request.method != "POST":
+        return JsonResponse({"error": "POST required"}, status=405)
+
+    admin_id, err = require_admin(request)
+    if err:
+        return err
+
+    data = _get_json(request)
+    pivot = parse_datetime(data.get("from_time") or "")
+    if not data.get("court_id") or not pivot:
+        return JsonResponse({"error": "court_id and from_time required"}, status=400)
+
+    try:
+        court_id = int(data.get("court_id"))
+        delta = int(data.get("delta_minutes"))
+    except (TypeError, ValueError):
+        return JsonResponse({"error": "court_id and delta_minutes must be integers"}, status=400)
+
+    if delta == 0 or abs(delta) > MAX_RESCHEDULE_MINUTES:
+        return JsonResponse(
+            {"error": f"delta_minutes must be non-zero and within +/-{MAX_RESCHEDULE_MINUTES}"}, status=400
+        )
+
     with connection.cursor() as cur:
+        cur.execute("SELECT status FROM tournaments WHERE tournament_id=%s", [tournament_id])
+        row = cur.fetchone()
+    if not row:
+        return JsonResponse({"error": "Tournament not found"}, status=404)
+    if row[0] != "ongoing":
+        return JsonResponse({"error": "Tournament must be ongoing to reschedule"}, status=400)
+
+    with transaction.atomic(), connection.cursor() as cur:
+        # same court lock as book_match / cancel, so no booking slips into the new intervals
+        if not lock_court(cur, court_id):
+            return JsonResponse({"error": "Court not found"}, status=404)
+
         cur.execute("""
-            SELECT match_id, player1_id, player2_id, start_time, end_time, round, winner_id, score
+            SELECT match_id
             FROM matches
-            WHERE tournament_id=%s
-            ORDER BY round ASC, match_id ASC
-        """, [tournament_id])
-        rows = cur.fetchall()
-
-    return JsonResponse({
-        "tournament_id": tournament_id,
-        "matches": [
-            {
-                "match_id": r[0],
-                "player1_id": r[1],
-                "player2_id": r[2],
-                "start_time": str(r[3]),
-                "end_time": str(r[4]),
-                "round": r[5],
-                "winner_id": r[6],
-                "score": r[7],
-            }
-            for r in rows
+            WHERE tournament_id=%s AND court_id=%s AND start_time >= %s AND winner_id IS NULL
+            FOR UPDATE
+        """, [tournament_id, court_id, pivot])
+        ids = [r[0] for r in cur.fetchall()]
+        if not ids:
+            return JsonResponse({"error": "No unplayed matches on that court after from_time"}, status=404)
+
+        in_ids = ",".join(["%s"] * len(ids))
+
+        # moved rows keep their relative spacing, so only clashes with rows outside the set matter
+        cur.execute(f"""
+            SELECT m.match_id, o.match_id,
+                   CASE WHEN o.court_id = m.court_id THEN 'court' ELSE 'player' END
+            FROM matches m
+            JOIN matches o
+              ON o.match_id NOT IN ({in_ids})
+             AND o.start_time < m.end_time + INTERVAL %s MINUTE
+             AND o.end_time > m.start_time + INTERVAL %s MINUTE
+             AND (
+                  o.court_id = m.court_id
+               OR o.player1_id IN (m.player1_id, m.player2_id)
+               OR o.player2_id IN (m.player1_id, m.player2_id)
+             )
+            WHERE m.match_id IN ({in_ids})
+            ORDER BY m.start_time, o.start_time
+            LIMIT 50
+        """, [*ids, delta, delta, *ids])
+        conflicts = [
+            {"match_id": mid, "conflicts_with": other, "reason": reason}
+            for mid, other, reason in cur.fetchall()
         ]
+        if conflicts:
+            return JsonResponse({"error": "Shifted matches would collide", "conflicts": conflicts}, status=409)
+
+        before = rollups.match_keys(cur, ids)
+        cur.execute(f"""
+            UPDATE matches
+            SET start_time = start_time + INTERVAL %s MINUTE,
+                end_time = end_time + INTERVAL %s MINUTE
+            WHERE match_id IN ({in_ids})
+        """, [delta, delta, *ids])
+        player_matches.sync(cur, ids)
+        rollups.sync(cur, ids, also=before)
+
+        cur.execute(f"""
+            SELECT match_id, player1_id, player2_id, start_time, end_time, round, winner_id, score
+            FROM matches
+            WHERE match_id IN ({in_ids})
+            ORDER BY start_time
+        """, ids)
+        moved = cur.fetchall()
+
+    result_cache.invalidate(*result_cache.tournament_keys(tournament_id))
+
+    return json_response({
+        "message": f"Moved {len(moved)} match(es) by {delta} minutes",
+        "court_id": court_id,
+        "delta_minutes": delta,
+        "moved": TOURNAMENT_MATCH_ROW.map(moved),
     })
 
 
+@read_only
+def tournament_matches(request, tournament_id):
+    """
+    GET /api/tournaments/<id>/matches/
+    Cached (result_cache.tournament_matches_key).
+    """
+    def compute():
+        with reader().cursor() as cur:
+            cur.execute("""
+                SELECT match_id, player1_id, player2_id, start_time, end_time, round, winner_id, score
+                FROM matches
+                WHERE tournament_id=%s
+                ORDER BY round ASC, match_id ASC
+            """, [tournament_id])
+            rows = cur.fetchall()
+        return {
+            "tournament_id": tournament_id,
+            "matches": TOURNAMENT_MATCH_ROW.map(rows),
+        }
+
+    return json_response(result_cache.cached(result_cache.tournament_matches_key(tournament_id), compute))
+
+
+@read_only
+def tournament_bracket(request, tournament_id):
+    """
+    GET /api/tournaments/<id>/bracket/
+    Rounds of matches with player names, seeds, winners and scores, linked as a
+    tree (see tournaments/bracket.py).
+    - completed: the frozen snapshot, verbatim, with ETag + immutable Cache-Control
+      (If-None-Match -> 304)
+    - otherwise: built live, cached (result_cache.tournament_bracket_key)
+    """
+    with reader().cursor() as cur:
+        snapshot = bracket.load_snapshot(cur, tournament_id)
+
+    if snapshot:
+        body, etag = snapshot
+        quoted = f'"{etag}"'
+        if quoted in request.headers.get("If-None-Match", ""):
+            response = HttpResponse(status=304)
+        else:
+            response = HttpResponse(body, content_type="application/json")
+        response["ETag"] = quoted
+        response["Cache-Control"] = SNAPSHOT_CACHE_CONTROL
+        return response
+
+    def compute():
+        with reader().cursor() as cur:
+            return bracket.load(cur, tournament_id)
+
+    data = result_cache.cached(result_cache.tournament_bracket_key(tournament_id), compute)
+    if data is None:
+        return JsonResponse({"error": "Tournament not found"}, status=404)
+    return json_response(data)
+
+
 @csrf_exempt
+@idempotent("report_match_result")
 def report_match_result(request, match_id):
     """
     POST /api/tournaments/match/<match_id>/result/
@@ -313,14 +507,13 @@ def report_match_result(request, match_id):
     }
 
     Updates:
-    - matches.winner_id + matches.score
-    - users.wins (+1) for winner
-    - users.total_matches (+1) for both players
+    - matches.winner_id + matches.score (in the request)
+    - users.wins / users.total_matches via the "match_result" job (tournaments/jobs.py)
     """
     if request.method != "POST":
         return JsonResponse({"error": "POST required"}, status=405)
 
-    admin_id, err = _require_admin(request)
+    admin_id, err = require_admin(request)
     if err:
         return err
 
@@ -333,7 +526,7 @@ def report_match_result(request, match_id):
 
     with connection.cursor() as cur:
         cur.execute("""
-            SELECT player1_id, player2_id, winner_id
+            SELECT player1_id, player2_id, winner_id, tournament_id
             FROM matches
             WHERE match_id=%s
         """, [match_id])
@@ -342,7 +535,7 @@ def report_match_result(request, match_id):
     if not m:
         return JsonResponse({"error": "Match not found"}, status=404)
 
-    p1, p2, existing_winner = m
+    p1, p2, existing_winner, match_tournament_id = m
     if existing_winner is not None:
         return JsonResponse({"error": "Result already submitted"}, status=400)
 
@@ -350,84 +543,75 @@ def report_match_result(request, match_id):
     if winner_id not in (p1, p2):
         return JsonResponse({"error": "winner_id must be player1_id or player2_id"}, status=400)
 
-    with connection.cursor() as cur:
+    with transaction.atomic(), connection.cursor() as cur:
         cur.execute("""
             UPDATE matches
             SET winner_id=%s, score=%s
-            WHERE match_id=%s
+            WHERE match_id=%s AND winner_id IS NULL
         """, [winner_id, score, match_id])
+        if cur.rowcount == 0:
+            return JsonResponse({"error": "Result already submitted"}, status=400)
+        rollups.sync(cur, [match_id])
+
+        # counters are derived work: queued in the same transaction, applied by a worker
+        enqueue(
+            "match_result",
+            {"match_id": int(match_id), "player1_id": p1, "player2_id": p2, "winner_id": winner_id},
+            dedupe_key=f"match_result:{int(match_id)}",
+        )
 
-        # total matches increment for both
-        cur.execute("UPDATE users SET total_matches = total_matches + 1 WHERE user_id IN (%s, %s)", [p1, p2])
-
-        # wins increment for winner
-        cur.execute("UPDATE users SET wins = wins + 1 WHERE user_id=%s", [winner_id])
+    # tournament views read matches.winner_id directly; the global leaderboard
+    # is invalidated by the job once the counters move
+    if match_tournament_id is not None:
+        result_cache.invalidate(*result_cache.tournament_keys(match_tournament_id))
 
     return JsonResponse({"message": "Match result saved", "match_id": match_id})
 
 
+@admission_control("leaderboard", slot=False)
+@read_only
 def leaderboard(request):
     """
     GET /api/tournaments/leaderboard/
     Simple leaderboard: order by wins desc, total_matches desc
+    Cached (result_cache.GLOBAL_LEADERBOARD).
     """
-    with connection.cursor() as cur:
-        cur.execute("""
-            SELECT user_id, name, wins, total_matches, skill_rating
-            FROM users
-            ORDER BY wins DESC, total_matches DESC, skill_rating DESC, user_id ASC
-            LIMIT 20
-        """)
-        rows = cur.fetchall()
+    return json_response(_leaderboard())
 
-    return JsonResponse({
-        "leaderboard": [
-            {
-                "user_id": r[0],
-                "name": r[1],
-                "wins": r[2],
-                "total_matches": r[3],
-                "skill_rating": r[4],
-            }
-            for r in rows
-        ]
-    })
+
+def _leaderboard():
+    def compute():
+        with concurrency_slot("leaderboard"), reader().cursor() as cur:
+            cur.execute("""
+                SELECT user_id, name, wins, total_matches, skill_rating
+                FROM users
+                ORDER BY wins DESC, total_matches DESC, skill_rating DESC, user_id ASC
+                LIMIT 20
+            """)
+            rows = cur.fetchall()
+        return {"leaderboard": LEADERBOARD_ROW.map(rows)}
+
+    return result_cache.cached(result_cache.GLOBAL_LEADERBOARD, compute)
+
+
+@admission_control("leaderboard", slot=False)
+@read_only
 def tournament_leaderboard(request, tournament_id):
     """
     GET /api/tournaments/<tournament_id>/leaderboard/
     Returns leaderboard: matches_played + wins for each participant
+    Cached (result_cache.tournament_leaderboard_key).
     """
-    with connection.cursor() as cur:
-        cur.execute("""
-            SELECT
-                u.user_id,
-                u.name,
-                COUNT(DISTINCT m.match_id) AS matches_played,
-                COALESCE(SUM(CASE WHEN m.winner_id = u.user_id THEN 1 ELSE 0 END), 0) AS wins
-            FROM tournament_participants tp
-            JOIN users u ON tp.user_id = u.user_id
-            LEFT JOIN matches m
-                ON m.tournament_id = tp.tournament_id
-                AND (m.player1_id = u.user_id OR m.player2_id = u.user_id)
-            WHERE tp.tournament_id = %s
-            GROUP BY u.user_id, u.name
-            ORDER BY wins DESC, matches_played DESC, u.user_id ASC
-        """, [tournament_id])
+    def compute():
+        with concurrency_slot("leaderboard"), reader().cursor() as cur:
+            QUERIES.execute(cur, "tournament_leaderboard", tournament_id=tournament_id)
+            rows = cur.fetchall()
+        return {
+            "tournament_id": tournament_id,
+            "leaderboard": TOURNAMENT_LEADERBOARD_ROW.map(rows),
+        }
 
-        rows = cur.fetchall()
-
-    return JsonResponse({
-        "tournament_id": tournament_id,
-        "leaderboard": [
-            {
-                "user_id": r[0],
-                "name": r[1],
-                "matches_played": int(r[2]),
-                "wins": int(r[3])
-            }
-            for r in rows
-        ]
-    })
+    return json_response(result_cache.cached(result_cache.tournament_leaderboard_key(tournament_id), compute))
 
 @csrf_exempt
 def complete_tournament(request, tournament_id):
@@ -444,7 +628,7 @@ def complete_tournament(request, tournament_id):
     if request.method != "POST":
         return JsonResponse({"error": "POST required"}, status=405)
 
-    admin_id, err = _require_admin(request)
+    admin_id, err = require_admin(request)
     if err:
         return err
 
@@ -490,13 +674,16 @@ def complete_tournament(request, tournament_id):
             "total_matches": int(total_matches)
         }, status=400)
 
-    # All matches have winners -> complete it
-    with connection.cursor() as cur:
+    # All matches have winners -> complete it and freeze the bracket
+    with transaction.atomic(), connection.cursor() as cur:
         cur.execute("""
             UPDATE tournaments
             SET status='completed'
             WHERE tournament_id=%s
         """, [tournament_id])
+        bracket.freeze(cur, tournament_id)
+
+    result_cache.invalidate(result_cache.TOURNAMENTS_LIST, result_cache.tournament_bracket_key(tournament_id))
 
     return JsonResponse({
         "message": "Tournament completed successfully",
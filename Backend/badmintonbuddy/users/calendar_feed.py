@@ -0,0 +1,279 @@
+"""
+Per-user iCalendar (.ics) feed of a player's matches.
+
+Calendar apps subscribe to GET /api/users/calendar/<token>.ics and poll it
+(typically hourly). The feed covers matches that started within the last
+ICS_FEED_PAST_DAYS plus everything upcoming: friendlies and tournament
+matches (with tournament name and round).
+
+- Token: a signed (user_id, version) pair (django.core.signing, salt
+  SALT), so no login is needed. calendar_feeds.version is bumped by
+  POST /api/users/calendar/feed/, which revokes every older URL.
+- Conditional GET: one aggregate over player_matches JOIN matches
+  (count, sum of ids, max updated_at) gives the feed's fingerprint.
+  matches.updated_at is maintained by MySQL (ON UPDATE CURRENT_TIMESTAMP(6)),
+  so bookings, joins, results and reschedules all move it. Deletes change
+  the count / id sum. Renaming a player, court or tournament doesn't touch
+  matches, so it shows up with the next change to one of the user's matches.
+  When the fingerprint differs from the stored etag, calendar_feeds.etag /
+  last_modified are updated. The response carries ETag + Last-Modified, and
+  unchanged polls get 304 without loading any match.
+- Incremental build: each VEVENT is cached per match (ICS_CACHE_ALIAS)
+  under a stamp of its source row. A rebuild re-renders only the
+  events whose row changed since they were cached and reuses the rest.
+"""
+import hashlib
+import threading
+from datetime import datetime, timedelta, timezone
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import caches
+
+SALT = "badmintonbuddy.calendar-feed"
+PRODID = "-//BadmintonBuddy//Match calendar//EN"
+FORMAT_VERSION = 1   # bump when the VEVENT layout changes: every cached event and etag goes stale
+
+FEED_ROWS = """
+    SELECT m.match_id, m.court_id, c.name, m.player1_id, u1.name, m.player2_id, u2.name,
+           m.start_time, m.end_time, m.tournament_id, t.name, m.round, m.winner_id, m.score,
+           m.updated_at
+    FROM player_matches pm
+    JOIN matches m ON m.match_id = pm.match_id
+    JOIN courts c ON c.court_id = m.court_id
+    JOIN users u1 ON u1.user_id = m.player1_id
+    LEFT JOIN users u2 ON u2.user_id = m.player2_id
+    LEFT JOIN tournaments t ON t.tournament_id = m.tournament_id
+    WHERE pm.user_id = %s AND pm.start_time >= %s
+    ORDER BY m.start_time, m.match_id
+"""
+
+FEED_FINGERPRINT = """
+    SELECT COUNT(*), COALESCE(SUM(m.match_id), 0), MAX(m.updated_at)
+    FROM player_matches pm
+    JOIN matches m ON m.match_id = pm.match_id
+    WHERE pm.user_id = %s AND pm.start_time >= %s
+"""
+
+
+class _Stats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {"builds": 0, "not_modified": 0, "events_rendered": 0, "events_reused": 0}
+
+    def incr(self, field, n=1):
+        with self._lock:
+            self._counts[field] += n
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._counts)
+
+    def reset(self):
+        with self._lock:
+            for k in self._counts:
+                self._counts[k] = 0
+
+
+STATS = _Stats()
+
+
+def _cache():
+    return caches[getattr(settings, "ICS_CACHE_ALIAS", "default")]
+
+
+def _utcnow():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _naive(dt):
+    if dt is not None and dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+def past_days():
+    return getattr(settings, "ICS_FEED_PAST_DAYS", 90)
+
+
+def window_start(now=None):
+    return (now or _utcnow()) - timedelta(days=past_days())
+
+
+# ---------- tokens ----------
+
+def make_token(user_id, version):
+    return signing.dumps([int(user_id), int(version)], salt=SALT)
+
+
+def read_token(token):
+    """(user_id, version) or None if the token is malformed or forged."""
+    try:
+        user_id, version = signing.loads(token, salt=SALT)
+        return int(user_id), int(version)
+    except (signing.BadSignature, TypeError, ValueError):
+        return None
+
+
+def ensure_feed(cur, user_id):
+    """The user's feed version, creating the calendar_feeds row on first use."""
+    cur.execute("SELECT version FROM calendar_feeds WHERE user_id=%s", [user_id])
+    row = cur.fetchone()
+    if row:
+        return row[0]
+    cur.execute(
+        "INSERT IGNORE INTO calendar_feeds (user_id, version, created_at) VALUES (%s, 1, UTC_TIMESTAMP())",
+        [user_id]
+    )
+    cur.execute("SELECT version FROM calendar_feeds WHERE user_id=%s", [user_id])
+    return cur.fetchone()[0]
+
+
+def rotate(cur, user_id):
+    """Revoke every existing feed URL of the user. Returns the new version."""
+    version = ensure_feed(cur, user_id)
+    cur.execute(
+        "UPDATE calendar_feeds SET version=%s, etag=NULL, last_modified=NULL WHERE user_id=%s",
+        [version + 1, user_id]
+    )
+    return version + 1
+
+
+# ---------- conditional GET ----------
+
+def fingerprint(cur, user_id, version, since):
+    cur.execute(FEED_FINGERPRINT, [user_id, since])
+    count, id_sum, last_update = cur.fetchone()
+    raw = f"{FORMAT_VERSION}:{user_id}:{version}:{count}:{id_sum}:{last_update}"
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def validators(cur, user_id, version, since):
+    """
+    (etag, last_modified as aware UTC datetime) for the feed. Moves last_modified
+    forward whenever the fingerprint changed since the last poll.
+    None if the feed doesn't exist or the version was rotated away.
+    """
+    cur.execute("SELECT version, etag, last_modified FROM calendar_feeds WHERE user_id=%s", [user_id])
+    row = cur.fetchone()
+    if not row or row[0] != version:
+        return None
+
+    _, stored_etag, last_modified = row
+    etag = fingerprint(cur, user_id, version, since)
+    if etag != stored_etag or last_modified is None:
+        last_modified = _utcnow().replace(microsecond=0)
+        cur.execute(
+            "UPDATE calendar_feeds SET etag=%s, last_modified=%s WHERE user_id=%s AND version=%s",
+            [etag, last_modified, user_id, version]
+        )
+    return etag, _naive(last_modified).replace(tzinfo=timezone.utc)
+
+
+# ---------- rendering ----------
+
+def _escape(text):
+    return (
+        str(text).replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+        .replace("\r\n", "\\n").replace("\n", "\\n")
+    )
+
+
+def _fold(line):
+    """RFC 5545 3.1: lines longer than 75 octets continue on lines starting with a space."""
+    raw = line.encode("utf-8")
+    if len(raw) <= 75:
+        return line
+    parts, start, limit = [], 0, 75
+    while start < len(raw):
+        end = min(start + limit, len(raw))
+        while end < len(raw) and (raw[end] & 0xC0) == 0x80:  # don't split a UTF-8 sequence
+            end -= 1
+        parts.append(raw[start:end].decode("utf-8"))
+        start, limit = end, 74
+    return "\r\n ".join(parts)
+
+
+def _ics_time(dt):
+    return _naive(dt).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _stamp(row):
+    return hashlib.sha1(f"{FORMAT_VERSION}:{row!r}".encode()).hexdigest()
+
+
+def render_event(row, user_id):
+    (match_id, court_id, court_name, p1, p1_name, p2, p2_name,
+     start, end, tournament_id, tournament_name, rnd, winner_id, score, updated_at) = row
+
+    opponent = p2_name if p1 == user_id else p1_name
+    vs = f"vs {opponent}" if opponent else "open slot"
+    if tournament_id is not None:
+        summary = f"{tournament_name or 'Tournament'}" + (f" - Round {rnd}" if rnd else "") + f": {vs}"
+    else:
+        summary = f"Badminton {vs}"
+
+    details = [f"Court: {court_name or court_id}"]
+    if winner_id is not None:
+        result = "Won" if winner_id == user_id else "Lost"
+        details.append(f"Result: {result}" + (f" ({score})" if score else ""))
+    elif p2 is None:
+        details.append("Waiting for an opponent")
+
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:match-{match_id}@badmintonbuddy",
+        f"DTSTAMP:{_ics_time(updated_at or start)}",
+        f"DTSTART:{_ics_time(start)}",
+        f"DTEND:{_ics_time(end)}",
+        f"SUMMARY:{_escape(summary)}",
+        f"LOCATION:{_escape(court_name or f'Court {court_id}')}",
+        f"DESCRIPTION:{_escape(chr(10).join(details))}",
+        "STATUS:CONFIRMED",
+        "END:VEVENT",
+    ]
+    return "\r\n".join(_fold(line) for line in lines)
+
+
+def build(cur, user_id, since):
+    """The full VCALENDAR text. Re-renders only events whose row changed since they were cached."""
+    cur.execute(FEED_ROWS, [user_id, since])
+    rows = cur.fetchall()
+
+    cache = _cache()
+    keys = {row[0]: f"ics:v{FORMAT_VERSION}:{user_id}:{row[0]}" for row in rows}
+    cached = cache.get_many(list(keys.values())) if keys else {}
+
+    events, fresh = [], {}
+    for row in rows:
+        key = keys[row[0]]
+        stamp = _stamp(row)
+        hit = cached.get(key)
+        if hit and hit[0] == stamp:
+            events.append(hit[1])
+            continue
+        text = render_event(row, user_id)
+        fresh[key] = (stamp, text)
+        events.append(text)
+
+    if fresh:
+        cache.set_many(fresh, getattr(settings, "ICS_EVENT_CACHE_SECONDS", 7 * 24 * 3600))
+    STATS.incr("builds")
+    STATS.incr("events_rendered", len(fresh))
+    STATS.incr("events_reused", len(rows) - len(fresh))
+
+    header = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{PRODID}",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        "X-WR-CALNAME:BadmintonBuddy matches",
+        "REFRESH-INTERVAL;VALUE=DURATION:PT1H",
+        "X-PUBLISHED-TTL:PT1H",
+    ]
+    return "\r\n".join(header + events + ["END:VCALENDAR"]) + "\r\n"
+
+
+def stats():
+    return STATS.snapshot()
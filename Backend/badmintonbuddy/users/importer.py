@@ -0,0 +1,232 @@
+"""
+Bulk member import (CSV / JSON roster -> users table).
+
+Used by:
+- POST /api/users/import/           (admin endpoint)
+- python manage.py import_members   (management command)
+
+Flow:
+1. parse roster rows (name, email, password, optional skill_rating)
+2. validate rows + check existing emails with ONE `IN` query
+3. hash passwords across a process pool (one per process, reused by every import)
+4. insert with chunked multi-row INSERT IGNOREs. An email that another
+   request inserted after step 2 is skipped by the unique key and reported
+   as "Email already exists" instead of failing the import.
+"""
+import csv
+import io
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.db import connection, transaction
+
+from badmintonbuddy import result_cache
+
+from .search import note_new_users
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 500
+REQUIRED_FIELDS = ("name", "email", "password")
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def parse_roster(raw, fmt=None):
+    """
+    Parse roster text into a list of dicts.
+    fmt: "csv" | "json" | None (guess from the first non-blank character)
+    JSON may be a list of objects or {"members": [...]}.
+    """
+    if isinstance(raw, bytes):
+        raw = raw.decode("utf-8-sig")
+
+    if fmt is None:
+        fmt = "json" if raw.lstrip()[:1] in ("[", "{") else "csv"
+
+    if fmt == "json":
+        data = json.loads(raw)
+        if isinstance(data, dict):
+            data = data.get("members") or []
+        if not isinstance(data, list):
+            raise ValueError("JSON roster must be a list or {\"members\": [...]}")
+        return [r if isinstance(r, dict) else {} for r in data]
+
+    if fmt == "csv":
+        reader = csv.DictReader(io.StringIO(raw))
+        return [{(k or "").strip().lower(): v for k, v in r.items()} for r in reader]
+
+    raise ValueError(f"Unsupported roster format: {fmt}")
+
+
+def _hash_init(settings_module):
+    # worker processes (spawn start method) need Django configured before hashing
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+    import django
+    django.setup()
+
+
+def _hash_password(raw_password):
+    from django.contrib.auth.hashers import make_password
+    return make_password(raw_password)
+
+
+def _hash_pool(workers):
+    """The process's hashing pool, started on first use (sized by that call) and kept for later imports."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            settings_module = os.environ.get("DJANGO_SETTINGS_MODULE", "badmintonbuddy.settings")
+            _pool = ProcessPoolExecutor(max_workers=workers, initializer=_hash_init, initargs=(settings_module,))
+        return _pool
+
+
+def _hash_all(passwords, workers):
+    if workers <= 1 or len(passwords) < 2:
+        return [_hash_password(p) for p in passwords]
+
+    chunksize = max(1, len(passwords) // (workers * 4))
+    return list(_hash_pool(workers).map(_hash_password, passwords, chunksize=chunksize))
+
+
+def _validate(rows):
+    """
+    Returns (valid, errors).
+    valid:  list of (row_number, name, email, password, skill_rating)
+    errors: list of {"row", "email", "error"}
+    Row numbers are 1-based positions in the roster.
+    """
+    valid = []
+    errors = []
+    seen = set()
+
+    for i, r in enumerate(rows, start=1):
+        name = str(r.get("name") or "").strip()
+        email = str(r.get("email") or "").strip().lower()
+        password = str(r.get("password") or "")
+
+        if not name or not email or not password:
+            errors.append({"row": i, "email": email or None, "error": "name, email, password required"})
+            continue
+        if "@" not in email or len(email) > 100:
+            errors.append({"row": i, "email": email, "error": "Invalid email"})
+            continue
+        if len(name) > 100:
+            errors.append({"row": i, "email": email, "error": "name too long (max 100)"})
+            continue
+        if email in seen:
+            errors.append({"row": i, "email": email, "error": "Duplicate email in roster"})
+            continue
+
+        skill = r.get("skill_rating")
+        try:
+            skill = int(skill) if skill not in (None, "") else 0
+        except (TypeError, ValueError):
+            errors.append({"row": i, "email": email, "error": "skill_rating must be an integer"})
+            continue
+
+        seen.add(email)
+        valid.append((i, name, email, password, skill))
+
+    return valid, errors
+
+
+def _existing_emails(emails):
+    if not emails:
+        return set()
+    placeholders = ",".join(["%s"] * len(emails))
+    with connection.cursor() as cur:
+        cur.execute(f"SELECT email FROM users WHERE email IN ({placeholders})", list(emails))
+        return {r[0].lower() for r in cur.fetchall()}
+
+
+def _lost_races(cur, chunk, hashes):
+    """
+    Rows of an INSERT IGNORE chunk that the unique email key skipped: their
+    email exists with a different password hash (hashes are salted, so ours
+    can't match a row someone else inserted).
+    """
+    placeholders = ",".join(["%s"] * len(chunk))
+    cur.execute(f"SELECT email, password FROM users WHERE email IN ({placeholders})", [v[2] for v in chunk])
+    stored = {email.lower(): pw for email, pw in cur.fetchall()}
+    return [
+        {"row": v[0], "email": v[2], "error": "Email already exists"}
+        for v, pw_hash in zip(chunk, hashes) if stored.get(v[2]) != pw_hash
+    ]
+
+
+def import_members(rows, chunk_size=DEFAULT_CHUNK_SIZE, workers=None, dry_run=False):
+    """
+    Import roster rows. Returns a report dict:
+    {
+      "total": 120, "created": 117, "failed": 3,
+      "errors": [{"row": 4, "email": "x@y.com", "error": "Email already exists"}, ...],
+      "seconds": 1.84, "rows_per_sec": 63.6
+    }
+    """
+    started = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    chunk_size = max(1, int(chunk_size))
+
+    valid, errors = _validate(rows)
+
+    existing = _existing_emails([v[2] for v in valid])
+    if existing:
+        errors.extend(
+            {"row": v[0], "email": v[2], "error": "Email already exists"}
+            for v in valid if v[2] in existing
+        )
+        valid = [v for v in valid if v[2] not in existing]
+
+    created = 0
+    if valid and not dry_run:
+        hashes = _hash_all([v[3] for v in valid], workers)
+
+        with transaction.atomic(), connection.cursor() as cur:
+            for start in range(0, len(valid), chunk_size):
+                chunk = valid[start:start + chunk_size]
+                chunk_hashes = hashes[start:start + chunk_size]
+                values_sql = ",".join(["(%s, %s, %s, 'player', %s, 0, 0)"] * len(chunk))
+                params = []
+                for (_, name, email, _, skill), pw_hash in zip(chunk, chunk_hashes):
+                    params.extend([name, email, pw_hash, skill])
+                cur.execute(
+                    f"""
+                    INSERT IGNORE INTO users (name, email, password, role, skill_rating, wins, total_matches)
+                    VALUES {values_sql}
+                    """,
+                    params
+                )
+                inserted = cur.rowcount
+                if inserted < len(chunk):
+                    errors.extend(_lost_races(cur, chunk, chunk_hashes))
+                created += inserted
+
+    if created:
+        # new players can appear in the (short) global leaderboard and in player search
+        result_cache.invalidate(result_cache.GLOBAL_LEADERBOARD)
+        note_new_users()
+
+    elapsed = time.perf_counter() - started
+    rate = round(len(rows) / elapsed, 1) if elapsed > 0 else 0.0
+    errors.sort(key=lambda e: e["row"])
+
+    logger.info(
+        "member import: %d rows, %d created, %d failed in %.2fs (%.1f rows/s)",
+        len(rows), created, len(errors), elapsed, rate
+    )
+
+    return {
+        "total": len(rows),
+        "created": created,
+        "failed": len(errors),
+        "dry_run": bool(dry_run),
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "rows_per_sec": rate,
+    }
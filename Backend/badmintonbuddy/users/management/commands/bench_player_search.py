@@ -0,0 +1,57 @@
+import random
+import string
+import time
+
+from django.core.management.base import BaseCommand
+
+from badmintonbuddy.percentiles import percentile
+from users.search import PlayerIndex
+
+FIRST = ["john", "jon", "joanna", "maria", "mario", "li", "lin", "ahmed", "anna", "hannah", "sofia", "sophie",
+         "lucas", "luka", "noah", "nora", "kenji", "kenta", "priya", "pedro", "olga", "oliver", "fatima", "felix"]
+LAST = ["smith", "smyth", "garcia", "nguyen", "kim", "tanaka", "khan", "muller", "rossi", "silva", "ivanova",
+        "cohen", "dubois", "jensen", "novak", "okafor", "patel", "schmidt", "weber", "wong"]
+
+
+class Command(BaseCommand):
+    help = "Benchmark the in-memory player search index on synthetic users (no DB)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=50000)
+        parser.add_argument("--queries", type=int, default=2000)
+        parser.add_argument("--seed", type=int, default=7)
+
+    def handle(self, *args, **o):
+        rng = random.Random(o["seed"])
+        index = PlayerIndex()
+
+        rows = []
+        for uid in range(1, o["users"] + 1):
+            name = f"{rng.choice(FIRST).title()} {rng.choice(LAST).title()}"
+            suffix = "".join(rng.choices(string.digits, k=3))
+            rows.append((uid, name, f"{name.replace(' ', '.').lower()}{suffix}@club.test", rng.randint(0, 10)))
+
+        t0 = time.perf_counter()
+        index.load(rows)
+        build = time.perf_counter() - t0
+        self.stdout.write(f"built index over {o['users']} users in {build * 1000:.0f} ms")
+
+        words = FIRST + LAST
+        kinds = {
+            "1-char prefix": lambda: rng.choice(words)[:1],
+            "3-char prefix": lambda: rng.choice(words)[:3],
+            "full word": lambda: rng.choice(words),
+            "typo (fuzzy)": lambda: (lambda w: w[:2] + w[3] + w[2] + w[4:])(rng.choice([w for w in words if len(w) >= 5])),
+        }
+        for label, make in kinds.items():
+            times = []
+            for _ in range(o["queries"] // len(kinds)):
+                q = make()
+                t0 = time.perf_counter()
+                index.search(q, limit=10, caller_skill=rng.randint(0, 10))
+                times.append(time.perf_counter() - t0)
+            times.sort()
+            self.stdout.write(
+                f"{label:<16} p50 {percentile(times, 50) * 1000:6.2f} ms   "
+                f"p95 {percentile(times, 95) * 1000:6.2f} ms   max {times[-1] * 1000:6.2f} ms"
+            )
@@ -0,0 +1,42 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from users.importer import DEFAULT_CHUNK_SIZE, import_members, parse_roster
+
+
+class Command(BaseCommand):
+    help = "Bulk-import player accounts from a CSV or JSON roster (name,email,password[,skill_rating])."
+
+    def add_arguments(self, parser):
+        parser.add_argument("roster", help="Path to roster .csv or .json")
+        parser.add_argument("--format", choices=["csv", "json"], default=None)
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+        parser.add_argument("--workers", type=int, default=None, help="Hashing processes (default: CPU count)")
+        parser.add_argument("--dry-run", action="store_true", help="Validate only, insert nothing")
+
+    def handle(self, *args, **opts):
+        path = Path(opts["roster"])
+        if not path.exists():
+            raise CommandError(f"Roster not found: {path}")
+
+        fmt = opts["format"] or {".csv": "csv", ".json": "json"}.get(path.suffix.lower())
+        try:
+            rows = parse_roster(path.read_bytes(), fmt)
+        except ValueError as e:
+            raise CommandError(f"Could not parse roster: {e}")
+
+        report = import_members(
+            rows,
+            chunk_size=opts["chunk_size"],
+            workers=opts["workers"],
+            dry_run=opts["dry_run"],
+        )
+
+        for e in report["errors"]:
+            self.stderr.write(f"row {e['row']}: {e['email'] or '-'}: {e['error']}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{report['created']}/{report['total']} created, {report['failed']} failed "
+            f"in {report['seconds']}s ({report['rows_per_sec']} rows/s)"
+        ))
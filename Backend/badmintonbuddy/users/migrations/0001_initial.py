@@ -0,0 +1,76 @@
+# Generated by Django 5.2.4 on 2026-10-18 23:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='User',
+            fields=[
+                ('user_id', models.AutoField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=100)),
+                ('email', models.EmailField(max_length=254, unique=True)),
+                ('password', models.CharField(max_length=255)),
+                ('role', models.CharField(max_length=10)),
+                ('skill_rating', models.IntegerField(default=0)),
+                ('wins', models.IntegerField(default=0)),
+                ('total_matches', models.IntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'users',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='GoogleCalendarCred',
+            fields=[
+                ('user', models.OneToOneField(db_column='user_id', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='google_creds', serialize=False, to='users.user')),
+                ('google_account_email', models.CharField(blank=True, max_length=100, null=True)),
+                ('access_token', models.TextField(blank=True, null=True)),
+                ('refresh_token', models.TextField(blank=True, null=True)),
+                ('token_expiry', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'google_calendar_creds',
+                'managed': False,
+            },
+        ),
+        # Base schema. IF NOT EXISTS keeps this a no-op on databases that were
+        # created by hand from db/sql/badmintonbuddy_schema.sql before migrations existed.
+        migrations.RunSQL(
+            sql="""
+                CREATE TABLE IF NOT EXISTS users (
+                    user_id        INT PRIMARY KEY AUTO_INCREMENT,
+                    name           VARCHAR(100) NOT NULL,
+                    email          VARCHAR(100) NOT NULL UNIQUE,
+                    password       VARCHAR(255) NOT NULL,
+                    role           ENUM('player','admin') NOT NULL DEFAULT 'player',
+                    skill_rating   INT DEFAULT 0,
+                    wins           INT DEFAULT 0,
+                    total_matches  INT DEFAULT 0
+                )
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.RunSQL(
+            sql="""
+                CREATE TABLE IF NOT EXISTS google_calendar_creds (
+                    user_id              INT PRIMARY KEY,
+                    google_account_email VARCHAR(100),
+                    access_token         TEXT,
+                    refresh_token        TEXT,
+                    token_expiry         DATETIME,
+                    FOREIGN KEY (user_id) REFERENCES users(user_id)
+                )
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,24 @@
+from django.db import migrations
+
+
+INDEXES = [
+    # find_partners: role = 'player' AND skill_rating within range
+    ("idx_users_role_skill", "(role, skill_rating)"),
+    # global leaderboard ORDER BY wins DESC, total_matches DESC, skill_rating DESC
+    ("idx_users_leaderboard", "(wins, total_matches, skill_rating)"),
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=f"CREATE INDEX {name} ON users {cols}",
+            reverse_sql=f"DROP INDEX {name} ON users",
+        )
+        for name, cols in INDEXES
+    ]
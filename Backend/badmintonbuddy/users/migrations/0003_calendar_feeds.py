@@ -0,0 +1,39 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_access_path_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CalendarFeed',
+            fields=[
+                ('user', models.OneToOneField(db_column='user_id', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='calendar_feed', serialize=False, to='users.user')),
+                ('version', models.IntegerField(default=1)),
+                ('etag', models.CharField(blank=True, max_length=40, null=True)),
+                ('last_modified', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'calendar_feeds',
+                'managed': False,
+            },
+        ),
+        migrations.RunSQL(
+            sql="""
+                CREATE TABLE IF NOT EXISTS calendar_feeds (
+                    user_id        INT PRIMARY KEY,
+                    version        INT NOT NULL DEFAULT 1,
+                    etag           CHAR(40) NULL,
+                    last_modified  DATETIME NULL,
+                    created_at     DATETIME NOT NULL,
+                    FOREIGN KEY (user_id) REFERENCES users(user_id)
+                )
+            """,
+            reverse_sql="DROP TABLE IF EXISTS calendar_feeds",
+        ),
+    ]
@@ -40,3 +40,24 @@ class GoogleCalendarCred(models.Model):
 
 
     
+
+
+class CalendarFeed(models.Model):
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        db_column='user_id',
+        primary_key=True,
+        related_name='calendar_feed'
+    )
+    version = models.IntegerField(default=1)
+    etag = models.CharField(max_length=40, null=True, blank=True)
+    last_modified = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField()
+
+    class Meta:
+        managed = False
+        db_table = 'calendar_feeds'
+
+    def __str__(self):
+        return f"CalendarFeed({self.user_id} v{self.version})"
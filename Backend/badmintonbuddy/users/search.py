@@ -0,0 +1,267 @@
+"""
+In-memory player search for opponent selection (GET /api/users/search/?q=).
+
+Two structures over role='player' users, kept per process:
+- prefix index: two sorted lists of (token, user_id). One holds the
+  lowercased full name and email, the other each name word and email
+  local-part word. A query prefix is a bisect range, so there is no table
+  scan per keystroke.
+- trigram index: trigram -> {user_id} over name words. It is used for
+  typos ("jhon") when the prefix range has fewer than `limit` hits.
+
+Results rank by match quality (full prefix > word prefix > fuzzy), then by
+skill proximity to the caller. Proximity ranking intersects each tier's hit
+set with the users of one skill value at a time, nearest skill first, so a
+one-letter query over tens of thousands of users stays cheap.
+
+Freshness:
+- signup / import call note_new_users(). It pulls only rows with
+  user_id > the highest id already indexed.
+- searches run the same incremental sync at most every
+  PLAYER_SEARCH_SYNC_SECONDS, so other processes' signups show up too.
+- a full rebuild runs every PLAYER_SEARCH_REBUILD_SECONDS to pick up
+  renamed or removed users. It is built off to the side and swapped in,
+  one rebuilding thread at a time, so searches never wait for it.
+- reads go through reader(): the replica inside @read_only views.
+"""
+import bisect
+import heapq
+import re
+import threading
+import time
+import unicodedata
+from collections import Counter
+
+from django.conf import settings
+
+from badmintonbuddy.db_routing import reader
+
+_WORD = re.compile(r"[a-z0-9]+")
+_HIGH = "\uffff"  # sorts after any real character: (q + _HIGH) bounds the prefix range
+
+TIER_FULL_PREFIX = 0   # query is a prefix of the whole name or email
+TIER_WORD_PREFIX = 1   # query is a prefix of one word
+TIER_FUZZY = 2         # trigram similarity
+
+MIN_FUZZY_SIMILARITY = 0.3
+
+
+def normalize(text):
+    text = unicodedata.normalize("NFKD", text or "")
+    return "".join(ch for ch in text if not unicodedata.combining(ch)).lower().strip()
+
+
+def _trigrams(word):
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class _Index:
+    """One build of the index. A rebuild makes a new one and swaps it in."""
+
+    def __init__(self):
+        self.users = {}         # user_id -> (name, email, skill_rating)
+        self.sort_name = {}     # user_id -> lowercased name (tie-break)
+        self.by_skill = {}      # skill_rating -> set(user_id)
+        self.prefix_full = []   # sorted [(full name | email, user_id)]
+        self.prefix_word = []   # sorted [(word, user_id)]
+        self.trigrams = {}      # trigram -> set(user_id)
+        self.trigram_count = {}
+        self.max_user_id = 0
+
+    def add(self, user_id, name, email, skill_rating, bulk=False):
+        if user_id in self.users:
+            return
+        self.users[user_id] = (name, email, skill_rating)
+        self.max_user_id = max(self.max_user_id, user_id)
+
+        norm_name = normalize(name)
+        norm_email = normalize(email)
+        self.sort_name[user_id] = norm_name
+        self.by_skill.setdefault(skill_rating, set()).add(user_id)
+
+        words = set(_WORD.findall(norm_name)) | set(_WORD.findall(norm_email.split("@")[0]))
+        for target, tokens in ((self.prefix_full, {norm_name, norm_email}), (self.prefix_word, words)):
+            for token in tokens:
+                if bulk:
+                    target.append((token, user_id))
+                else:
+                    bisect.insort(target, (token, user_id))
+
+        grams = set()
+        for w in _WORD.findall(norm_name):
+            grams |= _trigrams(w)
+        for g in grams:
+            self.trigrams.setdefault(g, set()).add(user_id)
+        self.trigram_count[user_id] = len(grams)
+
+    # ---------- queries ----------
+
+    @staticmethod
+    def _range(entries, q):
+        lo = bisect.bisect_left(entries, (q,))
+        hi = bisect.bisect_left(entries, (q + _HIGH,), lo)
+        return {user_id for _, user_id in entries[lo:hi]}
+
+    def _nearest(self, user_ids, caller_skill, k):
+        """Up to k of user_ids, closest skill first (ties: name)."""
+        out = []
+        for skill in sorted(self.by_skill, key=lambda s: (abs(s - caller_skill), s)):
+            if len(out) >= k or not user_ids:
+                break
+            bucket = user_ids & self.by_skill[skill]
+            if bucket:
+                out.extend(heapq.nsmallest(k - len(out), bucket, key=lambda u: (self.sort_name[u], u)))
+                user_ids = user_ids - bucket
+        return out
+
+    def _fuzzy_hits(self, q):
+        grams = set()
+        for w in _WORD.findall(q):
+            grams |= _trigrams(w)
+        if not grams:
+            return {}
+
+        shared = Counter()
+        for g in grams:
+            posting = self.trigrams.get(g)
+            if posting:
+                shared.update(posting)
+
+        out = {}
+        for user_id, n in shared.items():
+            similarity = n / (len(grams) + self.trigram_count[user_id] - n)
+            if similarity >= MIN_FUZZY_SIMILARITY:
+                out[user_id] = similarity
+        return out
+
+    def search(self, q, limit, caller_skill, exclude_user_id):
+        full = self._range(self.prefix_full, q)
+        word = self._range(self.prefix_word, q) - full
+        full.discard(exclude_user_id)
+        word.discard(exclude_user_id)
+
+        ranked = [(TIER_FULL_PREFIX, u) for u in self._nearest(full, caller_skill, limit)]
+        if len(ranked) < limit:
+            ranked += [(TIER_WORD_PREFIX, u) for u in self._nearest(word, caller_skill, limit - len(ranked))]
+
+        if len(ranked) < limit and len(q) >= 3:
+            seen = full | word
+            fuzzy = {u: sim for u, sim in self._fuzzy_hits(q).items() if u not in seen and u != exclude_user_id}
+            ranked += [(TIER_FUZZY, u) for u in heapq.nsmallest(
+                limit - len(ranked), fuzzy,
+                key=lambda u: (-round(fuzzy[u], 1), abs(self.users[u][2] - caller_skill), self.sort_name[u], u)
+            )]
+
+        return [
+            {
+                "user_id": user_id,
+                "name": self.users[user_id][0],
+                "email": self.users[user_id][1],
+                "skill_rating": self.users[user_id][2],
+                "skill_diff": abs(self.users[user_id][2] - caller_skill),
+                "match": "fuzzy" if tier == TIER_FUZZY else "prefix",
+            }
+            for tier, user_id in ranked
+        ]
+
+    def skill_of(self, user_id):
+        entry = self.users.get(user_id)
+        return entry[2] if entry else None
+
+
+class PlayerIndex:
+    """
+    The live _Index plus its upkeep. A full rebuild fetches and indexes
+    without the lock, then swaps the reference, so searches keep answering
+    from the old build meanwhile. Only one thread rebuilds at a time; the
+    others keep using the current build. The lock covers the short in-place
+    incremental sync and reads.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rebuilding = threading.Lock()   # single flight: held by the thread doing a rebuild
+        self._index = _Index()
+        self.built_at = 0.0
+        self.synced_at = 0.0
+
+    # ---------- maintenance ----------
+
+    def _fetch(self, after_id=0):
+        with reader().cursor() as cur:
+            cur.execute(
+                """
+                SELECT user_id, name, email, skill_rating
+                FROM users
+                WHERE role='player' AND user_id > %s
+                ORDER BY user_id
+                """,
+                [after_id]
+            )
+            return cur.fetchall()
+
+    def load(self, rows):
+        """Build a fresh index from (user_id, name, email, skill_rating) rows and swap it in."""
+        index = _Index()
+        for user_id, name, email, skill in rows:
+            index.add(user_id, name, email, skill or 0, bulk=True)
+        index.prefix_full.sort()
+        index.prefix_word.sort()
+        with self._lock:
+            # users a concurrent sync() added past this build are picked up by the next sync
+            self._index = index
+            self.built_at = self.synced_at = time.monotonic()
+
+    def rebuild(self):
+        self.load(self._fetch())
+
+    def sync(self):
+        """Index users created since the last build/sync (user_id is AUTO_INCREMENT)."""
+        rows = self._fetch(self._index.max_user_id)
+        with self._lock:
+            for user_id, name, email, skill in rows:
+                self._index.add(user_id, name, email, skill or 0)
+            self.synced_at = time.monotonic()
+        return len(rows)
+
+    def _rebuild_once(self, wait):
+        if not self._rebuilding.acquire(blocking=wait):
+            return  # another thread is rebuilding; keep serving the current build
+        try:
+            if wait and self.built_at:
+                return  # built while this thread waited
+            self.rebuild()
+        finally:
+            self._rebuilding.release()
+
+    def ensure_fresh(self):
+        now = time.monotonic()
+        if not self.built_at:
+            self._rebuild_once(wait=True)   # nothing to serve yet
+        elif now - self.built_at > getattr(settings, "PLAYER_SEARCH_REBUILD_SECONDS", 900):
+            self._rebuild_once(wait=False)
+        elif now - self.synced_at > getattr(settings, "PLAYER_SEARCH_SYNC_SECONDS", 5):
+            self.sync()
+
+    # ---------- queries ----------
+
+    def search(self, query, limit=10, caller_skill=0, exclude_user_id=None):
+        q = normalize(query)
+        if not q:
+            return []
+        with self._lock:
+            return self._index.search(q, limit, caller_skill, exclude_user_id)
+
+    def skill_of(self, user_id):
+        with self._lock:
+            return self._index.skill_of(user_id)
+
+
+PLAYER_INDEX = PlayerIndex()
+
+
+def note_new_users():
+    """Call after inserting users (signup / import). No-op until the index is first used."""
+    if PLAYER_INDEX.built_at:
+        PLAYER_INDEX.sync()
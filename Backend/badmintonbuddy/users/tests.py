@@ -1,3 +1,183 @@
-from django.test import TestCase
+from datetime import datetime, timezone
 
-# Create your tests here.
+from django.test import SimpleTestCase
+
+from users import calendar_feed
+
+from users.importer import _validate, parse_roster
+from users.search import PlayerIndex, normalize
+
+
+def _index(rows):
+    index = PlayerIndex()
+    index.load(rows)
+    return index
+
+
+class PlayerSearchTests(SimpleTestCase):
+    ROWS = [
+        (1, "John Smith", "john.smith@club.test", 5),
+        (2, "Jon Smyth", "jsmyth@club.test", 4),
+        (3, "Anna Johnson", "anna@club.test", 9),
+        (4, "Joanna Kim", "jk@club.test", 5),
+        (5, "Zoë Dubois", "zoe@club.test", 3),
+    ]
+
+    def setUp(self):
+        self.index = _index(self.ROWS)
+
+    def ids(self, query, **kwargs):
+        return [r["user_id"] for r in self.index.search(query, **kwargs)]
+
+    def test_full_prefix_ranks_before_word_prefix(self):
+        # "jo": full-name prefix for John, Jon, Joanna; word prefix ("johnson") for Anna
+        self.assertEqual(self.ids("jo", caller_skill=5)[-1], 3)
+        self.assertEqual(set(self.ids("jo", caller_skill=5)[:3]), {1, 2, 4})
+
+    def test_nearest_skill_first_then_name(self):
+        self.assertEqual(self.ids("jo", caller_skill=5)[:3], [4, 1, 2])
+
+    def test_limit_and_exclude(self):
+        self.assertEqual(self.ids("jo", limit=2, caller_skill=5), [4, 1])
+        self.assertNotIn(4, self.ids("jo", caller_skill=5, exclude_user_id=4))
+
+    def test_email_prefix(self):
+        self.assertEqual(self.ids("jsmy"), [2])
+
+    def test_accents_are_folded(self):
+        self.assertEqual(normalize("Zoë"), "zoe")
+        self.assertEqual(self.ids("zoe"), [5])
+
+    def test_typo_falls_back_to_fuzzy(self):
+        results = self.index.search("smitth")
+        self.assertTrue(results)
+        self.assertEqual(results[0]["user_id"], 1)
+        self.assertEqual(results[0]["match"], "fuzzy")
+
+    def test_fuzzy_needs_three_characters_and_some_similarity(self):
+        self.assertEqual(self.ids("qz"), [])
+        self.assertEqual(self.ids("xqzvw"), [])
+
+    def test_load_replaces_the_index(self):
+        self.index.load([(9, "Nora Novak", "nora@club.test", 2)])
+        self.assertEqual(self.ids("jo"), [])
+        self.assertEqual(self.ids("no"), [9])
+        self.assertEqual(self.index.skill_of(9), 2)
+        self.assertIsNone(self.index.skill_of(1))
+
+
+class RosterValidationTests(SimpleTestCase):
+    def test_valid_rows_are_normalised(self):
+        valid, errors = _validate([
+            {"name": "  Ann Lee ", "email": " Ann@Club.TEST ", "password": "pw", "skill_rating": "7"},
+            {"name": "Bo", "email": "bo@club.test", "password": "pw"},
+        ])
+        self.assertEqual(errors, [])
+        self.assertEqual(valid, [(1, "Ann Lee", "ann@club.test", "pw", 7), (2, "Bo", "bo@club.test", "pw", 0)])
+
+    def test_each_problem_is_reported_with_its_row(self):
+        valid, errors = _validate([
+            {"name": "No Password", "email": "np@club.test"},
+            {"name": "Bad Email", "email": "not-an-email", "password": "pw"},
+            {"name": "x" * 101, "email": "long@club.test", "password": "pw"},
+            {"name": "Skill", "email": "skill@club.test", "password": "pw", "skill_rating": "high"},
+            {"name": "Ok", "email": "ok@club.test", "password": "pw"},
+        ])
+        self.assertEqual([v[0] for v in valid], [5])
+        self.assertEqual([(e["row"], e["error"]) for e in errors], [
+            (1, "name, email, password required"),
+            (2, "Invalid email"),
+            (3, "name too long (max 100)"),
+            (4, "skill_rating must be an integer"),
+        ])
+
+    def test_duplicate_email_in_roster_is_case_insensitive(self):
+        valid, errors = _validate([
+            {"name": "A", "email": "dup@club.test", "password": "pw"},
+            {"name": "B", "email": "DUP@club.test", "password": "pw"},
+        ])
+        self.assertEqual(len(valid), 1)
+        self.assertEqual(errors, [{"row": 2, "email": "dup@club.test", "error": "Duplicate email in roster"}])
+
+    def test_invalid_row_does_not_claim_its_email(self):
+        valid, errors = _validate([
+            {"name": "A", "email": "a@club.test", "password": "pw", "skill_rating": "x"},
+            {"name": "A", "email": "a@club.test", "password": "pw"},
+        ])
+        self.assertEqual([v[0] for v in valid], [2])
+        self.assertEqual(len(errors), 1)
+
+    def test_parse_roster_csv_and_json(self):
+        csv_rows = parse_roster("Name,Email,Password\nAnn,ann@club.test,pw\n")
+        self.assertEqual(csv_rows, [{"name": "Ann", "email": "ann@club.test", "password": "pw"}])
+        self.assertEqual(parse_roster('{"members": [{"name": "Ann"}, 3]}'), [{"name": "Ann"}, {}])
+
+
+def _unfold(text):
+    return text.replace("\r\n ", "")
+
+
+class CalendarFeedTests(SimpleTestCase):
+    START = datetime(2026, 3, 1, 9, 0)
+
+    def _event(self, **changes):
+        row = dict(
+            match_id=5, court_id=2, court_name="Court 2", p1=1, p1_name="Ann", p2=3, p2_name="Bo",
+            start=self.START, end=self.START.replace(hour=10), tournament_id=None, tournament_name=None,
+            rnd=None, winner_id=None, score=None, updated_at=None,
+        )
+        row.update(changes)
+        return calendar_feed.render_event(tuple(row.values()), 1)
+
+    def test_escape_text_values(self):
+        self.assertEqual(calendar_feed._escape("a,b;c\\d"), "a\\,b\\;c\\\\d")
+        self.assertEqual(calendar_feed._escape("one\r\ntwo\nthree"), "one\\ntwo\\nthree")
+
+    def test_short_lines_are_not_folded(self):
+        line = "SUMMARY:" + "x" * 67
+        self.assertEqual(calendar_feed._fold(line), line)
+
+    def test_long_lines_fold_at_75_octets(self):
+        line = "DESCRIPTION:" + "x" * 200
+        folded = calendar_feed._fold(line)
+        physical = folded.split("\r\n")
+        self.assertGreater(len(physical), 1)
+        self.assertTrue(all(len(p.encode("utf-8")) <= 75 for p in physical))
+        self.assertTrue(all(p.startswith(" ") for p in physical[1:]))
+        self.assertEqual(_unfold(folded), line)
+
+    def test_folding_never_splits_a_utf8_sequence(self):
+        line = "SUMMARY:" + "Zoë Dubois " * 20
+        folded = calendar_feed._fold(line)
+        for part in folded.split("\r\n"):
+            self.assertLessEqual(len(part.encode("utf-8")), 75)
+            part.encode("utf-8").decode("utf-8")
+        self.assertEqual(_unfold(folded), line)
+
+    def test_render_friendly_match(self):
+        event = self._event().split("\r\n")
+        self.assertIn("UID:match-5@badmintonbuddy", event)
+        self.assertIn("DTSTART:20260301T090000Z", event)
+        self.assertIn("DTSTAMP:20260301T090000Z", event)
+        self.assertIn("SUMMARY:Badminton vs Bo", event)
+
+    def test_render_tournament_result_in_utc(self):
+        start = datetime(2026, 3, 1, 10, 0, tzinfo=timezone.utc)
+        event = _unfold(self._event(
+            start=start, p1=3, p1_name="Bo", p2=1, p2_name="Ann", tournament_id=7,
+            tournament_name="Spring Open", rnd=2, winner_id=1, score="21-15, 21-19",
+        ))
+        self.assertIn("SUMMARY:Spring Open - Round 2: vs Bo", event)
+        self.assertIn("DESCRIPTION:Court: Court 2\\nResult: Won (21-15\\, 21-19)", event)
+        self.assertIn("DTSTART:20260301T100000Z", event)
+
+    def test_open_slot(self):
+        event = _unfold(self._event(p2=None, p2_name=None))
+        self.assertIn("SUMMARY:Badminton open slot", event)
+        self.assertIn("Waiting for an opponent", event)
+
+    def test_tokens_round_trip_and_reject_forgeries(self):
+        token = calendar_feed.make_token(7, 3)
+        self.assertEqual(calendar_feed.read_token(token), (7, 3))
+        self.assertIsNone(calendar_feed.read_token(token[:-2] + "xx"))
+        self.assertIsNone(calendar_feed.read_token("garbage"))
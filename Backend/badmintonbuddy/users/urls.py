@@ -7,6 +7,11 @@ urlpatterns = [
     path('logout/', views.logout_view, name='logout'),
     path('calendar/connect/', views.calendar_connect, name='calendar_connect'),
     path('calendar/status/', views.calendar_status, name='calendar_status'),
+    path('calendar/feed/', views.calendar_feed_url, name='calendar_feed_url'),
+    path('calendar/<str:token>.ics', views.calendar_ics, name='calendar_ics'),
     path("stats/", views.user_stats, name="user_stats"),
+    path("stats/range/", views.user_stats_range, name="user_stats_range"),
+    path("import/", views.import_members_view, name="import_members"),
+    path("search/", views.search_players, name="search_players"),
 
 ]
@@ -1,13 +1,33 @@
 import json
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
 from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET
 from django.contrib.auth.hashers import make_password, check_password
 
-from django.db import connection
+from django.db import connection, transaction
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
 from django.utils.dateparse import parse_datetime
+from django.utils.http import http_date
+
 
+from badmintonbuddy.serializers import RowMapper, json_response
+from badmintonbuddy.db_routing import read_only, reader
+from badmintonbuddy import result_cache
+from badmintonbuddy.admission import bounded_int
+from badmintonbuddy.auth import require_admin
 
 from .models import User
+from matches import rollups
+from matches.archive import player_matches_sql
+
+from .search import PLAYER_INDEX, note_new_users
+from . import calendar_feed
+
+
+CALENDAR_STATUS_ROW = RowMapper("google_account_email", "token_expiry")
+
+USER_DAY_ROW = RowMapper("day", *rollups.USER_COLUMNS)
 
 
 def _get_json(request):
@@ -43,6 +63,10 @@ def signup(request):
         total_matches=0,
     )
 
+    # new player can enter a short global leaderboard
+    result_cache.invalidate(result_cache.GLOBAL_LEADERBOARD)
+    note_new_users()
+
     # lightweight session (store user_id)
     request.session["user_id"] = user.user_id
     request.session["role"] = user.role
@@ -145,6 +169,7 @@ def calendar_connect(request):
     return JsonResponse({"message": "Google Calendar credentials saved", "user_id": user_id})
 
 
+@read_only
 def calendar_status(request):
     """
     GET /api/users/calendar/status/
@@ -154,7 +179,7 @@ def calendar_status(request):
     if not user_id:
         return JsonResponse({"error": "Not logged in"}, status=401)
 
-    with connection.cursor() as cur:
+    with reader().cursor() as cur:
         cur.execute(
             "SELECT google_account_email, token_expiry FROM google_calendar_creds WHERE user_id=%s",
             [user_id]
@@ -164,15 +189,80 @@ def calendar_status(request):
     if not row:
         return JsonResponse({"connected": False})
 
-    return JsonResponse({
+    return json_response({
         "connected": True,
-        "google_account_email": row[0],
-        "token_expiry": str(row[1]) if row[1] else None
+        **CALENDAR_STATUS_ROW.one(row),
     })
 
+@csrf_exempt
+def calendar_feed_url(request):
+    """
+    GET  /api/users/calendar/feed/  -> {"url": ".../api/users/calendar/<token>.ics"}
+    POST /api/users/calendar/feed/  -> a new URL; every older one stops working (404)
+
+    The URL is what the user pastes into their calendar app ("subscribe from URL").
+    It carries a signed token instead of the session, so treat it like a password.
+    """
+    if request.method not in ("GET", "POST"):
+        return JsonResponse({"error": "GET or POST required"}, status=405)
+
+    user_id = request.session.get("user_id")
+    if not user_id:
+        return JsonResponse({"error": "Not logged in"}, status=401)
+
+    with transaction.atomic(), connection.cursor() as cur:
+        if request.method == "POST":
+            version = calendar_feed.rotate(cur, user_id)
+        else:
+            version = calendar_feed.ensure_feed(cur, user_id)
+
+    token = calendar_feed.make_token(user_id, version)
+    url = request.build_absolute_uri(reverse("calendar_ics", args=[token]))
+    return JsonResponse({"url": url, "past_days": calendar_feed.past_days()})
+
+
+@require_GET
+def calendar_ics(request, token):
+    """
+    GET /api/users/calendar/<token>.ics
+    No session: the signed token identifies the user (see users/calendar_feed.py).
+    Answers If-None-Match / If-Modified-Since with 304 from one aggregate query;
+    otherwise builds the feed, re-rendering only the events that changed.
+    """
+    parsed = calendar_feed.read_token(token)
+    if not parsed:
+        return JsonResponse({"error": "Feed not found"}, status=404)
+    user_id, version = parsed
+    since = calendar_feed.window_start()
+
+    with connection.cursor() as cur:
+        found = calendar_feed.validators(cur, user_id, version, since)
+        if not found:
+            return JsonResponse({"error": "Feed not found"}, status=404)
+        etag, last_modified = found
+        quoted = f'"{etag}"'
+
+        not_modified = get_conditional_response(
+            request, etag=quoted, last_modified=int(last_modified.timestamp())
+        )
+        if not_modified is not None:
+            calendar_feed.STATS.incr("not_modified")
+            response = not_modified
+        else:
+            body = calendar_feed.build(cur, user_id, since)
+            response = HttpResponse(body, content_type="text/calendar; charset=utf-8")
+            response["Content-Disposition"] = 'inline; filename="badmintonbuddy.ics"'
+
+    response["ETag"] = quoted
+    response["Last-Modified"] = http_date(last_modified.timestamp())
+    response["Cache-Control"] = "private, no-cache"
+    return response
+
+
 from django.http import JsonResponse
 from django.db import connection
 
+@read_only
 def user_stats(request):
     """
     GET /api/users/stats/
@@ -187,45 +277,178 @@ def user_stats(request):
     if not user_id:
         return JsonResponse({"error": "Not logged in"}, status=401)
 
-    with connection.cursor() as cur:
-        # Basic user stats from users table
+    u = _stats_user(user_id)
+    if not u:
+        return JsonResponse({"error": "User not found"}, status=404)
+
+    return JsonResponse({"user": _stats_payload(u, _match_breakdown(user_id))})
+
+
+@require_GET
+@read_only
+def user_stats_range(request):
+    """
+    GET /api/users/stats/range/?days=30   (or ?from=YYYY-MM-DD&to=YYYY-MM-DD)
+    Logged-in user's matches / played / won / friendly / tournament over a UTC date
+    range: totals plus the days with activity. Reads the daily rollup
+    (matches/rollups.py), so cost grows with the number of days, not matches.
+    """
+    user_id = request.session.get("user_id")
+    if not user_id:
+        return JsonResponse({"error": "Not logged in"}, status=401)
+
+    span, err = rollups.date_range(request.GET)
+    if err:
+        return err
+    first_day, last_day = span
+
+    with reader().cursor() as cur:
+        rows = rollups.user_days(cur, user_id, first_day, last_day)
+
+    totals = {c: sum(int(r[i + 1]) for r in rows) for i, c in enumerate(rollups.USER_COLUMNS)}
+    totals["lost"] = totals["played"] - totals["won"]
+    totals["win_rate"] = round(totals["won"] / totals["played"] * 100, 2) if totals["played"] else 0.0
+
+    return json_response({
+        "user_id": user_id,
+        "from": first_day,
+        "to": last_day,
+        "totals": totals,
+        "days": USER_DAY_ROW.map(rows),
+    })
+
+
+def _stats_user(user_id):
+    """(user_id, name, wins, total_matches, skill_rating) or None."""
+    with reader().cursor() as cur:
         cur.execute("""
             SELECT user_id, name, wins, total_matches, skill_rating
             FROM users
             WHERE user_id=%s
         """, [user_id])
-        u = cur.fetchone()
-
-    if not u:
-        return JsonResponse({"error": "User not found"}, status=404)
+        return cur.fetchone()
 
-    wins = int(u[2] or 0)
-    total = int(u[3] or 0)
-    win_rate = round((wins / total) * 100, 2) if total > 0 else 0.0
 
-    # Tournament vs friendly match breakdown
-    with connection.cursor() as cur:
-        cur.execute("""
+def _match_breakdown(user_id):
+    """Tournament vs friendly match counts (live + archived matches): (friendly, tournament)."""
+    matches_sql, matches_params = player_matches_sql(user_id)
+    with reader().cursor() as cur:
+        cur.execute(f"""
             SELECT
                 SUM(CASE WHEN tournament_id IS NULL THEN 1 ELSE 0 END) AS friendly_matches,
                 SUM(CASE WHEN tournament_id IS NOT NULL THEN 1 ELSE 0 END) AS tournament_matches
-            FROM matches
-            WHERE player1_id=%s OR player2_id=%s
-        """, [user_id, user_id])
+            FROM {matches_sql}
+        """, matches_params)
         m = cur.fetchone()
+    return int(m[0] or 0), int(m[1] or 0)
+
+
+def _stats_payload(u, breakdown):
+    wins = int(u[2] or 0)
+    total = int(u[3] or 0)
+    win_rate = round((wins / total) * 100, 2) if total > 0 else 0.0
+    friendly_matches, tournament_matches = breakdown
+
+    return {
+        "user_id": u[0],
+        "name": u[1],
+        "wins": wins,
+        "total_matches": total,
+        "win_rate_percent": win_rate,
+        "skill_rating": int(u[4] or 0),
+        "friendly_matches": friendly_matches,
+        "tournament_matches": tournament_matches
+    }
+
+
+@csrf_exempt
+def import_members_view(request):
+    """
+    POST /api/users/import/
+    Admin only. Bulk-creates player accounts from a roster.
+
+    Accepts either:
+    - multipart upload: file=<roster.csv | roster.json>
+    - raw body with Content-Type text/csv or application/json
+      (JSON: [{"name": ..., "email": ..., "password": ..., "skill_rating": 3}, ...]
+       or {"members": [...]})
+
+    Optional query params: ?dry_run=1&chunk_size=500
+
+    Returns a per-row error report + throughput.
+    """
+    if request.method != "POST":
+        return JsonResponse({"error": "POST required"}, status=405)
+
+    admin_id, err = require_admin(request)
+    if err:
+        return err
+
+    # process pool machinery: imported on first use instead of at worker start
+    from .importer import parse_roster, import_members
+
+    upload = request.FILES.get("file")
+    if upload is not None:
+        raw = upload.read()
+        name = (upload.name or "").lower()
+        fmt = "json" if name.endswith(".json") else "csv" if name.endswith(".csv") else None
+    else:
+        raw = request.body
+        ctype = request.content_type or ""
+        fmt = "json" if "json" in ctype else "csv" if "csv" in ctype else None
+
+    if not raw:
+        return JsonResponse({"error": "Roster file or body required"}, status=400)
+
+    try:
+        rows = parse_roster(raw, fmt)
+    except (ValueError, UnicodeDecodeError) as e:
+        return JsonResponse({"error": f"Could not parse roster: {e}"}, status=400)
+
+    if not rows:
+        return JsonResponse({"error": "Roster is empty"}, status=400)
+
+    try:
+        chunk_size = int(request.GET.get("chunk_size", 500))
+    except ValueError:
+        return JsonResponse({"error": "chunk_size must be an integer"}, status=400)
+    dry_run = request.GET.get("dry_run") in ("1", "true", "yes")
+
+    report = import_members(rows, chunk_size=chunk_size, dry_run=dry_run)
+    return JsonResponse(report, status=201 if report["created"] else 200)
 
-    friendly_matches = int(m[0] or 0)
-    tournament_matches = int(m[1] or 0)
+
+@require_GET
+def search_players(request):
+    """
+    GET /api/users/search/?q=jo[&limit=10]
+    Prefix / typo-tolerant lookup over player names and emails (users/search.py).
+    Ranked by match quality, then skill closest to the caller. Excludes the caller.
+    """
+    user_id = request.session.get("user_id")
+    if not user_id:
+        return JsonResponse({"error": "Not logged in"}, status=401)
+    user_id = int(user_id)
+
+    q = (request.GET.get("q") or "").strip()
+    if not q:
+        return JsonResponse({"error": "q is required"}, status=400)
+
+    limit, err = bounded_int(request.GET, "limit", 10, 1, 25)
+    if err:
+        return err
+
+    PLAYER_INDEX.ensure_fresh()
+
+    my_skill = PLAYER_INDEX.skill_of(user_id)
+    if my_skill is None:  # admins are not indexed
+        with connection.cursor() as cur:
+            cur.execute("SELECT skill_rating FROM users WHERE user_id=%s", [user_id])
+            row = cur.fetchone()
+        my_skill = row[0] if row else 0
 
     return JsonResponse({
-        "user": {
-            "user_id": u[0],
-            "name": u[1],
-            "wins": wins,
-            "total_matches": total,
-            "win_rate_percent": win_rate,
-            "skill_rating": int(u[4] or 0),
-            "friendly_matches": friendly_matches,
-            "tournament_matches": tournament_matches
-        }
+        "query": q,
+        "results": PLAYER_INDEX.search(q, limit=limit, caller_skill=my_skill or 0, exclude_user_id=user_id),
     })
+
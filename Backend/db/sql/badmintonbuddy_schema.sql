@@ -1,4 +1,9 @@
--- Table: User (stores players and admins)
+-- BadmintonBuddy schema (MySQL)
+-- The versioned source of truth is the Django migrations in users/, tournaments/
+-- and matches/ (`python manage.py migrate`). This file mirrors the final state
+-- for a fresh manual install.
+
+-- Table: users (stores players and admins)
 CREATE TABLE users (
     user_id        INT PRIMARY KEY AUTO_INCREMENT,       -- Primary key for user (Django will use an auto-increment id)
     name           VARCHAR(100) NOT NULL,
@@ -10,63 +15,220 @@ CREATE TABLE users (
     total_matches  INT DEFAULT 0                         -- Total matches played (for stats like win ratio)
 );
 
--- Table: Court (badminton courts or venue slots that can be booked)
-CREATE TABLE Court (
+-- Table: courts (badminton courts or venue slots that can be booked)
+CREATE TABLE courts (
     court_id   INT PRIMARY KEY AUTO_INCREMENT,
     name       VARCHAR(100) NOT NULL            -- Court name or location identifier
     -- (We could add more fields like location address, etc., but keeping it simple)
 );
 
--- Table: Tournament (competition organized by an admin)
-CREATE TABLE Tournament (
+-- Table: tournaments (competition organized by an admin)
+CREATE TABLE tournaments (
     tournament_id  INT PRIMARY KEY AUTO_INCREMENT,
     name           VARCHAR(100) NOT NULL,
     description    VARCHAR(255),
     created_by     INT NOT NULL,                          -- FK to User (admin organizer)
     max_players    INT NOT NULL,
+    seats_left     INT NOT NULL DEFAULT 0,                -- free seats (see tournaments/registration.py)
     status         ENUM('upcoming','ongoing','completed') NOT NULL DEFAULT 'upcoming',
-    FOREIGN KEY (created_by) REFERENCES User(user_id)
+    FOREIGN KEY (created_by) REFERENCES users(user_id)
 );
 
--- Table: TournamentParticipant (join table linking Users to Tournaments)
-CREATE TABLE TournamentParticipant (
+-- Table: tournament_participants (join table linking users to tournaments)
+CREATE TABLE tournament_participants (
     participant_id  INT PRIMARY KEY AUTO_INCREMENT,
     tournament_id   INT NOT NULL,
     user_id         INT NOT NULL,
     seed            INT,
-    FOREIGN KEY (tournament_id) REFERENCES Tournament(tournament_id),
-    FOREIGN KEY (user_id) REFERENCES User(user_id),
-    UNIQUE KEY unique_participation (tournament_id, user_id)  -- prevent duplicate user in a tournament:contentReference[oaicite:12]{index=12}
+    FOREIGN KEY (tournament_id) REFERENCES tournaments(tournament_id),
+    FOREIGN KEY (user_id) REFERENCES users(user_id),
+    UNIQUE KEY unique_participation (tournament_id, user_id)  -- prevent duplicate user in a tournament
 );
 
--- Table: Match (scheduled match, for casual play or tournament rounds)
-CREATE TABLE Match (
+-- Table: matches (scheduled match, for casual play or tournament rounds)
+CREATE TABLE matches (
     match_id       INT PRIMARY KEY AUTO_INCREMENT,
     court_id       INT NOT NULL,
     player1_id     INT NOT NULL,
-    player2_id     INT NOT NULL,
+    player2_id     INT NULL,                              -- NULL = open slot (waiting for an opponent)
     start_time     DATETIME NOT NULL,
     end_time       DATETIME NOT NULL,
     tournament_id  INT,                                   -- FK to Tournament (null if a friendly match)
     round          TINYINT,                               -- Round number (if part of a tournament)
     winner_id      INT,                                   -- FK to User (null until match is played)
     score          VARCHAR(50),                           -- Score/result (null until match is played)
-    FOREIGN KEY (court_id) REFERENCES Court(court_id),
-    FOREIGN KEY (player1_id) REFERENCES User(user_id),
-    FOREIGN KEY (player2_id) REFERENCES User(user_id),
-    FOREIGN KEY (tournament_id) REFERENCES Tournament(tournament_id),
-    FOREIGN KEY (winner_id) REFERENCES User(user_id)
+    updated_at     DATETIME(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),  -- ICS feed validators
+    FOREIGN KEY (court_id) REFERENCES courts(court_id),
+    FOREIGN KEY (player1_id) REFERENCES users(user_id),
+    FOREIGN KEY (player2_id) REFERENCES users(user_id),
+    FOREIGN KEY (tournament_id) REFERENCES tournaments(tournament_id),
+    FOREIGN KEY (winner_id) REFERENCES users(user_id)
     /* Ensure no overlapping bookings via application logic (not enforced by constraint) */
 );
 
--- Table: GoogleCalendarCred (OAuth2 credentials for Google Calendar integration)
-CREATE TABLE GoogleCalendarCred (
+-- Table: google_calendar_creds (OAuth2 credentials for Google Calendar integration)
+CREATE TABLE google_calendar_creds (
     user_id              INT PRIMARY KEY,    -- One-to-one relation with User
     google_account_email VARCHAR(100),
     access_token         TEXT,
     refresh_token        TEXT,
     token_expiry         DATETIME,
-    FOREIGN KEY (user_id) REFERENCES User(user_id)
+    FOREIGN KEY (user_id) REFERENCES users(user_id)
+);
+
+-- Table: match_waitlist (FIFO queue per court for busy slots; see matches/waitlist.py)
+CREATE TABLE match_waitlist (
+    waitlist_id  BIGINT PRIMARY KEY AUTO_INCREMENT,          -- Queue order
+    user_id      INT NOT NULL,                               -- FK to User (waiting player)
+    court_id     INT NOT NULL,                               -- FK to Court
+    opponent_id  INT NULL,                                   -- Optional opponent, NULL = open slot
+    start_time   DATETIME NOT NULL,                          -- Requested window
+    end_time     DATETIME NOT NULL,
+    status       ENUM('waiting','booked','left','expired') NOT NULL DEFAULT 'waiting',  -- expired: window started
+    match_id     INT NULL,                                   -- Booking created on promotion
+    created_at   DATETIME NOT NULL,
+    KEY idx_waitlist_court (court_id, status, start_time),
+    KEY idx_waitlist_user (user_id, status),
+    FOREIGN KEY (user_id) REFERENCES users(user_id),
+    FOREIGN KEY (court_id) REFERENCES courts(court_id),
+    FOREIGN KEY (opponent_id) REFERENCES users(user_id)
+);
+
+-- Table: matches_archive (completed friendlies past the archive horizon; see matches/archive.py)
+-- Monthly partitions pYYYYMM are split out of p_future by `manage.py archive_matches`.
+-- Partitioned InnoDB tables can't have foreign keys; unique keys must include start_time.
+CREATE TABLE matches_archive (
+    match_id       INT NOT NULL,
+    court_id       INT NOT NULL,
+    player1_id     INT NOT NULL,
+    player2_id     INT NULL,
+    start_time     DATETIME NOT NULL,
+    end_time       DATETIME NOT NULL,
+    tournament_id  INT,
+    round          TINYINT,
+    winner_id      INT,
+    score          VARCHAR(50),
+    archived_at    DATETIME NOT NULL,
+    PRIMARY KEY (match_id, start_time),
+    KEY idx_archive_p1_start (player1_id, start_time),
+    KEY idx_archive_p2_start (player2_id, start_time)
+)
+PARTITION BY RANGE COLUMNS (start_time) (
+    PARTITION p_before VALUES LESS THAN ('2020-01-01'),
+    PARTITION p_future VALUES LESS THAN (MAXVALUE)
+);
+
+-- Table: player_matches (one row per player per live match; see matches/player_matches.py)
+-- Per-player overlap checks and history are one range scan on the primary key.
+CREATE TABLE player_matches (
+    user_id     INT NOT NULL,
+    start_time  DATETIME NOT NULL,
+    end_time    DATETIME NOT NULL,
+    match_id    INT NOT NULL,
+    PRIMARY KEY (user_id, start_time, match_id),
+    KEY idx_player_matches_match (match_id, user_id),
+    FOREIGN KEY (user_id) REFERENCES users(user_id),
+    FOREIGN KEY (match_id) REFERENCES matches(match_id) ON DELETE CASCADE
+);
+
+-- Table: tournament_bracket_snapshots (bracket JSON frozen when a tournament completes; see tournaments/bracket.py)
+CREATE TABLE tournament_bracket_snapshots (
+    tournament_id  INT PRIMARY KEY,
+    body           LONGTEXT NOT NULL,
+    etag           CHAR(40) NOT NULL,
+    frozen_at      DATETIME NOT NULL,
+    FOREIGN KEY (tournament_id) REFERENCES tournaments(tournament_id) ON DELETE CASCADE
+);
+
+-- Table: matchmaking_queue (players waiting for the batch matcher; see matches/matchmaking.py)
+CREATE TABLE matchmaking_queue (
+    queue_id          BIGINT PRIMARY KEY AUTO_INCREMENT,
+    user_id           INT NOT NULL,
+    skill_rating      INT NOT NULL,
+    skill_tolerance   INT NOT NULL,
+    window_start      DATETIME NOT NULL,
+    window_end        DATETIME NOT NULL,
+    duration_minutes  INT NOT NULL,
+    status            ENUM('waiting','matched','left','expired') NOT NULL DEFAULT 'waiting',
+    match_id          INT NULL,
+    created_at        DATETIME NOT NULL,
+    matched_at        DATETIME NULL,
+    KEY idx_matchmaking_status (status, window_end),
+    KEY idx_matchmaking_user (user_id, status),
+    FOREIGN KEY (user_id) REFERENCES users(user_id)
+);
+
+-- Table: tournament_waitlist (users waiting for a seat in a full tournament; see tournaments/registration.py)
+CREATE TABLE tournament_waitlist (
+    waitlist_id    BIGINT PRIMARY KEY AUTO_INCREMENT,
+    tournament_id  INT NOT NULL,
+    user_id        INT NOT NULL,
+    status         ENUM('waiting','promoted','left','closed') NOT NULL DEFAULT 'waiting',
+    created_at     DATETIME NOT NULL,
+    promoted_at    DATETIME NULL,
+    KEY idx_tournament_waitlist_queue (tournament_id, status, waitlist_id),
+    KEY idx_tournament_waitlist_user (user_id, status),
+    FOREIGN KEY (tournament_id) REFERENCES tournaments(tournament_id),
+    FOREIGN KEY (user_id) REFERENCES users(user_id)
+);
+
+-- Table: calendar_feeds (tokenised per-user .ics feed; see users/calendar_feed.py)
+CREATE TABLE calendar_feeds (
+    user_id        INT PRIMARY KEY,
+    version        INT NOT NULL DEFAULT 1,    -- part of the signed token; bumped to revoke old URLs
+    etag           CHAR(40) NULL,             -- fingerprint of the feed at the last poll
+    last_modified  DATETIME NULL,             -- when that fingerprint last changed
+    created_at     DATETIME NOT NULL,
+    FOREIGN KEY (user_id) REFERENCES users(user_id)
+);
+
+-- Table: user_daily_stats / court_daily_stats (daily rollups for range stats; see matches/rollups.py)
+-- Maintained on every match write; `manage.py backfill_rollups` rebuilds history in chunks.
+CREATE TABLE user_daily_stats (
+    user_id     INT NOT NULL,
+    day         DATE NOT NULL,                -- UTC date of start_time
+    matches     INT NOT NULL DEFAULT 0,       -- booked (incl. open slots hosted)
+    played      INT NOT NULL DEFAULT 0,       -- with a result
+    won         INT NOT NULL DEFAULT 0,
+    friendly    INT NOT NULL DEFAULT 0,
+    tournament  INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, day),
+    KEY idx_user_daily_day (day)
+);
+
+CREATE TABLE court_daily_stats (
+    court_id        INT NOT NULL,
+    day             DATE NOT NULL,
+    bookings        INT NOT NULL DEFAULT 0,
+    booked_minutes  INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (court_id, day),
+    KEY idx_court_daily_day (day)
+);
+
+-- Table: jobs (durable background job queue; see jobs/queue.py)
+-- idx_jobs_pending serves the worker's claim, idx_jobs_finished the retention purge.
+CREATE TABLE jobs (
+    job_id       BIGINT PRIMARY KEY AUTO_INCREMENT,
+    kind         VARCHAR(64) NOT NULL,
+    payload      TEXT NOT NULL,
+    dedupe_key   VARCHAR(128) NULL UNIQUE,
+    status       ENUM('queued','done','failed') NOT NULL DEFAULT 'queued',
+    attempts     INT NOT NULL DEFAULT 0,
+    run_after    DATETIME(6) NOT NULL,
+    created_at   DATETIME(6) NOT NULL,
+    started_at   DATETIME(6) NULL,
+    finished_at  DATETIME(6) NULL,
+    last_error   TEXT NULL,
+    KEY idx_jobs_pending (status, run_after, job_id),
+    KEY idx_jobs_finished (status, finished_at)
 );
 
+-- Secondary indexes for the hot access paths (see matches/migrations/0002_access_path_indexes.py)
+CREATE INDEX idx_matches_court_time       ON matches (court_id, start_time, end_time);
+CREATE INDEX idx_matches_p1_start         ON matches (player1_id, start_time);
+CREATE INDEX idx_matches_p2_start         ON matches (player2_id, start_time);
+CREATE INDEX idx_matches_tournament_round ON matches (tournament_id, round);
+CREATE INDEX idx_matches_start            ON matches (start_time);
 
+CREATE INDEX idx_users_role_skill         ON users (role, skill_rating);
+CREATE INDEX idx_users_leaderboard        ON users (wins, total_matches, skill_rating);
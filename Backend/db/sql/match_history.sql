@@ -0,0 +1,35 @@
+-- Match history of one player, newest first: live matches through the player_matches
+-- side table plus archived friendlies (matches/archive.py; keep the column list in
+-- sync with archive.COLUMNS).
+-- Used by GET /api/matches/history/ and /api/matches/history/export/ (matches/views.py).
+
+-- name: match_history
+SELECT
+    m.match_id,
+    m.court_id,
+    m.player1_id,
+    u1.name AS player1_name,
+    m.player2_id,
+    u2.name AS player2_name,
+    m.start_time,
+    m.end_time,
+    m.tournament_id,
+    m.round,
+    m.winner_id,
+    m.score
+FROM (
+    SELECT lm.match_id, lm.court_id, lm.player1_id, lm.player2_id, lm.start_time, lm.end_time,
+           lm.tournament_id, lm.round, lm.winner_id, lm.score
+    FROM player_matches pm
+    JOIN matches lm ON lm.match_id = pm.match_id
+    WHERE pm.user_id = :user_id
+    UNION ALL
+    SELECT match_id, court_id, player1_id, player2_id, start_time, end_time,
+           tournament_id, round, winner_id, score
+    FROM matches_archive
+    WHERE player1_id = :user_id OR player2_id = :user_id
+) m
+JOIN users u1 ON u1.user_id = m.player1_id
+LEFT JOIN users u2 ON u2.user_id = m.player2_id
+ORDER BY m.start_time DESC
+LIMIT :limit;
@@ -1,15 +1,22 @@
--- Find up to 5 candidate partners for a given user and time slot
+-- Candidate partners for the logged-in user in a time slot, closest skill first.
+-- Used by GET /api/matches/partners/ (matches/views.py find_partners).
+-- Busy players are filtered through the player_matches side table (matches/player_matches.py).
+-- :earliest_start is requested_start - MAX_MATCH_MINUTES: no overlapping match starts
+-- before it, so the (user_id, start_time) key is a bounded range per candidate.
 
-SELECT u.user_id, u.name, u.skill_rating
+-- name: partner_matching
+SELECT u.user_id, u.name, u.email, u.skill_rating
 FROM users AS u
-WHERE u.user_id != :current_user_id
+WHERE u.user_id <> :current_user_id
   AND u.role = 'player'
-  AND ABS(u.skill_rating - :current_user_skill) <= 2
+  AND ABS(u.skill_rating - :current_user_skill) <= :max_skill_diff
   AND NOT EXISTS (
       SELECT 1
-      FROM matches AS m
-      WHERE (m.player1_id = u.user_id OR m.player2_id = u.user_id)
-        AND NOT (m.end_time <= :requested_start
-                 OR m.start_time >= :requested_end)
+      FROM player_matches AS pm
+      WHERE pm.user_id = u.user_id
+        AND pm.start_time > :earliest_start
+        AND pm.start_time < :requested_end
+        AND pm.end_time > :requested_start
   )
-LIMIT 5;
+ORDER BY ABS(u.skill_rating - :current_user_skill) ASC
+LIMIT :limit;
@@ -1,6 +1,8 @@
 -- Tournament Leaderboard Query
--- Returns wins and matches played per participant
+-- Returns wins and matches played per participant.
+-- Used by GET /api/tournaments/<id>/leaderboard/ (tournaments/views.py tournament_leaderboard).
 
+-- name: tournament_leaderboard
 SELECT
     u.user_id,
     u.name,
@@ -8,9 +10,9 @@ SELECT
     COALESCE(SUM(CASE WHEN m.winner_id = u.user_id THEN 1 ELSE 0 END), 0) AS wins
 FROM tournament_participants tp
 JOIN users u ON tp.user_id = u.user_id
-LEFT JOIN matches m
+LEFT JOIN (matches m JOIN player_matches pm ON pm.match_id = m.match_id)
     ON m.tournament_id = tp.tournament_id
-    AND (m.player1_id = u.user_id OR m.player2_id = u.user_id)
-WHERE tp.tournament_id = {TOURNAMENT_ID}
-GROUP BY u.user_id
-ORDER BY wins DESC;
+    AND pm.user_id = u.user_id
+WHERE tp.tournament_id = :tournament_id
+GROUP BY u.user_id, u.name
+ORDER BY wins DESC, matches_played DESC, u.user_id ASC;
@@ -106,8 +106,12 @@ export const api = {
   },
 
   // ✅ FIX: backend uses /join/ not /enroll/
+  // 201 = seat taken; 202 = tournament full, body carries the waitlist position
   joinTournament(tournament_id: number) {
-    return request<any>(`/api/tournaments/${tournament_id}/join/`, { method: "POST" });
+    return request<{ message: string; waitlist_id?: number; position?: number }>(
+      `/api/tournaments/${tournament_id}/join/`,
+      { method: "POST" }
+    );
   },
 
   tournamentMatches(tournament_id: number) {
@@ -123,6 +127,13 @@ export const api = {
   },
 
 
+  // ---------- DASHBOARD ----------
+  // history + leaderboard + stats in one request; fields limits the sections returned
+  dashboard(fields?: Array<"history" | "leaderboard" | "stats">) {
+    const q = fields && fields.length ? `?fields=${fields.join(",")}` : "";
+    return request<any>(`/api/dashboard/${q}`);
+  },
+
   // ---------- CALENDAR (your backend stores creds / status) ----------
   calendarStatus() {
     return request<any>("/api/users/calendar/status/");
@@ -132,6 +143,15 @@ export const api = {
     return request<any>("/api/users/calendar/connect/", { method: "POST", json: payload });
   },
 
+  // private .ics URL for "subscribe from URL" in any calendar app; rotate revokes the old one
+  calendarFeed() {
+    return request<{ url: string; past_days: number }>("/api/users/calendar/feed/");
+  },
+
+  rotateCalendarFeed() {
+    return request<{ url: string; past_days: number }>("/api/users/calendar/feed/", { method: "POST" });
+  },
+
 
 
 };
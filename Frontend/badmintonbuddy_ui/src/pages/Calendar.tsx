@@ -29,7 +29,8 @@ function toYMD(d: Date) {
 }
 
 function prettyTime(s: string) {
-  const t = s?.split(" ")[1];
+  // backend sends ISO 8601 ("2026-01-10T10:00:00+00:00"); older payloads used a space
+  const t = s?.split(/[ T]/)[1];
   return t ? t.slice(0, 5) : s;
 }
 
@@ -44,6 +45,7 @@ export default function Calendar() {
   const [courtFilter, setCourtFilter] = useState<number>(0); // 0 = all courts
   const [loading, setLoading] = useState(false);
   const [err, setErr] = useState<string | null>(null);
+  const [feedUrl, setFeedUrl] = useState<string | null>(null);
 
   const monthLabel = useMemo(() => {
     return monthCursor.toLocaleString(undefined, { month: "long", year: "numeric" });
@@ -94,6 +96,16 @@ export default function Calendar() {
     }
   }
 
+  async function loadFeed(rotate: boolean) {
+    setErr(null);
+    try {
+      const res = rotate ? await api.rotateCalendarFeed() : await api.calendarFeed();
+      setFeedUrl(res.url);
+    } catch (e: any) {
+      setErr(e.message || "Failed to load calendar link");
+    }
+  }
+
   useEffect(() => {
     loadDay(selectedDate);
     // eslint-disable-next-line react-hooks/exhaustive-deps
@@ -251,6 +263,26 @@ export default function Calendar() {
                 </div>
               );
             })}
+
+          <Divider />
+
+          <div className="text-xs text-white/60">Your matches in any calendar app</div>
+          {feedUrl ? (
+            <div className="space-y-2">
+              <input
+                className="w-full rounded-lg border border-white/10 bg-white/5 px-2 py-1 text-xs text-white"
+                readOnly
+                value={feedUrl}
+                onFocus={(e) => e.target.select()}
+              />
+              <div className="text-xs text-slate-400">
+                Add it as a subscription ("From URL"). Keep it private; a new link disables the old one.
+              </div>
+              <Button onClick={() => loadFeed(true)}>New link</Button>
+            </div>
+          ) : (
+            <Button onClick={() => loadFeed(false)}>Get calendar link</Button>
+          )}
         </CardBody>
       </Card>
     </div>
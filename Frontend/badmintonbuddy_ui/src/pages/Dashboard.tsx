@@ -79,8 +79,10 @@ export default function Dashboard() {
     setBusy(true);
 
     try {
-      // load both: history + leaderboard
-      const [histRes, lbRes]: any = await Promise.all([api.matchHistory(), api.leaderboard()]);
+      // one request for both sections: history + leaderboard
+      const res: any = await api.dashboard(["history", "leaderboard"]);
+      const histRes = res?.history;
+      const lbRes = res;
 
       // ---------- HISTORY ----------
       const list = extractMatches(histRes);
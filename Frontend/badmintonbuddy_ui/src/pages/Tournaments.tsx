@@ -96,8 +96,12 @@ export default function Tournaments() {
     setBusy(true);
     try {
       // ✅ FIX: backend route is /join/ not /enroll/
-      await api.joinTournament(selected.tournament_id);
-      setOk("Joined successfully.");
+      const res = await api.joinTournament(selected.tournament_id);
+      if (res?.position != null) {
+        setOk(`Tournament is full. You're #${res.position} on the waitlist.`);
+      } else {
+        setOk("Joined successfully.");
+      }
       await refresh(true);
     } catch (e: any) {
       setErr(e.message || "Join failed");